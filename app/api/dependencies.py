@@ -1,34 +1,244 @@
 """Dependency injection setup for FastAPI."""
+# Standard library imports
+import hmac
+import logging
+import os
+
 # Third-party imports
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException
+from starlette.requests import HTTPConnection
 
 # Local application imports
+from app.api.idempotency import IdempotencyStore
+from app.core.config import settings
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.memory import MemoryTracer
 from app.domain.repositories.session import SessionRepositoryInterface
+from app.domain.services.bots import DEFAULT_BOT, BotRegistry
 from app.domain.services.chatbot import ChatbotService
+from app.domain.services.reloader import ChatbotReloader
 from app.domain.services.session import SessionService
+from app.infrastructure.analytics.query_log import QueryLog
+from app.infrastructure.data.loaders.chatbot_data import (
+    default_model_path,
+    load_dataset,
+)
+from app.infrastructure.nlp.engine import warm_up
+from app.infrastructure.repositories.memory.journal import (
+    JournalLockedError,
+    SessionJournal,
+)
 from app.infrastructure.repositories.memory.session import InMemorySessionRepository
 
 
+logger = logging.getLogger(__name__)
+
 _session_repository_instance = None
 _chatbot_service_instance = None
+_chatbot_reloader_instance = None
+_loop_monitor_instance = None
+_bot_registry_instance = None
+_idempotency_store_instance = None
+_query_log_instance = None
+_memory_tracer_instance = None
+
+
+def get_bot_name(connection: HTTPConnection = None) -> str:
+    """Get the bot a request was routed to by the bot routing middleware."""
+    if connection is None:
+        return DEFAULT_BOT
+    return connection.scope.get("state", {}).get("bot", DEFAULT_BOT)
+
+
+def secret_matches(given: str, expected: str) -> bool:
+    """Compare a secret in constant time; an empty ``expected`` matches nothing."""
+    return bool(expected) and hmac.compare_digest(
+        given.encode("utf-8"), expected.encode("utf-8")
+    )
+
+
+def require_admin_token(x_admin_token: str = Header("")) -> None:
+    """Reject admin requests without the configured ADMIN_TOKEN."""
+    if not secret_matches(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def require_cluster_secret(x_cluster_secret: str = Header("")) -> None:
+    """Reject session hand-over requests without the configured CLUSTER_SECRET."""
+    if not secret_matches(x_cluster_secret, settings.CLUSTER_SECRET):
+        raise HTTPException(status_code=403, detail="Invalid cluster secret")
+
 
+def get_bot_registry() -> BotRegistry:
+    """Get the registry of the bots configured besides the default (SINGLETON)."""
+    global _bot_registry_instance
+    if _bot_registry_instance is None:
+        _bot_registry_instance = BotRegistry(
+            settings.BOTS,
+            build=_build_bot,
+            build_sessions=_build_bot_session_repository,
+            memory_budget=int(settings.BOT_MEMORY_BUDGET_MB * 1024 * 1024),
+            idle_seconds=settings.BOT_IDLE_SECONDS,
+            prepare=warm_up,
+            memory_sample=settings.MEMORY_SAMPLE_SIZE
+        )
+    return _bot_registry_instance
+
+
+def _build_bot(name: str) -> ChatbotService:
+    """Build the chatbot service of a bot from its dataset file."""
+    path = settings.BOTS[name]
+    return _attach_query_log(
+        ChatbotService(dataset=load_dataset(path), model_path=default_model_path(path)),
+        name
+    )
+
+
+def _build_bot_session_repository(name: str) -> InMemorySessionRepository:
+    """Build a bot's session store, journaled in its own directory."""
+    return _build_session_repository(
+        os.path.join(settings.SESSION_JOURNAL_DIR, "bots", name)
+    )
+
+
+def get_session_repository(
+    connection: HTTPConnection = None
+) -> SessionRepositoryInterface:
+    """Get the session repository of the request's bot (SINGLETON per bot)."""
+    name = get_bot_name(connection)
+    if name != DEFAULT_BOT:
+        return get_bot_registry().sessions(name)
 
-def get_session_repository() -> SessionRepositoryInterface:
-    """Get session repository instance (SINGLETON)."""
     global _session_repository_instance
     if _session_repository_instance is None:
-        _session_repository_instance = InMemorySessionRepository()
+        _session_repository_instance = _build_session_repository(
+            settings.SESSION_JOURNAL_DIR
+        )
     return _session_repository_instance
 
 
-def get_chatbot_service() -> ChatbotService:
-    """Get chatbot service instance (SINGLETON)."""
+def _build_session_repository(journal_dir: str) -> InMemorySessionRepository:
+    """Build the in-memory store, restored from its journal when enabled."""
+    if not settings.SESSION_JOURNAL_ENABLED:
+        return InMemorySessionRepository()
+
+    journal = SessionJournal(
+        journal_dir,
+        flush_interval=settings.SESSION_JOURNAL_FLUSH_INTERVAL_SECONDS,
+        snapshot_interval=settings.SESSION_SNAPSHOT_INTERVAL_SECONDS,
+        fsync=settings.SESSION_JOURNAL_FSYNC,
+    )
+    try:
+        repository = InMemorySessionRepository(journal=journal)
+    except JournalLockedError as e:
+        # Another worker owns the journal: keep serving without persistence
+        logger.warning(f"{e}; sessions of this process will not be persisted")
+        return InMemorySessionRepository()
+    repository.start_journal()
+    return repository
+
+
+def close_session_repository() -> None:
+    """Flush and snapshot the session stores on shutdown, if they persist sessions."""
+    repositories = [_session_repository_instance]
+    if _bot_registry_instance is not None:
+        repositories.extend(_bot_registry_instance.session_repositories())
+    for repository in repositories:
+        if isinstance(repository, InMemorySessionRepository):
+            repository.close_journal()
+
+
+def get_chatbot_service(connection: HTTPConnection = None) -> ChatbotService:
+    """Get the chatbot service of the request's bot (SINGLETON per bot).
+
+    Bots other than the default are loaded and evicted by the bot registry.
+    """
+    name = get_bot_name(connection)
+    if name != DEFAULT_BOT:
+        return get_bot_registry().get(name)
+
     global _chatbot_service_instance
     if _chatbot_service_instance is None:
-        _chatbot_service_instance = ChatbotService()
+        _chatbot_service_instance = _build_chatbot_service_from_file()
     return _chatbot_service_instance
 
 
+def set_chatbot_service(service: ChatbotService) -> None:
+    """Swap the chatbot service singleton (a single atomic reference assignment)."""
+    global _chatbot_service_instance
+    _chatbot_service_instance = service
+
+
+def _build_chatbot_service_from_file() -> ChatbotService:
+    """Build a fresh chatbot service from the dataset file on disk."""
+    return _attach_query_log(ChatbotService(), DEFAULT_BOT)
+
+
+def _attach_query_log(service: ChatbotService, name: str) -> ChatbotService:
+    """Record a bot's sampled messages in the query log, when enabled."""
+    if settings.QUERY_LOG_ENABLED:
+        service.query_log = get_query_log()
+        service.bot = name
+    return service
+
+
+def get_chatbot_reloader() -> ChatbotReloader:
+    """Get chatbot reloader instance (SINGLETON)."""
+    global _chatbot_reloader_instance
+    if _chatbot_reloader_instance is None:
+        _chatbot_reloader_instance = ChatbotReloader(
+            build=_build_chatbot_service_from_file,
+            publish=set_chatbot_service
+        )
+    return _chatbot_reloader_instance
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get event loop monitor instance (SINGLETON)."""
+    global _loop_monitor_instance
+    if _loop_monitor_instance is None:
+        _loop_monitor_instance = LoopLagMonitor(
+            interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+            block_threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS,
+            log_interval=settings.LOOP_BLOCK_LOG_INTERVAL_SECONDS
+        )
+    return _loop_monitor_instance
+
+
+def get_memory_tracer() -> MemoryTracer:
+    """Get the tracemalloc snapshot tracer (SINGLETON)."""
+    global _memory_tracer_instance
+    if _memory_tracer_instance is None:
+        _memory_tracer_instance = MemoryTracer(frames=settings.MEMORY_TRACE_FRAMES)
+    return _memory_tracer_instance
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get the store of idempotency keys of message submissions (SINGLETON)."""
+    global _idempotency_store_instance
+    if _idempotency_store_instance is None:
+        _idempotency_store_instance = IdempotencyStore(
+            max_keys=settings.IDEMPOTENCY_MAX_KEYS,
+            ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS
+        )
+    return _idempotency_store_instance
+
+
+def get_query_log() -> QueryLog:
+    """Get the log of sampled query events (SINGLETON)."""
+    global _query_log_instance
+    if _query_log_instance is None:
+        _query_log_instance = QueryLog(
+            sample_rate=settings.QUERY_LOG_SAMPLE_RATE,
+            buffer_size=settings.QUERY_LOG_BUFFER_SIZE,
+            directory=settings.QUERY_LOG_DIR,
+            flush_interval=settings.QUERY_LOG_FLUSH_INTERVAL_SECONDS,
+            rotate_bytes=int(settings.QUERY_LOG_ROTATE_MB * 1024 * 1024),
+            max_files=settings.QUERY_LOG_MAX_FILES
+        )
+    return _query_log_instance
+
+
 def get_session_service(
     repo: SessionRepositoryInterface = Depends(get_session_repository)
 ) -> SessionService:
@@ -0,0 +1,90 @@
+"""Idempotency keys - Replays the response of a request retried with the same key."""
+# Standard library imports
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Hashable, Tuple
+
+# Third-party imports
+from cachetools import TTLCache
+
+# Local application imports
+from app.core.exceptions import IdempotencyConflictException
+
+
+logger = logging.getLogger(__name__)
+
+# Result of a first attempt that raised, telling waiting duplicates to run again
+_FAILED = object()
+
+
+def payload_fingerprint(payload: str) -> str:
+    """Digest of a request payload, to tell a retry from a reused key."""
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IdempotencyStore:
+    """Responses of keyed requests, kept for ``ttl_seconds``, at most ``max_keys``.
+
+    The first request with a key runs and its response is stored; a retry with
+    the same key gets that response without running again, and a duplicate that
+    arrives while the first attempt is still running waits for it. Only
+    successful responses are stored: when the first attempt raises, the next
+    attempt with the key runs afresh. Entries live in a TTL cache, so memory
+    stays bounded; a key evicted early simply runs again.
+    """
+
+    def __init__(
+        self,
+        max_keys: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize with the number of keys kept and how long they are kept."""
+        # key -> (payload fingerprint, future of the response)
+        self._entries: TTLCache = TTLCache(
+            maxsize=max_keys, ttl=ttl_seconds, timer=clock
+        )
+        self.replayed = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def run(
+        self,
+        key: Hashable,
+        fingerprint: str,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Return the response of a keyed request, and whether it was replayed.
+
+        Raises ``IdempotencyConflictException`` if the key was used with another
+        payload.
+        """
+        while True:
+            entry = self._entries.get(key)
+            if entry is None:
+                break
+            stored_fingerprint, future = entry
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyConflictException(
+                    "Idempotency key already used for a different request"
+                )
+            response = await asyncio.shield(future)
+            if response is _FAILED:
+                continue
+            self.replayed += 1
+            logger.info(f"Replaying the stored response of idempotency key {key}")
+            return response, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (fingerprint, future)
+        try:
+            response = await compute()
+        except BaseException:
+            self._entries.pop(key, None)
+            future.set_result(_FAILED)
+            raise
+        future.set_result(response)
+        return response, False
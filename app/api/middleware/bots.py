@@ -0,0 +1,78 @@
+"""Bot routing middleware - Selects the bot of a request by path prefix or header."""
+# Standard library imports
+import json
+import logging
+import re
+from typing import Iterable, Optional, Tuple
+
+# Local application imports
+from app.domain.services.bots import DEFAULT_BOT
+
+
+logger = logging.getLogger(__name__)
+
+
+class BotRoutingMiddleware:
+    """Resolves which bot serves a request and stores it in the request state.
+
+    ``{prefix}/bots/{name}/...`` is routed as ``{prefix}/...``, so every API
+    route serves every bot without being declared twice; other requests name
+    their bot with the ``header``, or get the default bot. Requests for a bot
+    that is not configured are answered with 404 (WebSockets are closed) before
+    routing.
+    """
+
+    def __init__(self, app, prefix: str, header: str, bots: Iterable[str]):
+        """Wrap an ASGI app, routing the API under ``prefix`` to ``bots``."""
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+        self.bots = frozenset(bots) | {DEFAULT_BOT}
+        self._prefix = prefix
+        self._bot_path = re.compile(re.escape(prefix) + r"/bots/([^/]+)(/.*)$")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        name, path = self.resolve(scope)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+        if name not in self.bots:
+            logger.warning(f"Request for unknown bot '{name}' on {scope['path']}")
+            await _reject(scope, send, name)
+            return
+
+        scope = dict(scope, state={**scope.get("state", {}), "bot": name})
+        if path is not None:
+            scope["path"] = path
+            scope["raw_path"] = path.encode("utf-8")
+        await self.app(scope, receive, send)
+
+    def resolve(self, scope) -> Tuple[Optional[str], Optional[str]]:
+        """The bot a request names, if any, and its path without the bot prefix."""
+        match = self._bot_path.match(scope["path"])
+        if match:
+            return match.group(1), self._prefix + match.group(2)
+        for key, value in scope.get("headers", ()):
+            if key == self.header:
+                return value.decode("latin-1"), None
+        return None, None
+
+
+async def _reject(scope, send, name: str) -> None:
+    if scope["type"] == "websocket":
+        await send({"type": "websocket.close", "code": 1008})
+        return
+
+    body = json.dumps({"detail": f"Bot '{name}' not found"}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 404,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
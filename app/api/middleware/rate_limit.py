@@ -0,0 +1,209 @@
+"""Rate limit middleware - Per-client and per-session token buckets."""
+# Standard library imports
+import json
+import logging
+import math
+import re
+import time
+from typing import Callable, List, Optional, Tuple
+
+# Third-party imports
+from cachetools import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBuckets:
+    """Token buckets keyed by client or session, at most ``max_keys`` of them.
+
+    Each key may spend ``burst`` requests at once and regains ``rate`` requests
+    per second. Buckets live in an LRU cache, so memory stays bounded however
+    many clients come and go; an evicted key simply starts again with a full
+    bucket.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int):
+        """Initialize with the refill rate per second and the bucket size."""
+        self.rate = rate
+        self.burst = burst
+        # key -> (tokens, time of the last update)
+        self._buckets: LRUCache = LRUCache(maxsize=max_keys)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def available(self, key: str, now: float) -> float:
+        """Tokens a key has at ``now``, without spending any."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.burst
+        tokens, updated = bucket
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def spend(self, key: str, tokens: float, now: float) -> None:
+        """Record a key's balance after spending one token."""
+        self._buckets[key] = (tokens - 1, now)
+
+    def retry_after(self, tokens: float) -> float:
+        """Seconds until a balance of ``tokens`` reaches one token."""
+        return (1 - tokens) / self.rate if self.rate > 0 else math.inf
+
+
+class RateLimitMiddleware:
+    """Rejects conversation requests over the client or session rate with 429.
+
+    Runs before routing, so a rejected request costs no session lookup and no
+    NLP work. Clients are identified by their address (uvicorn resolves it from
+    trusted proxy headers); message requests are also limited per session.
+
+    A WebSocket upgrade spends a client token like a request and is closed with
+    1013 when over the limit. Every frame of an open socket then spends client
+    and session tokens like a message request; frames over the limit are
+    answered with an error frame and never reach the route.
+
+    Each rejection is logged at DEBUG; a warning counting them is logged at most
+    once per ``log_interval`` seconds, so a flooding client cannot flood the
+    logs as well.
+    """
+
+    def __init__(
+        self,
+        app,
+        prefix: str,
+        client_rate: float,
+        client_burst: float,
+        session_rate: float,
+        session_burst: float,
+        max_keys: int,
+        log_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Wrap an ASGI app, limiting the routes under ``prefix``."""
+        self.app = app
+        self.prefix = prefix
+        self.clock = clock
+        self.log_interval = log_interval
+        self._last_log = float("-inf")
+        self._suppressed = 0
+        self.clients = TokenBuckets(client_rate, client_burst, max_keys)
+        self.sessions = TokenBuckets(session_rate, session_burst, max_keys)
+        self._session_path = re.compile(re.escape(prefix) + r"/([^/]+)/messages$")
+        self._socket_path = re.compile(re.escape(prefix) + r"/([^/]+)/ws$")
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] not in ("http", "websocket")
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.admit(scope)
+        if retry_after is None:
+            if scope["type"] == "websocket":
+                receive = self._limit_frames(scope, receive, send)
+            await self.app(scope, receive, send)
+            return
+
+        self._log_rejection(scope, f"retry after {retry_after:.2f}s")
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1013})
+            return
+        await _reject(send, retry_after)
+
+    def admit(self, scope, session: Optional[str] = None) -> Optional[float]:
+        """Spend a token from every bucket of the request.
+
+        Message requests spend from their session's bucket too, as do requests
+        given a ``session``. Returns None if the request is admitted, otherwise
+        the seconds until it would be. Nothing is spent from any bucket when the
+        request is rejected.
+        """
+        now = self.clock()
+        checks: List[Tuple[TokenBuckets, str, float]] = []
+
+        client = _client_key(scope)
+        checks.append((self.clients, client, self.clients.available(client, now)))
+
+        if session is None:
+            match = self._session_path.match(scope["path"])
+            session = match.group(1) if match else None
+        if session is not None:
+            checks.append(
+                (self.sessions, session, self.sessions.available(session, now))
+            )
+
+        waits = [
+            buckets.retry_after(tokens)
+            for buckets, _, tokens in checks
+            if tokens < 1
+        ]
+        if waits:
+            return max(waits)
+
+        for buckets, key, tokens in checks:
+            buckets.spend(key, tokens, now)
+        return None
+
+    def _log_rejection(self, scope, outcome: str) -> None:
+        """Log a rejection at DEBUG, and a warning at most once per interval."""
+        client = _client_key(scope)
+        logger.debug(f"Rate limit exceeded by {client} on {scope['path']}, {outcome}")
+
+        now = self.clock()
+        if now - self._last_log < self.log_interval:
+            self._suppressed += 1
+            return
+        suppressed, self._suppressed = self._suppressed, 0
+        self._last_log = now
+
+        note = f" ({suppressed} more since the last report)" if suppressed else ""
+        logger.warning(
+            f"Rate limit exceeded by {client} on {scope['path']}, {outcome}{note}"
+        )
+
+    def _limit_frames(self, scope, receive, send):
+        """Wrap a WebSocket's ``receive`` to admit each frame like a message."""
+        match = self._socket_path.match(scope["path"])
+        session = match.group(1) if match else None
+
+        async def receive_admitted():
+            while True:
+                message = await receive()
+                if message["type"] != "websocket.receive":
+                    return message
+
+                retry_after = self.admit(scope, session)
+                if retry_after is None:
+                    return message
+                self._log_rejection(scope, "dropping frame")
+                await send({
+                    "type": "websocket.send",
+                    "text": json.dumps({
+                        "success": False,
+                        "detail": "Too many requests",
+                        "retry_after": round(retry_after, 3),
+                    }),
+                })
+
+        return receive_admitted
+
+
+def _client_key(scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _reject(send, retry_after: float) -> None:
+    body = json.dumps({"detail": "Too many requests"}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,62 @@
+"""Fast JSON responses for high-rate endpoints."""
+# Standard library imports
+import json
+from functools import lru_cache
+from typing import Any, Dict, Tuple, Type, TypeVar, Union
+
+# Third-party imports
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Local application imports
+from app.core.config import settings
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class FastJSONResponse(Response):
+    """JSON response serialized with orjson, or compact stdlib JSON without it."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=str
+        ).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _model_fields(model: Type[BaseModel]) -> Tuple[Tuple[str, FieldInfo], ...]:
+    return tuple(model.model_fields.items())
+
+
+def build_response(model: Type[ModelT], **values: Any) -> Union[ModelT, Response]:
+    """Return a route's response model, or its serialized response in fast mode.
+
+    Normally the model is returned and FastAPI validates and serializes it
+    against the route's ``response_model``. With ``FAST_JSON_RESPONSES`` the
+    values are trusted instead: they are laid out in the model's field order,
+    with its defaults filled in, and written straight to JSON, which skips both
+    validation passes. Only use it for flat models built from internal values.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return model(**values)
+
+    payload: Dict[str, Any] = {}
+    for name, field in _model_fields(model):
+        if name in values:
+            payload[name] = values[name]
+        elif field.is_required():
+            raise TypeError(f"{model.__name__} is missing required field '{name}'")
+        else:
+            payload[name] = field.get_default(call_default_factory=True)
+    return FastJSONResponse(payload)
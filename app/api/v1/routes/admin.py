@@ -0,0 +1,246 @@
+"""Admin API routes."""
+# Standard library imports
+import logging
+import os
+from typing import Optional
+
+# Third-party imports
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+# Local application imports
+from app.api.dependencies import (
+    get_bot_name,
+    get_bot_registry,
+    get_chatbot_reloader,
+    get_chatbot_service,
+    get_loop_monitor,
+    get_memory_tracer,
+    get_query_log,
+    get_session_service,
+)
+from app.api.v1.schemas.admin import (
+    AddSamplesRequest,
+    AddSamplesResponse,
+    BotsResponse,
+    EventLoopStatsResponse,
+    MemoryResponse,
+    MemorySnapshotResponse,
+    QueryStatsResponse,
+    ReloadStatusResponse,
+    SessionListResponse,
+    SessionStatsResponse,
+)
+from app.core.config import settings
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.memory import MemoryTracer, read_memory
+from app.domain.services.bots import DEFAULT_BOT, BotRegistry
+from app.domain.services.chatbot import ChatbotService
+from app.domain.services.reloader import ChatbotReloader
+from app.domain.services.session import SessionService
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _default_bot_only(bot: str = Depends(get_bot_name)) -> None:
+    """Reject reloads routed to another bot; only the default bot is reloadable."""
+    if bot != DEFAULT_BOT:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Reloading is only available for the default bot, not {bot}"
+        )
+
+
+@router.post(
+    "/chatbot/reload",
+    response_model=ReloadStatusResponse,
+    status_code=202,
+    dependencies=[Depends(_default_bot_only)]
+)
+async def reload_chatbot(
+    reloader: ChatbotReloader = Depends(get_chatbot_reloader)
+):
+    """Rebuild the chatbot model from the dataset in the background."""
+    accepted = reloader.reload_in_background()
+    logger.info(f"Chatbot reload requested, accepted: {accepted}")
+    return ReloadStatusResponse(**reloader.get_status(), accepted=accepted)
+
+
+@router.get(
+    "/chatbot/reload",
+    response_model=ReloadStatusResponse,
+    dependencies=[Depends(_default_bot_only)]
+)
+async def reload_status(
+    reloader: ChatbotReloader = Depends(get_chatbot_reloader)
+):
+    """Get the state of the chatbot model reload."""
+    return ReloadStatusResponse(**reloader.get_status())
+
+
+@router.post("/chatbot/samples", response_model=AddSamplesResponse)
+def add_samples(
+    request: AddSamplesRequest,
+    chatbot_service: ChatbotService = Depends(get_chatbot_service)
+):
+    """Add dialogue samples to the live model without a full refit.
+
+    Runs in the threadpool: updating the model and its matrix would block the
+    event loop. Samples added this way are not written to the dataset and are
+    dropped by the next full reload.
+    """
+    added = chatbot_service.add_samples(request.samples, request.replies)
+    return AddSamplesResponse(
+        added=added,
+        total_questions=len(chatbot_service.questions)
+    )
+
+
+@router.get("/bots", response_model=BotsResponse)
+async def bots_status(
+    registry: BotRegistry = Depends(get_bot_registry)
+):
+    """Get the memory used by the bots' models and the metrics of each bot.
+
+    Models idle for longer than ``BOT_IDLE_SECONDS`` are evicted first.
+    """
+    registry.evict_idle()
+    return BotsResponse(**registry.get_status())
+
+
+@router.get("/sessions", response_model=SessionListResponse)
+async def list_sessions(
+    cursor: int = Query(0, ge=0, description="Scan cursor of the page"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of sessions"),
+    language: Optional[str] = Query(None, description="Only sessions in this language"),
+    min_idle_seconds: Optional[float] = Query(
+        None, ge=0, description="Only sessions idle for at least this long"
+    ),
+    max_idle_seconds: Optional[float] = Query(
+        None, ge=0, description="Only sessions active within this time"
+    ),
+    session_service: SessionService = Depends(get_session_service)
+):
+    """List active sessions a page at a time, optionally filtered.
+
+    Pages hold up to ``limit`` sessions (``SESSION_LIST_PAGE_SIZE`` by default, at
+    most ``SESSION_LIST_PAGE_MAX``) and examine at most ``SESSION_SCAN_BUDGET``
+    sessions, so filtered pages may be short; follow ``next_cursor`` until it is
+    absent.
+    """
+    page_size = min(
+        limit or settings.SESSION_LIST_PAGE_SIZE, settings.SESSION_LIST_PAGE_MAX
+    )
+    sessions, next_cursor = session_service.list_sessions(
+        cursor,
+        page_size,
+        language=language,
+        min_idle_seconds=min_idle_seconds,
+        max_idle_seconds=max_idle_seconds,
+        scan_budget=settings.SESSION_SCAN_BUDGET,
+    )
+    return SessionListResponse(
+        total_sessions=session_service.get_stats()["total_sessions"],
+        sessions=sessions,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/sessions/stats", response_model=SessionStatsResponse)
+async def session_stats(
+    session_service: SessionService = Depends(get_session_service)
+):
+    """Get session counts and age and idle time histograms.
+
+    The repository keeps these up to date as sessions change, so the cost of
+    this request does not grow with the number of sessions.
+    """
+    return SessionStatsResponse(**session_service.get_stats())
+
+
+@router.get("/event-loop", response_model=EventLoopStatsResponse)
+async def event_loop_stats(
+    monitor: LoopLagMonitor = Depends(get_loop_monitor)
+):
+    """Get the event loop lag histogram and the last blocking call detected."""
+    return EventLoopStatsResponse(**monitor.get_stats())
+
+
+@router.get("/queries", response_model=QueryStatsResponse)
+async def query_stats(
+    top: int = Query(10, ge=1, le=100, description="Number of top intents"),
+    bot: str = Depends(get_bot_name)
+):
+    """Get the top intents and fallback rates of the sampled queries of a bot.
+
+    Aggregates are updated as events are drained from the query log buffer, so
+    they cover every recorded query, written to the log files yet or not.
+    """
+    if not settings.QUERY_LOG_ENABLED:
+        raise HTTPException(status_code=404, detail="Query log is disabled")
+    return QueryStatsResponse(**get_query_log().get_stats(bot, top))
+
+
+@router.get("/memory", response_model=MemoryResponse)
+async def memory_usage(
+    sample: int = Query(
+        None, ge=1, le=100_000, description="Items sized per large container"
+    ),
+    bot: str = Depends(get_bot_name),
+    chatbot_service: ChatbotService = Depends(get_chatbot_service),
+    session_service: SessionService = Depends(get_session_service),
+    tracer: MemoryTracer = Depends(get_memory_tracer)
+):
+    """Get the process memory and estimated bytes per component of a bot.
+
+    Large containers (vocabulary, questions, replies, sessions, histories) are
+    sized from a sample of ``MEMORY_SAMPLE_SIZE`` items and scaled up, and
+    arrays report their buffers, so the cost does not grow with the model or
+    the number of sessions.
+    """
+    sample = sample or settings.MEMORY_SAMPLE_SIZE
+    usage = chatbot_service.get_memory_usage(sample)
+    usage.update(session_service.get_memory_usage(sample))
+    stats = session_service.get_stats()
+    process = read_memory(os.getpid())
+    return MemoryResponse(
+        bot=bot,
+        rss_bytes=None if process is None else process["rss"],
+        sample_size=sample,
+        components=[
+            {"name": name, "bytes": size} for name, size in usage.items()
+        ],
+        estimated_bytes=sum(usage.values()),
+        sessions=stats["total_sessions"],
+        turns=stats["total_turns"],
+        tracing=tracer.tracing
+    )
+
+
+@router.post("/memory/snapshots", response_model=MemorySnapshotResponse)
+def memory_snapshot(
+    top: int = Query(20, ge=1, le=500, description="Number of differences"),
+    group_by: str = Query(
+        "lineno",
+        pattern="^(lineno|filename|traceback)$",
+        description="Group allocations by line, file or traceback"
+    ),
+    tracer: MemoryTracer = Depends(get_memory_tracer)
+):
+    """Take a tracemalloc snapshot and diff it against the previous one.
+
+    The first snapshot starts tracing allocations, which slows them down until
+    tracing is stopped with ``DELETE``. Snapshots of a large process take a
+    while, so this route runs in the thread pool rather than on the event loop.
+    """
+    return MemorySnapshotResponse(**tracer.snapshot(top, group_by))
+
+
+@router.delete("/memory/snapshots", status_code=204)
+async def stop_memory_tracing(
+    tracer: MemoryTracer = Depends(get_memory_tracer)
+):
+    """Drop the last snapshot and stop tracing allocations."""
+    tracer.stop()
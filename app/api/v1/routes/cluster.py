@@ -0,0 +1,53 @@
+"""Cluster API routes - Hand sessions over when a router rebalances its nodes."""
+# Standard library imports
+import logging
+
+# Third-party imports
+from fastapi import APIRouter, Depends
+
+# Local application imports
+from app.api.dependencies import get_session_service
+from app.api.v1.schemas.cluster import (
+    SessionsTransfer,
+    ShardsRequest,
+    TransferCountResponse,
+)
+from app.domain.services.session import SessionService
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/internal/sessions", tags=["cluster"])
+
+
+@router.post("/export", response_model=SessionsTransfer)
+async def export_sessions(
+    request: ShardsRequest,
+    session_service: SessionService = Depends(get_session_service)
+):
+    """Get every session of the given shards, with its whole history."""
+    sessions = session_service.export_sessions(request.shards)
+    logger.info(f"Exporting {len(sessions)} sessions of {len(request.shards)} shards")
+    return SessionsTransfer(sessions=sessions)
+
+
+@router.post("/import", response_model=TransferCountResponse)
+async def import_sessions(
+    request: SessionsTransfer,
+    session_service: SessionService = Depends(get_session_service)
+):
+    """Store sessions exported by another node."""
+    return TransferCountResponse(
+        count=session_service.import_sessions(
+            session.model_dump() for session in request.sessions
+        )
+    )
+
+
+@router.post("/delete", response_model=TransferCountResponse)
+async def delete_sessions(
+    request: ShardsRequest,
+    session_service: SessionService = Depends(get_session_service)
+):
+    """Delete the sessions of the given shards once another node holds them."""
+    return TransferCountResponse(count=session_service.delete_sessions(request.shards))
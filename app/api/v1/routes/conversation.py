@@ -1,19 +1,31 @@
 """Conversation API routes."""
 # Standard library imports
+import json
 import logging
+from typing import Dict, Iterator, List, Optional
 
 # Third-party imports
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from fastapi.responses import StreamingResponse
 
 # Local application imports
-from app.api.dependencies import get_chatbot_service, get_session_service
+from app.api.dependencies import (
+    get_chatbot_service,
+    get_idempotency_store,
+    get_session_service,
+)
+from app.api.idempotency import IdempotencyStore, payload_fingerprint
+from app.api.responses import build_response
 from app.api.v1.schemas.conversation import (
     StartConversationRequest,
     StartConversationResponse,
     MessageRequest,
     MessageResponse,
-    SessionDebugResponse,
+    HistoryResponse,
 )
+from app.core.config import settings
+from app.core.exceptions import IdempotencyConflictException
+from app.domain.entities.session import SESSION_SHARDS
 from app.domain.services.chatbot import ChatbotService
 from app.domain.services.session import SessionService
 
@@ -26,6 +38,13 @@ router = APIRouter(prefix="/conversations", tags=["conversations"])
 @router.post("/start", response_model=StartConversationResponse)
 async def start_conversation(
     request: StartConversationRequest = StartConversationRequest(),
+    shard: Optional[int] = Header(
+        None,
+        alias="X-Session-Shard",
+        ge=0,
+        lt=SESSION_SHARDS,
+        description="Shard of the new session, chosen by the cluster router"
+    ),
     chatbot_service: ChatbotService = Depends(get_chatbot_service),
     session_service: SessionService = Depends(get_session_service)
 ):
@@ -34,7 +53,7 @@ async def start_conversation(
         logger.info(f"Starting conversation with language: {request.language}")
         
         # Create session
-        session_id = session_service.create_session(request.language)
+        session_id = session_service.create_session(request.language, shard)
         logger.info(f"Created session_id: {session_id}")
         
         # Verify session was created
@@ -45,7 +64,8 @@ async def start_conversation(
         greeting = chatbot_service.get_greeting(request.language)
         logger.info(f"Generated greeting: {greeting}")
         
-        return StartConversationResponse(
+        return build_response(
+            StartConversationResponse,
             session_id=session_id,
             message=greeting,
             success=True
@@ -60,38 +80,63 @@ async def start_conversation(
 async def send_message(
     session_id: str,
     request: MessageRequest,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Key of the submission, so that retries are answered once"
+    ),
     chatbot_service: ChatbotService = Depends(get_chatbot_service),
-    session_service: SessionService = Depends(get_session_service)
+    session_service: SessionService = Depends(get_session_service),
+    idempotency_store: IdempotencyStore = Depends(get_idempotency_store)
 ):
-    """Send a message in a conversation."""
+    """Send a message in a conversation.
+
+    With an ``Idempotency-Key`` header, a retry of the same message with the
+    same key gets the stored response of the first attempt, and a duplicate
+    arriving while the first attempt runs waits for it; the message is
+    processed and added to the history once. Keys are kept for
+    ``IDEMPOTENCY_TTL_SECONDS``.
+    """
+    async def reply():
+        return _reply(session_id, request, chatbot_service, session_service)
+
+    if idempotency_key is None:
+        return _reply(session_id, request, chatbot_service, session_service)
+
     try:
-        logger.info(f"Processing message for session_id: '{session_id}'")
-        logger.info(f"Session_id type: {type(session_id)}")
-        logger.info(f"Session_id length: {len(session_id)}")
-        logger.info(f"Message content: '{request.message}'")
-        
-        # Debug: Get all sessions
-        all_sessions = session_service._session_repo.get_all_sessions()
-        logger.info(f"Total sessions in memory: {len(all_sessions)}")
-        logger.info(f"Available session_ids: {list(all_sessions.keys())}")
+        response, _ = await idempotency_store.run(
+            (session_id, idempotency_key),
+            payload_fingerprint(request.message),
+            reply
+        )
+    except IdempotencyConflictException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return response
+
+
+def _reply(
+    session_id: str,
+    request: MessageRequest,
+    chatbot_service: ChatbotService,
+    session_service: SessionService
+):
+    """Answer a message and add the exchange to the session's history."""
+    try:
+        logger.debug(f"Processing message for session_id: '{session_id}'")
         
         # Verify session exists
         session = session_service.get_session(session_id)
-        logger.info(f"Session found: {session is not None}")
         
         if not session:
             logger.error(f"Session '{session_id}' not found!")
-            logger.error(f"Available sessions: {list(all_sessions.keys())}")
             raise HTTPException(
                 status_code=404,
-                detail=f"Session '{session_id}' not found. Available sessions: {len(all_sessions)}"
+                detail=f"Session '{session_id}' not found"
             )
         
-        logger.info(f"Session data: {session}")
-        
-        # Process message
+        # Process message (sampled into the query log, see QUERY_LOG_ENABLED)
         bot_response = chatbot_service.process_message(request.message)
-        logger.info(f"Bot response: {bot_response}")
         
         # Add to conversation history
         history_updated = session_service.add_message_to_history(
@@ -99,9 +144,11 @@ async def send_message(
             request.message, 
             bot_response
         )
-        logger.info(f"History updated: {history_updated}")
+        if not history_updated:
+            logger.warning(f"History of session '{session_id}' was not updated")
         
-        return MessageResponse(
+        return build_response(
+            MessageResponse,
             session_id=session_id,
             message=bot_response,
             success=True
@@ -114,20 +161,43 @@ async def send_message(
         raise HTTPException(status_code=500, detail=f"Failed to process message: {str(e)}")
 
 
-@router.get("/debug/sessions", response_model=SessionDebugResponse)
-async def debug_sessions(
+def _ndjson_lines(chunks: Iterator[List[Dict]]) -> Iterator[bytes]:
+    """Serialize chunks of turns as newline-delimited JSON, one chunk at a time."""
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(turn, ensure_ascii=False, default=str) + "\n" for turn in chunk
+        ).encode("utf-8")
+
+
+@router.get("/{session_id}/history", response_model=HistoryResponse)
+async def get_history(
+    session_id: str,
+    cursor: int = Query(0, ge=0, description="Index of the first turn to return"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of turns"),
+    stream: bool = Query(False, description="Stream all turns as NDJSON"),
     session_service: SessionService = Depends(get_session_service)
 ):
-    """Get debug information about active sessions."""
-    try:
-        sessions = session_service._session_repo.get_all_sessions()
-        logger.info(f"Debug: Found {len(sessions)} sessions")
-        
-        return SessionDebugResponse(
-            total_sessions=len(sessions),
-            session_ids=list(sessions.keys())
+    """Read a conversation's history, a page at a time or streamed.
+
+    Pages hold ``limit`` turns (``HISTORY_PAGE_SIZE`` by default, at most
+    ``HISTORY_PAGE_MAX``) and carry the cursor of the next page. With
+    ``stream=true`` every turn from the cursor on, up to ``limit``, is sent as one
+    JSON object per line while it is read from the session store.
+    """
+    if stream:
+        chunks = session_service.iter_history(
+            session_id, cursor, limit, settings.HISTORY_STREAM_CHUNK
         )
-        
-    except Exception as e:
-        logger.error(f"Error getting debug info: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get debug info")
+        if chunks is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return StreamingResponse(
+            _ndjson_lines(chunks), media_type="application/x-ndjson"
+        )
+
+    page_size = min(limit or settings.HISTORY_PAGE_SIZE, settings.HISTORY_PAGE_MAX)
+    page = session_service.get_history_page(session_id, cursor, page_size)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    turns, next_cursor = page
+    return HistoryResponse(session_id=session_id, turns=turns, next_cursor=next_cursor)
@@ -0,0 +1,153 @@
+"""Conversation WebSocket routes."""
+# Standard library imports
+import asyncio
+import json
+import logging
+from typing import Optional
+
+# Third-party imports
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import run_in_threadpool
+
+# Local application imports
+from app.api.dependencies import get_chatbot_service, get_session_service
+from app.core.config import settings
+from app.domain.services.chatbot import ChatbotService
+from app.domain.services.session import SessionService
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/conversations", tags=["conversations"])
+
+
+class ConnectionLimiter:
+    """Caps the number of concurrently open WebSocket connections per worker."""
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.active = 0
+
+    def try_acquire(self) -> bool:
+        """Reserve a connection slot, returning False when the worker is full."""
+        if self.active >= self.max_connections:
+            return False
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        """Free a previously reserved connection slot."""
+        self.active = max(0, self.active - 1)
+
+
+connection_limiter = ConnectionLimiter(settings.WS_MAX_CONNECTIONS)
+
+
+def _parse_frame(frame: str) -> str:
+    """Extract the user message from a plain-text or {"message": ...} JSON frame."""
+    if frame.startswith("{"):
+        try:
+            payload = json.loads(frame)
+        except json.JSONDecodeError:
+            return frame
+        if isinstance(payload, dict):
+            message = payload.get("message")
+            return message if isinstance(message, str) else ""
+    return frame
+
+
+async def _receive_frame(websocket: WebSocket) -> Optional[str]:
+    """Wait for the next frame: its text, or None for a binary frame."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+    return message.get("text")
+
+
+def _answer(
+    session_id: str,
+    message: str,
+    chatbot_service: ChatbotService,
+    session_service: SessionService
+) -> Optional[str]:
+    """Answer a message and record the exchange; None if the session is gone."""
+    bot_response = chatbot_service.process_message(message)
+    if not session_service.add_message_to_history(session_id, message, bot_response):
+        return None
+    return bot_response
+
+
+async def _send_error(websocket: WebSocket, detail: str) -> None:
+    await websocket.send_text(json.dumps({"success": False, "detail": detail}))
+
+
+@router.websocket("/{session_id}/ws")
+async def conversation_socket(
+    websocket: WebSocket,
+    session_id: str,
+    chatbot_service: ChatbotService = Depends(get_chatbot_service),
+    session_service: SessionService = Depends(get_session_service)
+):
+    """Hold a persistent chat connection bound to a single session.
+
+    The session is resolved once during the handshake. Frames are handled one at
+    a time, so a client that floods the socket is throttled by TCP flow control
+    instead of queueing unbounded work in the worker.
+    """
+    if not connection_limiter.try_acquire():
+        logger.warning("WebSocket connection limit reached, rejecting connection")
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    try:
+        if not session_service.get_session(session_id):
+            logger.warning(f"WebSocket rejected, session '{session_id}' not found")
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+        await websocket.accept()
+        logger.debug(f"WebSocket opened for session_id: {session_id}")
+
+        while True:
+            try:
+                frame = await asyncio.wait_for(
+                    _receive_frame(websocket),
+                    timeout=settings.WS_IDLE_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                logger.debug(f"WebSocket idle timeout for session_id: {session_id}")
+                await websocket.close(code=status.WS_1000_NORMAL_CLOSURE)
+                return
+
+            if frame is None:
+                await _send_error(websocket, "Frames must be text")
+                continue
+
+            message = _parse_frame(frame).strip()
+            if not message or len(message) > settings.WS_MAX_MESSAGE_LENGTH:
+                await _send_error(
+                    websocket,
+                    f"Message must be 1-{settings.WS_MAX_MESSAGE_LENGTH} characters"
+                )
+                continue
+
+            # Matching and spelling correction would stall every other socket
+            # and request of the worker if they ran on the event loop
+            bot_response = await run_in_threadpool(
+                _answer, session_id, message, chatbot_service, session_service
+            )
+            if bot_response is None:
+                await _send_error(websocket, f"Session '{session_id}' not found")
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
+
+            await websocket.send_text(json.dumps({
+                "session_id": session_id,
+                "message": bot_response,
+                "success": True
+            }))
+
+    except WebSocketDisconnect:
+        logger.debug(f"WebSocket closed by client for session_id: {session_id}")
+    finally:
+        connection_limiter.release()
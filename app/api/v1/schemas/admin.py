@@ -0,0 +1,207 @@
+"""Admin API schemas."""
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class ReloadStatusResponse(BaseModel):
+    """Response schema for the chatbot model reload state."""
+    status: str = Field(description="Reload state: idle, reloading or failed")
+    version: int = Field(description="Number of successful reloads since startup")
+    last_reload_at: Optional[datetime] = Field(
+        default=None,
+        description="Time of the last successful reload"
+    )
+    last_error: Optional[str] = Field(
+        default=None,
+        description="Error of the last failed reload"
+    )
+    watching: bool = Field(description="Whether the dataset file is being watched")
+    accepted: Optional[bool] = Field(
+        default=None,
+        description="Whether a reload request started a new reload"
+    )
+
+
+class AddSamplesRequest(BaseModel):
+    """Request schema for adding dialogue samples to the live model."""
+    samples: List[str] = Field(
+        min_length=1,
+        description="Example user questions for the dialogue"
+    )
+    replies: List[str] = Field(
+        min_length=1,
+        description="Replies the chatbot may answer with"
+    )
+
+
+class AddSamplesResponse(BaseModel):
+    """Response schema for added dialogue samples."""
+    added: int = Field(description="Number of questions added")
+    total_questions: int = Field(description="Number of questions in the model")
+
+
+class BotStatus(BaseModel):
+    """Metrics of one hosted bot."""
+    name: str = Field(description="Bot name")
+    loaded: bool = Field(description="Whether the bot's model is in memory")
+    requests: int = Field(description="Requests that used the bot's model")
+    loads: int = Field(description="Times the model was loaded")
+    evictions: int = Field(description="Times the model was evicted")
+    load_seconds: Optional[float] = Field(
+        default=None, description="Duration of the last load"
+    )
+    memory_bytes: int = Field(description="Estimated memory of the loaded model")
+    idle_seconds: Optional[float] = Field(
+        default=None, description="Time since the last request, absent if never used"
+    )
+    sessions: int = Field(description="Active sessions of the bot")
+
+
+class BotsResponse(BaseModel):
+    """Response schema for the hosted bots."""
+    memory_budget_bytes: int = Field(
+        description="Memory budget of the models, 0 if none"
+    )
+    loaded_bytes: int = Field(description="Memory allocated by the loaded models")
+    bots: List[BotStatus] = Field(description="Bots configured besides the default")
+
+
+class LagBin(BaseModel):
+    """Lag measurements that fall in one histogram bin."""
+    max_seconds: Optional[float] = Field(
+        default=None, description="Upper bound of the bin, absent for the last one"
+    )
+    samples: int = Field(description="Number of measurements in the bin")
+
+
+class BlockedCall(BaseModel):
+    """A callback caught blocking the event loop."""
+    detected_at: datetime = Field(description="When the block was detected")
+    blocked_seconds: float = Field(description="How long the loop was blocked by then")
+    stack: List[str] = Field(description="Stack of the loop thread, innermost last")
+
+
+class EventLoopStatsResponse(BaseModel):
+    """Response schema for event loop lag statistics."""
+    running: bool = Field(description="Whether the loop monitor is running")
+    samples: int = Field(description="Number of lag measurements")
+    mean_lag_seconds: float = Field(description="Mean scheduling lag")
+    max_lag_seconds: float = Field(description="Largest scheduling lag")
+    lag_histogram: List[LagBin] = Field(description="Scheduling lag distribution")
+    blocked: int = Field(description="Number of blocking calls detected")
+    last_block: Optional[BlockedCall] = Field(
+        default=None, description="Last blocking call detected"
+    )
+
+
+class IntentCount(BaseModel):
+    """Sampled queries answered with one intent."""
+    intent: str = Field(description="Intent name")
+    count: int = Field(description="Number of sampled queries")
+    share: float = Field(description="Share of all sampled queries")
+
+
+class MinuteCount(BaseModel):
+    """Sampled queries of one minute."""
+    minute: datetime = Field(description="Start of the minute")
+    queries: int = Field(description="Number of sampled queries")
+    fallbacks: int = Field(description="Sampled queries answered with a fallback")
+
+
+class QueryStatsResponse(BaseModel):
+    """Response schema for the aggregates of the query log."""
+    bot: str = Field(description="Bot whose queries are aggregated")
+    sample_rate: float = Field(description="Share of messages recorded")
+    recorded: int = Field(description="Events recorded, for all bots")
+    dropped: int = Field(description="Events dropped by a full buffer")
+    written: int = Field(description="Events written to the log files")
+    queries: int = Field(description="Sampled queries of the bot")
+    fallbacks: int = Field(description="Sampled queries answered with a fallback")
+    fallback_rate: float = Field(description="Share of fallback replies")
+    corrected: int = Field(description="Sampled queries retried with typos corrected")
+    mean_latency_ms: float = Field(description="Mean time to answer a query")
+    top_intents: List[IntentCount] = Field(description="Most frequent intents")
+    minutes: List[MinuteCount] = Field(description="Counts of the last minutes")
+
+
+class MemoryComponent(BaseModel):
+    """Estimated memory of one part of the chatbot or session store."""
+    name: str = Field(description="Component name")
+    bytes: int = Field(description="Estimated bytes")
+
+
+class MemoryResponse(BaseModel):
+    """Response schema for the memory used by the process and its components."""
+    bot: str = Field(description="Bot whose model and sessions are measured")
+    rss_bytes: Optional[int] = Field(
+        default=None, description="Resident memory of the process, if known"
+    )
+    sample_size: int = Field(description="Items sized per large container")
+    components: List[MemoryComponent] = Field(description="Estimated components")
+    estimated_bytes: int = Field(description="Sum of the component estimates")
+    sessions: int = Field(description="Sessions held")
+    turns: int = Field(description="History turns held")
+    tracing: bool = Field(description="Whether tracemalloc traces allocations")
+
+
+class AllocationDiff(BaseModel):
+    """Change of the memory allocated at one place between two snapshots."""
+    location: List[str] = Field(description="Allocation frames, innermost last")
+    size_bytes: int = Field(description="Bytes allocated there now")
+    size_diff_bytes: int = Field(description="Change since the previous snapshot")
+    count: int = Field(description="Blocks allocated there now")
+    count_diff: int = Field(description="Change since the previous snapshot")
+
+
+class MemorySnapshotResponse(BaseModel):
+    """Response schema for a tracemalloc snapshot."""
+    taken_at: datetime = Field(description="When the snapshot was taken")
+    compared_to: Optional[datetime] = Field(
+        default=None, description="Time of the previous snapshot, absent for the first"
+    )
+    traced_bytes: int = Field(description="Memory allocated while tracing")
+    peak_traced_bytes: int = Field(description="Peak of the traced memory")
+    differences: List[AllocationDiff] = Field(
+        description="Largest changes since the previous snapshot"
+    )
+
+
+class SessionSummary(BaseModel):
+    """Listing entry of one session, without its history."""
+    id: str = Field(description="Session identifier")
+    language: Optional[str] = Field(default=None, description="Conversation language")
+    created_at: datetime = Field(description="When the session was created")
+    last_activity: datetime = Field(description="When the session was last used")
+    turns: int = Field(description="Number of exchanges in the history")
+
+
+class SessionListResponse(BaseModel):
+    """Response schema for one page of the session listing."""
+    total_sessions: int = Field(description="Total number of active sessions")
+    sessions: List[SessionSummary] = Field(description="Matching sessions of this page")
+    next_cursor: Optional[int] = Field(
+        default=None,
+        description="Cursor of the next page, absent once the scan is complete"
+    )
+
+
+class HistogramBin(BaseModel):
+    """Sessions whose age or idle time falls in one bin."""
+    max_seconds: Optional[int] = Field(
+        default=None, description="Upper bound of the bin, absent for the last one"
+    )
+    sessions: int = Field(description="Number of sessions in the bin")
+
+
+class SessionStatsResponse(BaseModel):
+    """Response schema for aggregate session statistics."""
+    total_sessions: int = Field(description="Total number of active sessions")
+    total_turns: int = Field(description="Exchanges across all sessions")
+    languages: Dict[str, int] = Field(description="Sessions per language")
+    age_histogram: List[HistogramBin] = Field(
+        description="Sessions by time since creation"
+    )
+    idle_histogram: List[HistogramBin] = Field(
+        description="Sessions by time since last activity"
+    )
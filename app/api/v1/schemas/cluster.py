@@ -0,0 +1,34 @@
+"""Cluster API schemas for handing sessions over between nodes."""
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, List
+from datetime import datetime
+
+from app.domain.entities.session import SESSION_SHARDS
+
+
+class TransferredSession(BaseModel):
+    """A whole session, as stored, on its way to another node."""
+    model_config = ConfigDict(extra="allow")
+
+    id: str = Field(description="Session ID")
+    language: str = Field(description="Conversation language")
+    created_at: datetime = Field(description="When the session was created")
+    last_activity: datetime = Field(description="Last time the session was used")
+    conversation_history: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Turns of the conversation, oldest first"
+    )
+
+
+class ShardsRequest(BaseModel):
+    """Request schema naming the shards to export or delete."""
+    shards: List[int] = Field(description=f"Shards, from 0 to {SESSION_SHARDS - 1}")
+
+
+class SessionsTransfer(BaseModel):
+    """Sessions exported by one node, to be imported by another."""
+    sessions: List[TransferredSession] = Field(description="Sessions handed over")
+
+
+class TransferCountResponse(BaseModel):
+    """Response schema for the number of sessions imported or deleted."""
+    count: int = Field(description="Number of sessions imported or deleted")
@@ -1,6 +1,6 @@
 """Conversation API schemas for request/response validation."""
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -46,10 +46,21 @@ class MessageResponse(BaseModel):
     success: bool = Field(description="Operation success indicator")
 
 
-class SessionDebugResponse(BaseModel):
-    """Response schema for session debugging."""
-    total_sessions: int = Field(description="Total number of active sessions")
-    session_ids: list[str] = Field(description="List of session IDs")
+class HistoryTurn(BaseModel):
+    """One exchange of a conversation."""
+    timestamp: str = Field(description="When the message was answered (ISO 8601)")
+    user_message: str = Field(description="Message sent by the user")
+    bot_response: str = Field(description="Reply of the chatbot")
+
+
+class HistoryResponse(BaseModel):
+    """Response schema for one page of conversation history."""
+    session_id: str = Field(description="Session identifier")
+    turns: List[HistoryTurn] = Field(description="Turns of this page, oldest first")
+    next_cursor: Optional[int] = Field(
+        default=None,
+        description="Cursor of the next page, absent on the last page"
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,96 @@
+"""Session router in front of several chatbot nodes that keep sessions in memory.
+
+Each node must be a single process (``chatbot-serve --workers 1``, or uvicorn),
+with ``CLUSTER_NODE_ENABLED=true`` so that sessions can be handed over to it,
+and the same ``CLUSTER_SECRET`` as the router, which also guards the router's
+``/cluster/nodes`` membership routes. Nodes should trust the router's address
+for ``X-Forwarded-For`` (``SERVER_FORWARDED_ALLOW_IPS``).
+
+    chatbot-route --node a=http://10.0.0.1:8080 --node b=http://10.0.0.2:8080
+"""
+# Standard library imports
+import argparse
+import logging
+import sys
+from typing import Dict, List, Optional, Sequence
+
+# Third-party imports
+import uvicorn
+
+# Local application imports
+from app.core.config import settings
+from app.infrastructure.cluster.router import SessionRouter
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_nodes(specs: Sequence[str]) -> Dict[str, str]:
+    """Parse ``name=url`` node specifications."""
+    nodes: Dict[str, str] = {}
+    for spec in specs:
+        name, sep, url = spec.partition("=")
+        if not sep or not name or not url:
+            raise ValueError(f"Expected name=url, got '{spec}'")
+        nodes[name] = url
+    return nodes
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="chatbot-route",
+        description="Route conversations to the chatbot node holding their session."
+    )
+    parser.add_argument(
+        "--node", action="append", required=True, metavar="NAME=URL",
+        help="A node and its base URL; repeat for every node"
+    )
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument(
+        "--vnodes", type=int, default=64,
+        help="Points of each node on the hash ring"
+    )
+    parser.add_argument(
+        "--bot", action="append", default=[],
+        help="A bot whose sessions are handed over too; repeat for every bot"
+    )
+    parser.add_argument(
+        "--secret", default=settings.CLUSTER_SECRET,
+        help="Secret the nodes check on hand-overs (default: CLUSTER_SECRET)"
+    )
+    parser.add_argument("--log-level", default=settings.LOG_LEVEL.lower())
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the chatbot-route command."""
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    try:
+        nodes = parse_nodes(args.node)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
+    if not args.secret:
+        logger.error("Set CLUSTER_SECRET (or --secret) to the nodes' secret")
+        return 2
+
+    router = SessionRouter(
+        nodes,
+        prefix=settings.API_V1_PREFIX,
+        vnodes=args.vnodes,
+        bots=args.bot,
+        secret=args.secret
+    )
+    logger.info(f"Routing to {len(nodes)} nodes: {', '.join(nodes)}")
+    uvicorn.run(router, host=args.host, port=args.port, log_level=args.log_level)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
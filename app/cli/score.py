@@ -0,0 +1,261 @@
+"""Offline bulk scoring of user utterances through the chatbot matcher.
+
+Streams a JSONL or CSV file in chunks, fans the chunks out across a process pool
+and writes one scored row per input message. Only a bounded number of chunks is
+in flight at any time, so memory stays flat regardless of the input size.
+"""
+# Standard library imports
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Local application imports
+from app.domain.services.chatbot import ChatbotService
+
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FIELDS = [
+    "message", "intent", "matched_question", "question_index", "confidence",
+    "fallback"
+]
+
+# Keyword-routed messages have no matched question, index -1 and no confidence
+ScoredRow = Tuple[str, str, str, int, Optional[float], bool]
+
+# Per-process service, built once by the pool initializer
+_worker_service: Optional[ChatbotService] = None
+
+
+@dataclass
+class ScoringSummary:
+    """Throughput summary of a scoring run."""
+    total: int = 0
+    fallbacks: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.total / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def fallback_rate(self) -> float:
+        return self.fallbacks / self.total if self.total else 0.0
+
+
+def _detect_format(path: str, fmt: str) -> str:
+    """Resolve 'auto' to a concrete file format from the file extension."""
+    if fmt != "auto":
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def iter_messages(stream: TextIO, fmt: str, field: str = "message") -> Iterator[str]:
+    """Yield messages one by one from a JSONL or CSV stream."""
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            message = row.get(field)
+            if message:
+                yield message
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping invalid JSON on line {line_number}: {e}")
+            continue
+        message = record.get(field) if isinstance(record, dict) else record
+        if isinstance(message, str) and message:
+            yield message
+
+
+def iter_chunks(messages: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    """Group an iterable of messages into lists of at most chunk_size items."""
+    iterator = iter(messages)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker(service_factory: Callable[[], ChatbotService], log_level: int) -> None:
+    """Build the chatbot model once per worker process."""
+    global _worker_service
+    logging.getLogger().setLevel(log_level)
+    _worker_service = service_factory()
+
+
+def _score_with(service: ChatbotService, messages: List[str]) -> List[ScoredRow]:
+    """Score a chunk of messages with the given service.
+
+    Messages are routed as the API routes them, keyword intents included, so
+    the fallbacks and intents reported match production.
+    """
+    rows = []
+    for message, (intent, match) in zip(messages, service.classify_batch(messages)):
+        if match is None or match.question_index < 0:
+            matched_question, question_index = "", -1
+        else:
+            matched_question = service.questions[match.question_index]
+            question_index = match.question_index
+        rows.append((
+            message,
+            intent or "",
+            matched_question,
+            question_index,
+            None if match is None else round(match.confidence, 6),
+            intent is None,
+        ))
+    return rows
+
+
+def _score_chunk(messages: List[str]) -> List[ScoredRow]:
+    """Score a chunk of messages inside a pool worker."""
+    return _score_with(_worker_service, messages)
+
+
+class _RowWriter:
+    """Write scored rows as CSV or JSONL."""
+
+    def __init__(self, stream: TextIO, fmt: str):
+        self._stream = stream
+        self._csv = csv.writer(stream) if fmt == "csv" else None
+        if self._csv:
+            self._csv.writerow(OUTPUT_FIELDS)
+
+    def write(self, rows: List[ScoredRow]) -> None:
+        if self._csv:
+            self._csv.writerows(rows)
+            return
+        for row in rows:
+            self._stream.write(json.dumps(dict(zip(OUTPUT_FIELDS, row))) + "\n")
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    input_format: str = "auto",
+    output_format: str = "auto",
+    field: str = "message",
+    chunk_size: int = 1000,
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    service_factory: Callable[[], ChatbotService] = ChatbotService,
+) -> ScoringSummary:
+    """Score every message in input_path and write the results to output_path.
+
+    With a single worker the chunks are scored in-process; otherwise they are
+    submitted to a process pool, keeping at most max_pending chunks in flight and
+    writing results back in input order.
+    """
+    input_format = _detect_format(input_path, input_format)
+    output_format = _detect_format(output_path, output_format)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+
+    summary = ScoringSummary()
+    started = time.perf_counter()
+
+    def consume(rows: List[ScoredRow]) -> None:
+        writer.write(rows)
+        summary.total += len(rows)
+        summary.fallbacks += sum(1 for row in rows if row[-1])
+
+    with open(input_path, newline="", encoding="utf-8") as source, \
+            open(output_path, "w", newline="", encoding="utf-8") as target:
+        writer = _RowWriter(target, output_format)
+        chunks = iter_chunks(iter_messages(source, input_format, field), chunk_size)
+
+        if workers == 1:
+            service = service_factory()
+            for chunk in chunks:
+                consume(_score_with(service, chunk))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(service_factory, logging.getLogger().level),
+            ) as executor:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(_score_chunk, chunk))
+                    if len(pending) >= max_pending:
+                        consume(pending.popleft().result())
+                while pending:
+                    consume(pending.popleft().result())
+
+    summary.elapsed_seconds = time.perf_counter() - started
+    return summary
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="chatbot-score",
+        description="Score a JSONL/CSV file of user messages with the chatbot matcher."
+    )
+    formats = ["auto", "jsonl", "csv"]
+    parser.add_argument("input", help="Input file (.jsonl or .csv)")
+    parser.add_argument("output", help="Output file (.jsonl or .csv)")
+    parser.add_argument("--input-format", choices=formats, default="auto")
+    parser.add_argument("--output-format", choices=formats, default="auto")
+    parser.add_argument(
+        "--field", default="message",
+        help="JSON key or CSV column holding the message"
+    )
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--max-pending", type=int, default=None,
+        help="Chunks in flight (default: 2 x workers)"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the chatbot-score command."""
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    summary = score_file(
+        args.input,
+        args.output,
+        input_format=args.input_format,
+        output_format=args.output_format,
+        field=args.field,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        max_pending=args.max_pending,
+    )
+
+    print(
+        f"Scored {summary.total} messages in {summary.elapsed_seconds:.2f}s "
+        f"({summary.messages_per_second:.0f} msg/s), "
+        f"fallback rate {summary.fallback_rate:.2%}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
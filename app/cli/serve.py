@@ -0,0 +1,319 @@
+"""Production server with the chatbot model shared by forked workers.
+
+The parent process imports the application and builds the chatbot model once,
+freezes the garbage collector so that the model's objects are never written to
+by a collection, binds the listening socket and forks the workers. Workers
+inherit the model pages copy-on-write instead of each building their own copy;
+the question matrices are NumPy/SciPy arrays whose buffers are never touched by
+reference counting. The parent then supervises the workers, restarting any that
+die and periodically logging how much of each worker's memory is still shared.
+"""
+# Standard library imports
+import argparse
+import gc
+import importlib.util
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Third-party imports
+import uvicorn
+
+# Local application imports
+from app.core.config import settings
+from app.core.memory import read_memory
+
+
+logger = logging.getLogger(__name__)
+
+# Restart delays of workers that keep dying: doubled from the minimum on every
+# death within STABLE_UPTIME_SECONDS of starting, up to the maximum
+RESTART_DELAY_MIN_SECONDS = 0.5
+RESTART_DELAY_MAX_SECONDS = 30.0
+STABLE_UPTIME_SECONDS = 10.0
+
+
+def event_loop_choice() -> str:
+    """Use uvloop when it is installed."""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol_choice() -> str:
+    """Use the httptools parser when it is installed."""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def preload():
+    """Import the application and build the chatbot model in this process."""
+    from app.api.dependencies import get_chatbot_service
+    from app.main import app
+
+    started = time.perf_counter()
+    service = get_chatbot_service()
+    # Run one message through the whole path so lazy imports happen here
+    service.process_message("warm up")
+    logger.info(f"Chatbot model built in {time.perf_counter() - started:.2f}s")
+
+    # Move everything allocated so far out of the collector's reach: collections
+    # in the workers would otherwise write to every tracked object and unshare
+    # their pages.
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Create the listening socket shared by all workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerSupervisor:
+    """Forks the workers, restarts them if they die and stops them on a signal.
+
+    A worker that dies soon after starting is restarted after a delay that
+    doubles with each such death, so that a worker crashing on startup does not
+    make the supervisor fork in a tight loop.
+    """
+
+    def __init__(
+        self,
+        app,
+        sock: socket.socket,
+        workers: int,
+        memory_report_interval: float = 60.0,
+        graceful_timeout: float = 30.0,
+        log_level: str = "info",
+        forwarded_allow_ips: Optional[str] = None,
+        clock=time.monotonic
+    ):
+        """Initialize with an already imported app and a bound socket."""
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.memory_report_interval = memory_report_interval
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.forwarded_allow_ips = forwarded_allow_ips
+        self.pids: List[int] = []
+        self._stop = threading.Event()
+        self._clock = clock
+        self._started: Dict[int, float] = {}
+        self._restart_delay = 0.0
+        # Times at which replacements of dead workers are due
+        self._restarts: List[float] = []
+
+    def _start_worker(self) -> None:
+        pid = self._spawn()
+        self.pids.append(pid)
+        self._started[pid] = self._clock()
+
+    def _spawn(self) -> int:
+        pid = os.fork()
+        if pid:
+            return pid
+
+        # Worker process: never return into the supervisor's code
+        status = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            random.seed()
+            config = uvicorn.Config(
+                self.app,
+                loop=event_loop_choice(),
+                http=http_protocol_choice(),
+                log_level=self.log_level,
+                timeout_graceful_shutdown=int(self.graceful_timeout),
+                forwarded_allow_ips=self.forwarded_allow_ips,
+            )
+            uvicorn.Server(config).run(sockets=[self.sock])
+        except BaseException:
+            logger.exception("Worker crashed")
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _handle_signal(self, signum, frame) -> None:
+        logger.info(f"Received signal {signum}, stopping workers")
+        self._stop.set()
+
+    def _reap(self) -> None:
+        """Collect exited workers and replace them unless shutting down."""
+        while self.pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid not in self.pids:
+                continue
+
+            self.pids.remove(pid)
+            now = self._clock()
+            started = self._started.pop(pid, now)
+            if self._stop.is_set():
+                continue
+
+            if now - started >= STABLE_UPTIME_SECONDS:
+                self._restart_delay = 0.0
+            else:
+                self._restart_delay = min(
+                    max(self._restart_delay * 2, RESTART_DELAY_MIN_SECONDS),
+                    RESTART_DELAY_MAX_SECONDS
+                )
+            self._restarts.append(now + self._restart_delay)
+            logger.warning(
+                f"Worker {pid} exited with status {status}, starting a new one "
+                f"in {self._restart_delay:.1f}s"
+            )
+
+    def _restart_due(self) -> None:
+        """Start the replacements of dead workers whose delay has passed."""
+        now = self._clock()
+        due = [at for at in self._restarts if at <= now]
+        if not due:
+            return
+        self._restarts = [at for at in self._restarts if at > now]
+        for _ in due:
+            self._start_worker()
+
+    def report_memory(self) -> None:
+        """Log the memory of each worker and how much of it is shared."""
+        for pid in self.pids:
+            usage = read_memory(pid)
+            if usage is None:
+                continue
+            mib = {key: value / (1024 * 1024) for key, value in usage.items()}
+            logger.info(
+                f"Worker {pid}: rss {mib['rss']:.1f} MiB, pss {mib['pss']:.1f} MiB, "
+                f"shared {mib['shared']:.1f} MiB, private {mib['private']:.1f} MiB"
+            )
+
+    def run(self) -> int:
+        """Start the workers and supervise them until SIGINT or SIGTERM."""
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+
+        for _ in range(self.workers):
+            self._start_worker()
+        logger.info(f"Started {self.workers} workers: {self.pids}")
+
+        next_report = time.monotonic() + self.memory_report_interval
+        while not self._stop.wait(timeout=0.5):
+            self._reap()
+            self._restart_due()
+            if self.memory_report_interval > 0 and time.monotonic() >= next_report:
+                self.report_memory()
+                next_report = time.monotonic() + self.memory_report_interval
+
+        self.shutdown()
+        return 0
+
+    def shutdown(self) -> None:
+        """Stop the workers gracefully, killing those that do not exit in time."""
+        self._restarts = []
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.pids and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+
+        for pid in self.pids:
+            logger.warning(f"Worker {pid} did not stop in time, killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.pids = []
+        self._started = {}
+        self.sock.close()
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="chatbot-serve",
+        description="Serve the chatbot API from preforked workers sharing one model."
+    )
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument(
+        "--workers", type=int, default=settings.SERVER_WORKERS,
+        help="Number of worker processes, 0 for one per CPU (default: 1); "
+        "sessions live in one worker's memory, see SERVER_WORKERS"
+    )
+    parser.add_argument(
+        "--memory-report-interval", type=float,
+        default=settings.SERVER_MEMORY_REPORT_INTERVAL_SECONDS,
+        help="Seconds between worker memory reports, 0 to disable"
+    )
+    parser.add_argument(
+        "--graceful-timeout", type=float,
+        default=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+    )
+    parser.add_argument(
+        "--forwarded-allow-ips", default=settings.SERVER_FORWARDED_ALLOW_IPS,
+        help="Comma-separated addresses trusted to set X-Forwarded-For, such as "
+        "the session router's"
+    )
+    parser.add_argument("--log-level", default=settings.LOG_LEVEL.lower())
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the chatbot-serve command."""
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    if not hasattr(os, "fork"):
+        logger.error("chatbot-serve needs os.fork; use uvicorn directly instead")
+        return 1
+
+    app = preload()
+    sock = bind_socket(args.host, args.port)
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1:
+        logger.warning(
+            f"Sessions are kept in the memory of the worker that created them; "
+            f"with {workers} workers, requests reaching another worker get 404. "
+            f"Use one worker per node behind chatbot-route for stateful clients"
+        )
+    logger.info(
+        f"Serving on {args.host}:{args.port} with {workers} workers "
+        f"({event_loop_choice()} loop, {http_protocol_choice()} parser)"
+    )
+
+    supervisor = WorkerSupervisor(
+        app,
+        sock,
+        workers,
+        memory_report_interval=args.memory_report_interval,
+        graceful_timeout=args.graceful_timeout,
+        log_level=args.log_level,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+    )
+    return supervisor.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
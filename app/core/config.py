@@ -1,7 +1,7 @@
 """Application configuration."""
 # Standard library imports
 import os
-from typing import List
+from typing import Dict, List, Optional
 
 # Third-party imports
 from pydantic_settings import BaseSettings
@@ -18,6 +18,14 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8080
+    # Sessions live in the memory of the worker that created them, so more than
+    # one worker only suits clients that keep no session; 0 = one per CPU
+    SERVER_WORKERS: int = 1
+    SERVER_MEMORY_REPORT_INTERVAL_SECONDS: float = 60.0
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: float = 30.0
+    # Addresses whose X-Forwarded-For is trusted, such as the session router's;
+    # unset = uvicorn's default ($FORWARDED_ALLOW_IPS or 127.0.0.1)
+    SERVER_FORWARDED_ALLOW_IPS: Optional[str] = None
     
     # API
     API_V1_PREFIX: str = "/api/v1"
@@ -28,10 +36,100 @@ class Settings(BaseSettings):
     # Chatbot
     DEFAULT_LANGUAGE: str = "en"
     CONFIDENCE_THRESHOLD: float = 0.3
+    CHATBOT_DATA_PATH: str = "app/infrastructure/data/datasets/data-bot.json"
+    CHATBOT_DATA_WATCH: bool = False
+    CHATBOT_DATA_WATCH_INTERVAL_SECONDS: float = 5.0
+    CHATBOT_DATA_COMPILE: bool = True
+    CHATBOT_DATA_COMPILED_PATH: Optional[str] = None
+    
+    # NLP engine: "tfidf" (sparse cosine), "lsa" (dense latent space) or
+    # "hashing" (sparse cosine over hashed features, without a vocabulary)
+    NLP_ENGINE: str = "tfidf"
+    LSA_RANK: int = 256
+    HASHING_N_FEATURES: int = 1 << 20
+    # Scoring matrix values of the sparse engines: float64, float32, uint16, uint8
+    NLP_MATRIX_DTYPE: str = "float64"
+    # Typo correction of messages scoring below the confidence threshold
+    SPELL_CORRECTION_ENABLED: bool = True
+    SPELL_CORRECTION_MAX_DISTANCE: int = 2
+    
+    # Bots served besides the default one, by name: {"name": "path/to/data.json"}.
+    # Selected by an {API_V1_PREFIX}/bots/{name} path prefix or the BOT_HEADER.
+    BOTS: Dict[str, str] = {}
+    BOT_HEADER: str = "X-Bot"
+    BOT_MEMORY_BUDGET_MB: float = 0.0  # models of all bots; 0 = no budget
+    BOT_IDLE_SECONDS: float = 900.0  # 0 = never evict idle bots
+    
+    # Admin routes ({API_V1_PREFIX}/admin): served only when enabled, and only
+    # to requests carrying ADMIN_TOKEN in the X-Admin-Token header
+    ADMIN_ENABLED: bool = False
+    ADMIN_TOKEN: str = ""
+    
+    # Cluster node behind the session router (app.cli.route): serve the routes
+    # that hand sessions over between nodes, only to requests carrying
+    # CLUSTER_SECRET in the X-Cluster-Secret header
+    CLUSTER_NODE_ENABLED: bool = False
+    CLUSTER_SECRET: str = ""
+    
+    # Startup
+    IMPORT_TIME_BUDGET_MS: float = 1000.0
+    
+    # Rate limiting (conversation routes)
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_CLIENT_PER_SECOND: float = 20.0
+    RATE_LIMIT_CLIENT_BURST: int = 40
+    RATE_LIMIT_SESSION_PER_SECOND: float = 2.0
+    RATE_LIMIT_SESSION_BURST: int = 10
+    RATE_LIMIT_MAX_TRACKED_KEYS: int = 100_000
+    RATE_LIMIT_LOG_INTERVAL_SECONDS: float = 60.0
+    
+    # Idempotency keys of message submissions
+    IDEMPOTENCY_TTL_SECONDS: float = 600.0
+    IDEMPOTENCY_MAX_KEYS: int = 100_000
+    
+    # Responses
+    FAST_JSON_RESPONSES: bool = False
     
     # Session Management
     SESSION_TTL_HOURS: int = 24
     MAX_SESSIONS: int = 1000
+    HISTORY_PAGE_SIZE: int = 50
+    HISTORY_PAGE_MAX: int = 500
+    HISTORY_STREAM_CHUNK: int = 200
+    SESSION_LIST_PAGE_SIZE: int = 100
+    SESSION_LIST_PAGE_MAX: int = 1000
+    SESSION_SCAN_BUDGET: int = 10_000  # sessions examined per listing page
+    
+    # Session persistence (journal plus snapshots of the in-memory store)
+    SESSION_JOURNAL_ENABLED: bool = False
+    SESSION_JOURNAL_DIR: str = "data/sessions"
+    SESSION_JOURNAL_FLUSH_INTERVAL_SECONDS: float = 1.0
+    SESSION_SNAPSHOT_INTERVAL_SECONDS: float = 300.0
+    SESSION_JOURNAL_FSYNC: bool = False
+    
+    # Query log (sampled events of answered messages, for intent analytics)
+    QUERY_LOG_ENABLED: bool = False
+    QUERY_LOG_SAMPLE_RATE: float = 0.1
+    QUERY_LOG_BUFFER_SIZE: int = 10_000
+    QUERY_LOG_DIR: str = "data/queries"  # empty = aggregates only, no files
+    QUERY_LOG_FLUSH_INTERVAL_SECONDS: float = 5.0
+    QUERY_LOG_ROTATE_MB: float = 64.0
+    QUERY_LOG_MAX_FILES: int = 48
+    
+    # Memory accounting (GET /admin/memory)
+    MEMORY_SAMPLE_SIZE: int = 256  # items sized per large container
+    MEMORY_TRACE_FRAMES: int = 1  # frames kept per traced allocation
+    
+    # Event loop monitoring
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = 0.25
+    LOOP_BLOCK_LOG_INTERVAL_SECONDS: float = 60.0
+    
+    # WebSocket conversations
+    WS_MAX_CONNECTIONS: int = 5000
+    WS_IDLE_TIMEOUT_SECONDS: float = 300.0
+    WS_MAX_MESSAGE_LENGTH: int = 1000
     
     # CORS
     ALLOWED_ORIGINS: List[str] = ["*"]
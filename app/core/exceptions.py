@@ -1,4 +1,6 @@
 """Custom exceptions for the application."""
+# Standard library imports
+from typing import List
 
 
 class ChatbotException(Exception):
@@ -11,6 +13,11 @@ class SessionNotFoundException(ChatbotException):
     pass
 
 
+class BotNotFoundException(ChatbotException):
+    """Raised when a request names a bot that is not configured."""
+    pass
+
+
 class InvalidLanguageException(ChatbotException):
     """Raised when unsupported language is requested."""
     pass
@@ -24,3 +31,20 @@ class DataLoadingException(ChatbotException):
 class MessageProcessingException(ChatbotException):
     """Raised when message processing fails."""
     pass
+
+
+class IdempotencyConflictException(ChatbotException):
+    """Raised when an idempotency key is reused for a different request."""
+    pass
+
+
+class DatasetValidationError(DataLoadingException):
+    """Raised when chatbot data does not match the expected schema."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        shown = "; ".join(errors[:20])
+        more = f" (and {len(errors) - 20} more)" if len(errors) > 20 else ""
+        super().__init__(
+            f"Invalid chatbot data, {len(errors)} problem(s): {shown}{more}"
+        )
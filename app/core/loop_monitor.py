@@ -0,0 +1,172 @@
+"""Event loop lag monitor and blocking call detector."""
+# Standard library imports
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the lag histogram bins; a last bin holds the rest
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+STACK_LIMIT = 25
+
+
+class LoopLagMonitor:
+    """Measure event loop scheduling lag and report callbacks that block the loop.
+
+    A probe task sleeps for ``interval`` seconds over and over; how late it wakes
+    up is the time callbacks kept the loop busy, recorded in a histogram. A
+    watchdog thread checks the probe's deadline every half ``block_threshold``:
+    once the loop is overdue by ``block_threshold``, it captures the stack the
+    loop thread is running at that moment, which is the blocking call itself,
+    and logs it at most once per ``log_interval`` seconds. Unlike the slow
+    callback warnings of asyncio debug mode, this costs nothing per callback and
+    names the blocking code rather than the callback that ran it.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.25,
+        log_interval: float = 60.0
+    ):
+        """Configure the monitor; nothing runs until ``start``."""
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.log_interval = log_interval
+
+        self._lock = threading.Lock()
+        self._buckets = [0] * (len(LAG_BUCKETS) + 1)
+        self._samples = 0
+        self._total_lag = 0.0
+        self._max_lag = 0.0
+        self._blocked = 0
+        self._last_block: Optional[Dict[str, Any]] = None
+        self._last_log = float("-inf")
+        self._suppressed = 0
+
+        self._deadline: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the probe and the watchdog are running."""
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start the probe on the running loop and the watchdog thread."""
+        if self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._deadline = time.monotonic() + self.interval
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._watch,
+            args=(self._stop,),
+            name="loop-watchdog",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Event loop monitor started (interval {self.interval}s, "
+            f"block threshold {self.block_threshold}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the probe and the watchdog."""
+        if self._task is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = self._thread = self._stop = None
+        self._deadline = None
+
+    async def _probe(self) -> None:
+        while True:
+            self._deadline = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.monotonic() - self._deadline))
+
+    def record(self, lag: float) -> None:
+        """Add one lag measurement, in seconds, to the histogram."""
+        with self._lock:
+            self._buckets[bisect_left(LAG_BUCKETS, lag)] += 1
+            self._samples += 1
+            self._total_lag += lag
+            self._max_lag = max(self._max_lag, lag)
+
+    def _watch(self, stop: threading.Event) -> None:
+        reported = None
+        while not stop.wait(self.block_threshold / 2):
+            deadline = self._deadline
+            if deadline is None or deadline == reported:
+                continue
+            overdue = time.monotonic() - deadline
+            if overdue >= self.block_threshold:
+                # One report per stall: the probe sets a new deadline once it runs
+                reported = deadline
+                self._report(overdue, self._loop_stack())
+
+    def _loop_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame, limit=STACK_LIMIT)
+
+    def _report(self, overdue: float, stack: List[str]) -> None:
+        with self._lock:
+            self._blocked += 1
+            self._last_block = {
+                "detected_at": datetime.now(),
+                "blocked_seconds": overdue,
+                "stack": stack,
+            }
+
+            now = time.monotonic()
+            if now - self._last_log < self.log_interval:
+                self._suppressed += 1
+                return
+            suppressed, self._suppressed = self._suppressed, 0
+            self._last_log = now
+
+        note = f" ({suppressed} more since the last report)" if suppressed else ""
+        logger.warning(
+            f"Event loop blocked for {overdue * 1000:.0f} ms{note}, "
+            f"running:\n{''.join(stack)}"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lag histogram, lag summary and the last detected blocking call."""
+        with self._lock:
+            bounds: List[Optional[float]] = list(LAG_BUCKETS) + [None]
+            return {
+                "running": self.running,
+                "samples": self._samples,
+                "mean_lag_seconds": self._total_lag / self._samples
+                if self._samples else 0.0,
+                "max_lag_seconds": self._max_lag,
+                "lag_histogram": [
+                    {"max_seconds": bound, "samples": count}
+                    for bound, count in zip(bounds, self._buckets)
+                ],
+                "blocked": self._blocked,
+                "last_block": self._last_block,
+            }
@@ -0,0 +1,188 @@
+"""Memory accounting - Process memory, sampled size estimates and tracemalloc diffs."""
+# Standard library imports
+import os
+import random
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from itertools import islice
+from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence
+
+
+# Items sized to estimate the size of a large container
+DEFAULT_SAMPLE = 256
+
+_SMAPS_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared",
+    "Shared_Dirty": "shared",
+    "Private_Clean": "private",
+    "Private_Dirty": "private",
+}
+
+# Allocations of the tracing machinery itself are left out of snapshots
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def read_memory(pid: int) -> Optional[Dict[str, int]]:
+    """Return rss, pss, shared and private memory of a process in bytes.
+
+    Uses ``/proc/<pid>/smaps_rollup``, falling back to ``/proc/<pid>/statm``
+    (without pss) on older kernels. Returns None where neither is available.
+    """
+    usage = {"rss": 0, "pss": 0, "shared": 0, "private": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                key = _SMAPS_FIELDS.get(name)
+                if key is not None:
+                    usage[key] += int(value.split()[0]) * 1024
+        return usage
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            _, resident, shared = (int(value) for value in f.read().split()[:3])
+    except (OSError, ValueError):
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    usage.update(
+        rss=resident * page_size,
+        shared=shared * page_size,
+        private=(resident - shared) * page_size,
+    )
+    return usage
+
+
+# ---- Size estimates ----
+
+def deep_sizeof(obj: Any, exclude: Collection[int] = ()) -> int:
+    """Bytes of an object and of the containers and strings it holds.
+
+    Objects reachable twice are counted once; objects whose id is in
+    ``exclude`` are not counted, nor is anything reached only through them.
+    NumPy arrays count their buffer only if they own it.
+    """
+    seen = set(exclude)
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+def sequence_bytes(items: Sequence[Any], sample: int = DEFAULT_SAMPLE) -> int:
+    """Bytes of a list and its items, extrapolated from a random sample of items."""
+    n_items = len(items)
+    if n_items <= sample:
+        return sys.getsizeof(items) + sum(deep_sizeof(item) for item in items)
+    picked = random.sample(range(n_items), sample)
+    sampled = sum(deep_sizeof(items[index]) for index in picked)
+    return sys.getsizeof(items) + sampled * n_items // sample
+
+
+def mapping_bytes(
+    mapping: Mapping[Any, Any], sample: int = DEFAULT_SAMPLE, deep: bool = True
+) -> int:
+    """Bytes of a dict and its keys and values, extrapolated from its first items.
+
+    With ``deep=False`` the objects that keys and values hold are not counted,
+    for values that share objects counted elsewhere. The dict must not change
+    size meanwhile.
+    """
+    n_items = len(mapping)
+    if not n_items:
+        return sys.getsizeof(mapping)
+    size = deep_sizeof if deep else sys.getsizeof
+    sampled = sum(
+        size(key) + size(value) for key, value in islice(mapping.items(), sample)
+    )
+    return sys.getsizeof(mapping) + sampled * n_items // min(sample, n_items)
+
+
+# ---- Allocation tracing ----
+
+class MemoryTracer:
+    """Compares tracemalloc snapshots of the process taken at different times.
+
+    The first snapshot starts tracing, which slows allocations down until
+    ``stop``; every later one reports the allocation sites whose memory grew or
+    shrank most since the previous snapshot. Tracing started elsewhere (for
+    example with ``PYTHONTRACEMALLOC``) is left running by ``stop``.
+    """
+
+    def __init__(self, frames: int = 1):
+        """Configure the number of frames recorded per allocation."""
+        self.frames = frames
+        self._lock = threading.Lock()
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._previous_at: Optional[datetime] = None
+        self._started_tracing = False
+
+    @property
+    def tracing(self) -> bool:
+        """Whether allocations are being traced."""
+        return tracemalloc.is_tracing()
+
+    def snapshot(self, top: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+        """Take a snapshot and compare it to the previous one, if any.
+
+        ``group_by`` is ``lineno``, ``filename`` or ``traceback``.
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._started_tracing = True
+            snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            taken_at = datetime.now()
+            traced, peak = tracemalloc.get_traced_memory()
+            previous, previous_at = self._previous, self._previous_at
+            self._previous, self._previous_at = snapshot, taken_at
+
+        differences: List[Dict[str, Any]] = []
+        if previous is not None:
+            differences = [
+                {
+                    "location": [
+                        f"{frame.filename}:{frame.lineno}" for frame in stat.traceback
+                    ],
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(previous, group_by)[:top]
+            ]
+        return {
+            "taken_at": taken_at,
+            "compared_to": previous_at,
+            "traced_bytes": traced,
+            "peak_traced_bytes": peak,
+            "differences": differences,
+        }
+
+    def stop(self) -> None:
+        """Drop the last snapshot and stop tracing if the first snapshot started it."""
+        with self._lock:
+            self._previous = self._previous_at = None
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
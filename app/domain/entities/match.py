@@ -0,0 +1,14 @@
+"""Match entity - Result of scoring a message against the training questions."""
+# Standard library imports
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """Best matching training question for a user message."""
+    question_index: int
+    confidence: float
+    is_fallback: bool
+    # Message with typos corrected, when correction was tried and changed it
+    corrected_message: Optional[str] = None
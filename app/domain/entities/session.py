@@ -1,10 +1,42 @@
 """Session entity - Define la estructura de datos."""
 # Standard library imports
+import hashlib
+import random
 from datetime import datetime
 from dataclasses import dataclass
+from uuid import uuid4
 
 # Typing imports (still standard library, but often grouped separately for clarity)
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+# Session ids start with one of this many shards, which a cluster router maps to
+# the node holding the session. Changing it re-shards every existing session.
+SESSION_SHARDS = 4096
+
+
+def new_session_id(shard: Optional[int] = None) -> str:
+    """A new session id in the given shard, or a random one: "0a3f.<uuid4>"."""
+    if shard is None:
+        shard = random.randrange(SESSION_SHARDS)
+    return f"{shard:04x}.{uuid4()}"
+
+
+def session_shard(session_id: str) -> int:
+    """The shard of a session id.
+
+    Ids without a shard prefix, such as the bare uuid4 ids issued before shards,
+    get a shard from a hash of the whole id.
+    """
+    prefix, dot, _ = session_id.partition(".")
+    if dot and len(prefix) == 4:
+        try:
+            shard = int(prefix, 16)
+        except ValueError:
+            shard = SESSION_SHARDS
+        if shard < SESSION_SHARDS:
+            return shard
+    digest = hashlib.blake2b(session_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % SESSION_SHARDS
 
 
 @dataclass
@@ -1,15 +1,20 @@
 """Session repository interface - Define QUÉ puede hacer."""
 # Standard library imports
 from abc import ABC, abstractmethod
-from typing import Optional, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 class SessionRepositoryInterface(ABC):
     """Interface that defines what a session repository must do."""
     
     @abstractmethod
-    def create_session(self, language: str = "en") -> str:
-        """Create a new session and return session ID."""
+    def create_session(self, language: str = "en", shard: Optional[int] = None) -> str:
+        """Create a new session, in a shard if given, and return session ID."""
+        pass
+    
+    @abstractmethod
+    def import_session(self, session: Dict) -> None:
+        """Store a session handed over by another node, replacing any same id."""
         pass
     
     @abstractmethod
@@ -22,12 +27,51 @@ class SessionRepositoryInterface(ABC):
         """Update session data."""
         pass
     
+    @abstractmethod
+    def append_turn(self, session_id: str, turn: Dict) -> bool:
+        """Append one exchange to a session's history."""
+        pass
+    
     @abstractmethod
     def delete_session(self, session_id: str) -> bool:
         """Delete session."""
         pass
     
     @abstractmethod
-    def get_all_sessions(self) -> Dict[str, Dict]:
-        """Get all sessions (for debugging)."""
+    def get_history(
+        self, session_id: str, start: int = 0, limit: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """Get up to ``limit`` turns of a session's history, from turn ``start``.
+
+        Returns None if the session does not exist. Reading the history does not
+        count as session activity.
+        """
+        pass
+    
+    @abstractmethod
+    def scan_sessions(self, cursor: int = 0) -> Iterator[Tuple[int, Dict]]:
+        """Iterate over sessions in a stable order, starting at a scan cursor.
+
+        Yields each session with the cursor that resumes the scan after it; 0
+        starts from the beginning. Sessions are read as the scan goes, without
+        copying the store, and scanning does not count as session activity.
+        """
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Get session and turn counts, languages, and age and idle histograms.
+
+        Backends maintain these as sessions change, so reading them does not
+        depend on the number of sessions.
+        """
+        pass
+    
+    @abstractmethod
+    def get_memory_usage(self, sample: int) -> Dict[str, int]:
+        """Get estimated bytes of the sessions and of their histories.
+
+        Backends estimate from ``sample`` sessions, so the cost does not depend
+        on the number of sessions.
+        """
         pass
@@ -0,0 +1,221 @@
+"""Bot registry - Hosts several named chatbots in one process."""
+# Standard library imports
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Local application imports
+from app.core.exceptions import BotNotFoundException
+from app.core.memory import DEFAULT_SAMPLE
+from app.domain.repositories.session import SessionRepositoryInterface
+from app.domain.services.chatbot import ChatbotService
+
+
+logger = logging.getLogger(__name__)
+
+# The bot of requests that name none: the chatbot of the configured dataset
+DEFAULT_BOT = "default"
+
+
+class BotMetrics:
+    """Counters of one bot, kept while its model is evicted and loaded again."""
+
+    def __init__(self):
+        self.requests = 0
+        self.loads = 0
+        self.evictions = 0
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes = 0
+        self.last_used: Optional[float] = None
+
+
+class BotRegistry:
+    """Loads named bots on first use and evicts them when idle or over budget.
+
+    Each bot has its own dataset, model and session store. A model is built by
+    the first request for its bot; the least recently used models are dropped
+    when together they take more than ``memory_budget`` bytes, and any model
+    unused for ``idle_seconds`` is dropped on the next request, so that the
+    following request for that bot loads it again. As with reloads, a request
+    keeps the service it resolved and an evicted model is freed once its last
+    request ends. Session stores are never evicted, so conversations outlive
+    their bot's model. A budget or idle time of 0 disables that eviction.
+
+    A model's memory is estimated once loaded with ``get_memory_usage``, sizing
+    large containers from ``memory_sample`` items. ``prepare`` is called once
+    before the first load, to import libraries outside of the load time.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        build: Callable[[str], ChatbotService],
+        build_sessions: Callable[[str], SessionRepositoryInterface],
+        memory_budget: int = 0,
+        idle_seconds: float = 0,
+        prepare: Optional[Callable[[], None]] = None,
+        memory_sample: int = DEFAULT_SAMPLE,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize with the bot names and factories of their models and stores."""
+        self.names = frozenset(names)
+        self.memory_budget = memory_budget
+        self.idle_seconds = idle_seconds
+        self.memory_sample = memory_sample
+        self._build = build
+        self._build_sessions = build_sessions
+        self._prepare = prepare
+        self._clock = clock
+
+        # Loaded models, least recently used first
+        self._loaded: "OrderedDict[str, ChatbotService]" = OrderedDict()
+        self._sessions: Dict[str, SessionRepositoryInterface] = {}
+        self._metrics = {name: BotMetrics() for name in self.names}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def get(self, name: str) -> ChatbotService:
+        """Get a bot's chatbot service, loading its model if needed.
+
+        Raises ``BotNotFoundException`` for a bot that is not configured.
+        """
+        metrics = self._metrics_of(name)
+        now = self._clock()
+        with self._lock:
+            metrics.requests += 1
+            metrics.last_used = now
+            service = self._loaded.get(name)
+            if service is not None:
+                self._loaded.move_to_end(name)
+            self._evict_idle(now)
+        if service is not None:
+            return service
+
+        # One load at a time: concurrent requests for a bot wait for its model,
+        # and the memory measured is the model's alone
+        with self._load_lock:
+            with self._lock:
+                service = self._loaded.get(name)
+            if service is None:
+                service = self._load(name, metrics)
+        return service
+
+    def sessions(self, name: str) -> SessionRepositoryInterface:
+        """Get a bot's session store, created on first use."""
+        self._metrics_of(name)
+        with self._lock:
+            repository = self._sessions.get(name)
+            if repository is None:
+                repository = self._sessions[name] = self._build_sessions(name)
+        return repository
+
+    def session_repositories(self) -> List[SessionRepositoryInterface]:
+        """The session stores created so far."""
+        with self._lock:
+            return list(self._sessions.values())
+
+    def evict(self, name: str) -> bool:
+        """Drop a bot's model; returns False if it was not loaded."""
+        with self._lock:
+            return self._evict(name)
+
+    def evict_idle(self) -> None:
+        """Drop the models unused for longer than the idle time."""
+        with self._lock:
+            self._evict_idle(self._clock())
+
+    def get_status(self) -> Dict[str, Any]:
+        """Return the memory used by loaded models and the metrics of each bot."""
+        now = self._clock()
+        with self._lock:
+            bots = [
+                {
+                    "name": name,
+                    "loaded": name in self._loaded,
+                    "requests": metrics.requests,
+                    "loads": metrics.loads,
+                    "evictions": metrics.evictions,
+                    "load_seconds": metrics.load_seconds,
+                    "memory_bytes": metrics.memory_bytes,
+                    "idle_seconds": (
+                        None if metrics.last_used is None else now - metrics.last_used
+                    ),
+                    "sessions": (
+                        self._sessions[name].get_stats()["total_sessions"]
+                        if name in self._sessions else 0
+                    ),
+                }
+                for name, metrics in sorted(self._metrics.items())
+            ]
+            loaded_bytes = self._loaded_bytes()
+        return {
+            "memory_budget_bytes": self.memory_budget,
+            "loaded_bytes": loaded_bytes,
+            "bots": bots,
+        }
+
+    def _metrics_of(self, name: str) -> BotMetrics:
+        metrics = self._metrics.get(name)
+        if metrics is None:
+            raise BotNotFoundException(f"Bot '{name}' is not configured")
+        return metrics
+
+    def _load(self, name: str, metrics: BotMetrics) -> ChatbotService:
+        """Build a bot's model and estimate the memory it takes."""
+        if self._prepare is not None:
+            self._prepare()
+            self._prepare = None
+
+        started = time.perf_counter()
+        service = self._build(name)
+        elapsed = time.perf_counter() - started
+        # Estimated rather than traced: tracemalloc is process-wide, so it would
+        # count other threads' allocations and clash with the memory snapshots
+        memory = sum(service.get_memory_usage(self.memory_sample).values())
+
+        with self._lock:
+            metrics.loads += 1
+            metrics.load_seconds = elapsed
+            metrics.memory_bytes = memory
+            self._loaded[name] = service
+            self._evict_over_budget()
+        logger.info(
+            f"Loaded bot '{name}' in {elapsed:.2f}s, "
+            f"{memory / (1024 * 1024):.1f} MiB"
+        )
+        return service
+
+    def _loaded_bytes(self) -> int:
+        return sum(self._metrics[name].memory_bytes for name in self._loaded)
+
+    def _evict_over_budget(self) -> None:
+        """Drop least recently used models until the rest fit the budget.
+
+        The most recently used model is always kept, even alone over budget.
+        """
+        if self.memory_budget <= 0:
+            return
+        total = self._loaded_bytes()
+        while total > self.memory_budget and len(self._loaded) > 1:
+            name = next(iter(self._loaded))
+            total -= self._metrics[name].memory_bytes
+            self._evict(name)
+            logger.info(f"Evicted bot '{name}' to stay within the memory budget")
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_seconds <= 0:
+            return
+        while self._loaded:
+            name = next(iter(self._loaded))
+            if now - self._metrics[name].last_used <= self.idle_seconds:
+                return
+            self._evict(name)
+            logger.info(f"Evicted bot '{name}', idle for over {self.idle_seconds}s")
+
+    def _evict(self, name: str) -> bool:
+        if self._loaded.pop(name, None) is None:
+            return False
+        self._metrics[name].evictions += 1
+        return True
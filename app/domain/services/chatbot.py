@@ -1,154 +1,362 @@
 """Chatbot service with business logic."""
 # Standard library imports
 import logging
-import random
-from typing import List, Tuple
-
-# Third-party imports
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+import time
+from dataclasses import replace
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 # Local application imports
-from app.infrastructure.data.loaders.chatbot_data import chatbot_data
+from app.core.config import settings
+from app.core.memory import DEFAULT_SAMPLE, sequence_bytes
+from app.domain.entities.match import MatchResult
+from app.infrastructure.analytics.query_log import QueryLog
+from app.infrastructure.data.intents import IntentTable
+from app.infrastructure.data.loaders.chatbot_data import (
+    default_model_path,
+    load_dataset,
+)
+from app.infrastructure.data.loaders.compiler import (
+    GREETING_INTENT,
+    CompiledDataset,
+    compile_dataset,
+)
+from app.infrastructure.nlp.engine import Matcher, build_matcher
+from app.infrastructure.nlp.keywords import KeywordRouter
+from app.infrastructure.nlp.spelling import SpellingCorrector
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_GREETING = "Hello! How can I assist you today?"
+DEFAULT_FALLBACK = "I'm sorry, I didn't understand that."
+
 
 class ChatbotService:
     """Handles chatbot logic and response generation using NLP."""
 
-    def __init__(self):
-        """Initialize the chatbot with TF-IDF vectorization and load training data."""
+    confidence_threshold = 0.2
+
+    def __init__(
+        self,
+        data: Optional[Dict[str, Any]] = None,
+        dataset: Optional[CompiledDataset] = None,
+        model_path: Optional[str] = None
+    ):
+        """Initialize the chatbot from a compiled dataset.
+
+        The dataset is compiled from ``data`` when given, otherwise loaded from
+        the configured dataset file, along with its cached model. A model saved
+        at ``model_path`` for the same questions is loaded instead of fitted.
+        """
         self.language = "en"
-        self.questions, self.answers = self._load_data()
+        if dataset is None and data is None:
+            dataset = load_dataset(language=self.language)
+            model_path = model_path or default_model_path()
+        elif dataset is None:
+            dataset = compile_dataset(data, self.language)
+
+        self._update_lock = threading.Lock()
+        self.matcher: Optional[Matcher] = None
+        self.questions: List[str] = dataset.questions
+        self.intents: IntentTable = dataset.intents
+        self.router = KeywordRouter(dataset.keyword_rules)
+        self.corrector: Optional[SpellingCorrector] = None
+        # Set when the service is hosted: sampled messages are recorded as this bot
+        self.query_log: Optional[QueryLog] = None
+        self.bot: Optional[str] = None
+        if settings.SPELL_CORRECTION_ENABLED:
+            self.corrector = SpellingCorrector(
+                chain(self.questions, *dataset.keyword_rules.values()),
+                settings.SPELL_CORRECTION_MAX_DISTANCE
+            )
 
         if not self.questions:
             logger.warning("No training data found. Using basic responses.")
             return
 
-        # Configure TF-IDF vectorizer
-        self.vectorizer = TfidfVectorizer(
-            min_df=1,
-            strip_accents='unicode',
-            lowercase=True,
-            ngram_range=(1, 2)
-        )
-        self.question_vectors = self.vectorizer.fit_transform(self.questions)
+        # Build the question index of the configured NLP engine
+        self.matcher = build_matcher(self.questions, model_path)
 
         logger.info(f"ChatbotService initialized with {len(self.questions)} QA pairs.")
 
-    def _load_data(self) -> Tuple[List[str], List[str]]:
-        """Extract questions and answers from chatbot_data."""
-        questions, answers = [], []
-
-        try:
-            for dialogue in chatbot_data.get("dialogues", []):
-                samples = dialogue.get("samples", {}).get(self.language, [])
-                replies = dialogue.get("replies", {}).get(self.language, [])
+    def process_message(self, user_message: str) -> str:
+        """Find the most relevant response using NLP similarity matching.
 
-                if not replies:
-                    logger.warning(f"No replies found for dialogue ID: {dialogue.get('id', 'unknown')}")
-                    continue
+        Messages sampled by the query log are timed and recorded with the
+        intent they were answered with.
+        """
+        query_log = self.query_log
+        if query_log is None or not query_log.sampled():
+            return self._respond(user_message)[0]
 
-                for sample in samples:
-                    if not isinstance(sample, str) or not sample.strip():
-                        continue
-                    questions.append(sample.lower().strip())
-                    answers.append(random.choice(replies))  # ← Random reply
+        started = time.perf_counter()
+        reply, intent, match = self._respond(user_message)
+        query_log.record(
+            self.bot, user_message, intent, match, time.perf_counter() - started
+        )
+        return reply
 
-            logger.info(f"Successfully loaded {len(questions)} questions and {len(answers)} answers.")
-            return questions, answers
+    def _respond(
+        self, user_message: str
+    ) -> Tuple[str, Optional[str], Optional[MatchResult]]:
+        """Reply to a message, with the intent and the question match behind it.
 
-        except Exception as e:
-            logger.error(f"Error loading chatbot data: {str(e)}")
-            return [], []
-
-    def process_message(self, user_message: str) -> str:
-        """Find the most relevant response using NLP similarity matching."""
+        The intent is None for fallback replies, the match None for messages
+        answered without scoring them against the questions.
+        """
         if not user_message or not user_message.strip():
-            return self._get_fallback_response()
+            return self._get_fallback_response(), None, None
 
-        # Check for common greetings first
-        greeting_response = self._check_for_greeting(user_message)
-        if greeting_response:
-            return greeting_response
+        # Short-circuit greetings and other keyword intents before any TF-IDF work
+        intent = self.router.route(user_message)
+        keyword_response = self._keyword_reply(intent)
+        if keyword_response:
+            return keyword_response, intent, None
 
         # If no training data, return fallback
-        if not self.questions:
-            return self._get_fallback_response()
+        if self.matcher is None:
+            return self._get_fallback_response(), None, None
 
+        match = None
         try:
-            user_message = user_message.lower().strip()
             logger.debug(f"Processing user message: '{user_message}'")
 
-            user_vector = self.vectorizer.transform([user_message])
-            similarities = cosine_similarity(user_vector, self.question_vectors).flatten()
+            match = self.match(user_message)
 
-            best_match_idx = similarities.argmax()
-            confidence = similarities[best_match_idx]
+            if match.corrected_message is not None:
+                # Keyword intents win over questions, as for the original message
+                intent = self.router.route(match.corrected_message)
+                keyword_response = self._keyword_reply(intent)
+                if keyword_response:
+                    return keyword_response, intent, match
 
-            logger.debug(f"Best match confidence: {confidence:.4f}")
-
-            if confidence < 0.2:  # ← Reduced threshold
-                logger.info(f"Low confidence ({confidence:.2f}) for message: '{user_message}'")
-                return self._get_fallback_response()
+            if match.is_fallback:
+                logger.debug(
+                    f"Low confidence ({match.confidence:.2f}) for message: "
+                    f"'{user_message}'"
+                )
+                return self._get_fallback_response(), None, match
 
-            matched_question = self.questions[best_match_idx]
-            logger.info(f"Matched '{user_message}' to '{matched_question}' with confidence {confidence:.2f}")
+            intent_id = self.intents.intent_of(match.question_index)
+            logger.debug(
+                f"Matched '{user_message}' to question {match.question_index} "
+                f"with confidence {match.confidence:.2f}"
+            )
 
-            return self.answers[best_match_idx]
+            reply = self.intents.choose_reply(intent_id, self.language)
+            if reply is None:
+                return self._get_fallback_response(), None, match
+            return reply, self.intents.intent_name(intent_id), match
 
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
-            return self._get_fallback_response()
-
-    def _check_for_greeting(self, user_message: str) -> str:
-        """Check if message is a greeting and respond appropriately."""
-        greetings = ["hello", "hi", "hey", "hola", "hei", "hallo"]
-        user_lower = user_message.lower().strip()
-        
-        if any(greeting in user_lower for greeting in greetings):
+            return self._get_fallback_response(), None, match
+
+    def match(self, user_message: str) -> MatchResult:
+        """Score a message against the training questions without building a reply.
+
+        A message scoring below the confidence threshold is scored again with
+        its typos corrected, if spelling correction is enabled.
+        """
+        if self.matcher is None:
+            return MatchResult(question_index=-1, confidence=0.0, is_fallback=True)
+
+        result = self._score(user_message)
+        if result.is_fallback and self.corrector is not None:
+            result = self._match_corrected(user_message, result)
+        return result
+
+    def _score(self, user_message: str) -> MatchResult:
+        # The matchers' analyzers lowercase and split the text themselves
+        similarities = self.matcher.score(user_message)
+
+        best_match_idx = int(similarities.argmax())
+        confidence = float(similarities[best_match_idx])
+        logger.debug(f"Best match confidence: {confidence:.4f}")
+
+        return MatchResult(
+            question_index=best_match_idx,
+            confidence=confidence,
+            is_fallback=confidence < self.confidence_threshold
+        )
+
+    def _match_corrected(self, user_message: str, result: MatchResult) -> MatchResult:
+        """Retry a low-confidence match with the message's typos corrected."""
+        started = time.perf_counter()
+        corrected = self.corrector.correct(user_message)
+        if corrected is None:
+            return result
+
+        retry = self._score(corrected)
+        logger.debug(
+            f"Corrected '{user_message}' to '{corrected}': confidence "
+            f"{result.confidence:.2f} -> {retry.confidence:.2f} in "
+            f"{(time.perf_counter() - started) * 1000:.2f} ms"
+        )
+        best = retry if retry.confidence > result.confidence else result
+        return replace(best, corrected_message=corrected)
+
+    def match_batch(self, user_messages: Sequence[str]) -> List[MatchResult]:
+        """Score many messages at once, vectorizing the whole batch in one call."""
+        if self.matcher is None:
+            return [
+                MatchResult(question_index=-1, confidence=0.0, is_fallback=True)
+                for _ in user_messages
+            ]
+
+        best_indices, best_scores = self.matcher.best_matches(user_messages)
+        results = [
+            MatchResult(
+                question_index=int(idx),
+                confidence=float(score),
+                is_fallback=bool(score < self.confidence_threshold)
+            )
+            for idx, score in zip(best_indices, best_scores)
+        ]
+        if self.corrector is not None:
+            self._correct_batch(user_messages, results)
+        return results
+
+    def classify_batch(
+        self, user_messages: Sequence[str]
+    ) -> List[Tuple[Optional[str], Optional[MatchResult]]]:
+        """The intent and question match each message would be answered with.
+
+        Routes like ``_respond``: keyword intents first, then the questions,
+        scored in one batch, with keyword intents of corrected messages winning.
+        The intent is None for fallbacks, the match None for messages answered
+        without scoring them.
+        """
+        results: List[Tuple[Optional[str], Optional[MatchResult]]] = [
+            (None, None)
+        ] * len(user_messages)
+        scored = []
+        for position, message in enumerate(user_messages):
+            if not message or not message.strip():
+                continue
+            intent = self.router.route(message)
+            if self._keyword_reply(intent):
+                results[position] = (intent, None)
+            else:
+                scored.append(position)
+
+        if self.matcher is None or not scored:
+            return results
+
+        matches = self.match_batch([user_messages[position] for position in scored])
+        for position, match in zip(scored, matches):
+            results[position] = (self._intent_of(match), match)
+        return results
+
+    def _intent_of(self, match: MatchResult) -> Optional[str]:
+        """The intent a scored message is answered with, None for a fallback."""
+        if match.corrected_message is not None:
+            intent = self.router.route(match.corrected_message)
+            if self._keyword_reply(intent):
+                return intent
+        if match.is_fallback:
+            return None
+        intent_id = self.intents.intent_of(match.question_index)
+        if not self.intents.replies(intent_id, self.language):
+            return None
+        return self.intents.intent_name(intent_id)
+
+    def _correct_batch(
+        self, user_messages: Sequence[str], results: List[MatchResult]
+    ) -> None:
+        """Retry the low-confidence matches of a batch with typos corrected."""
+        retries = {}
+        for position, result in enumerate(results):
+            if result.is_fallback:
+                corrected = self.corrector.correct(user_messages[position])
+                if corrected is not None:
+                    retries[position] = corrected
+        if not retries:
+            return
+
+        best_indices, best_scores = self.matcher.best_matches(list(retries.values()))
+        for position, corrected, idx, score in zip(
+            retries, retries.values(), best_indices, best_scores
+        ):
+            result = results[position]
+            if score > result.confidence:
+                result = MatchResult(
+                    question_index=int(idx),
+                    confidence=float(score),
+                    is_fallback=bool(score < self.confidence_threshold)
+                )
+            results[position] = replace(result, corrected_message=corrected)
+
+    def add_samples(self, samples: Sequence[str], replies: Sequence[str]) -> int:
+        """Add the samples of a dialogue without refitting the whole model.
+
+        Returns the number of questions added.
+        """
+        questions = [
+            sample.lower().strip()
+            for sample in samples
+            if isinstance(sample, str) and sample.strip()
+        ]
+        if not questions or not replies:
+            return 0
+
+        with self._update_lock:
+            # Intents first, so any index the matcher can return has replies
+            intent_id = self.intents.add_intent(
+                f"added-{len(self.intents)}", {self.language: replies}
+            )
+            self.intents.add_questions(intent_id, len(questions))
+            self.questions.extend(questions)
+            if self.corrector is not None:
+                self.corrector.add_words(questions)
+
+            if self.matcher is None:
+                self.matcher = build_matcher(self.questions)
+            else:
+                self.matcher.add_documents(questions)
+
+        logger.info(f"Added {len(questions)} QA pairs ({len(self.questions)} total).")
+        return len(questions)
+
+    def get_memory_usage(self, sample: int = DEFAULT_SAMPLE) -> Dict[str, int]:
+        """Estimated bytes of the questions, replies, index and typo index.
+
+        Containers too large to size whole are sized from ``sample`` items.
+        """
+        with self._update_lock:
+            usage = {"questions": sequence_bytes(self.questions, sample)}
+            usage.update(self.intents.memory_usage(sample))
+            if self.matcher is not None:
+                usage.update(self.matcher.memory_usage(sample))
+            if self.corrector is not None:
+                usage.update(self.corrector.memory_usage(sample))
+        return usage
+
+    def _keyword_reply(self, intent: Optional[str]) -> Optional[str]:
+        """Reply of the keyword intent a message was routed to, if any."""
+        if intent is None:
+            return None
+
+        if intent == GREETING_INTENT:
             return self.get_greeting(self.language)
-        
-        return None
+
+        intent_id = self.intents.intent_id(intent)
+        if intent_id is None:
+            return None
+        return self.intents.choose_reply(intent_id, self.language)
 
     def get_greeting(self, language: str) -> str:
         """Return a greeting message based on the selected language."""
-        try:
-            greetings_list = chatbot_data.get("greetings", [])
-            
-            if greetings_list and len(greetings_list) > 0:
-                greeting_obj = greetings_list[0]
-                language_greetings = greeting_obj.get("replies", {}).get(
-                    language, ["Hello! How can I assist you today?"]
-                )
-                
-                if isinstance(language_greetings, list) and language_greetings:
-                    return random.choice(language_greetings)
-            
-            return "Hello! How can I assist you today?"
-            
-        except Exception as e:
-            logger.error(f"Error getting greeting: {str(e)}")
-            return "Hello! How can I assist you today?"
+        return (
+            self.intents.choose_reply(IntentTable.GREETING, language)
+            or DEFAULT_GREETING
+        )
 
     def _get_fallback_response(self) -> str:
         """Return a fallback response when the chatbot doesn't understand."""
-        try:
-            fallbacks_list = chatbot_data.get("fallbacks", [])
-            
-            if fallbacks_list and len(fallbacks_list) > 0:
-                fallback_obj = fallbacks_list[0]
-                language_fallbacks = fallback_obj.get("replies", {}).get(
-                    self.language, ["I'm sorry, I didn't understand that."]
-                )
-                
-                if isinstance(language_fallbacks, list) and language_fallbacks:
-                    return random.choice(language_fallbacks)
-            
-            return "I'm sorry, I didn't understand that."
-            
-        except Exception as e:
-            logger.error(f"Error getting fallback: {str(e)}")
-            return "I'm sorry, I didn't understand that."
+        return (
+            self.intents.choose_reply(IntentTable.FALLBACK, self.language)
+            or DEFAULT_FALLBACK
+        )
@@ -0,0 +1,161 @@
+"""Chatbot model reloader - Rebuilds the model off the request path."""
+# Standard library imports
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Local application imports
+from app.domain.services.chatbot import ChatbotService
+
+
+logger = logging.getLogger(__name__)
+
+
+class ChatbotReloader:
+    """Rebuilds the chatbot model in the background and publishes it atomically.
+
+    The new model is built completely before ``publish`` swaps it in, so readers
+    never need a lock: a request keeps the service reference it resolved and
+    finishes on the old model, which is freed once the last such request ends.
+    The reloader itself never holds on to a published model.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], ChatbotService],
+        publish: Callable[[ChatbotService], None]
+    ):
+        """Initialize with a model factory and a callback that installs the model."""
+        self._build = build
+        self._publish = publish
+        self._reload_lock = threading.Lock()
+        self._watch_stop: Optional[threading.Event] = None
+        self._watch_thread: Optional[threading.Thread] = None
+
+        self.version = 0
+        self.status = "idle"
+        self.last_reload_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    def reload(self) -> bool:
+        """Rebuild and publish the model synchronously.
+
+        Returns False without doing anything if another reload is in progress.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            logger.info("Chatbot reload already in progress, skipping")
+            return False
+        return self._reload_locked()
+
+    def _reload_locked(self) -> bool:
+        """Rebuild and publish the model; the caller holds ``_reload_lock``."""
+        try:
+            self.status = "reloading"
+            logger.info("Rebuilding chatbot model")
+            service = self._build()
+            self._publish(service)
+            del service
+
+            self.version += 1
+            self.last_reload_at = datetime.now()
+            self.last_error = None
+            self.status = "idle"
+            logger.info(f"Chatbot model reloaded (version {self.version})")
+            return True
+
+        except Exception as e:
+            self.last_error = str(e)
+            self.status = "failed"
+            logger.error(f"Chatbot reload failed, keeping current model: {e}")
+            return False
+
+        finally:
+            self._reload_lock.release()
+
+    def reload_in_background(self) -> bool:
+        """Start a reload on a background thread.
+
+        Returns False if a reload is already running.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        # The thread takes over the lock, so no other reload can start between
+        # this call returning and the thread running
+        self.status = "reloading"
+        threading.Thread(
+            target=self._reload_locked, name="chatbot-reload", daemon=True
+        ).start()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        """Return the current reload state."""
+        return {
+            "status": self.status,
+            "version": self.version,
+            "last_reload_at": self.last_reload_at,
+            "last_error": self.last_error,
+            "watching": self._watch_thread is not None,
+        }
+
+    def start_watching(self, path: str, interval_seconds: float = 5.0) -> None:
+        """Poll the dataset file and reload whenever it changes."""
+        if self._watch_thread is not None:
+            return
+
+        self._watch_stop = threading.Event()
+        self._watch_thread = threading.Thread(
+            target=self._watch,
+            args=(path, interval_seconds, _file_signature(path), self._watch_stop),
+            name="chatbot-data-watch",
+            daemon=True
+        )
+        self._watch_thread.start()
+        logger.info(f"Watching {path} for dataset changes every {interval_seconds}s")
+
+    def stop_watching(self) -> None:
+        """Stop the file watcher, if running."""
+        if self._watch_thread is None:
+            return
+
+        self._watch_stop.set()
+        self._watch_thread.join()
+        self._watch_thread = None
+        self._watch_stop = None
+
+    def _watch(
+        self,
+        path: str,
+        interval_seconds: float,
+        last_seen: Optional[Tuple[float, int]],
+        stop: threading.Event
+    ) -> None:
+        pending = None
+
+        while not stop.wait(interval_seconds):
+            current = _file_signature(path)
+            if current is None or current == last_seen:
+                pending = None
+                continue
+
+            # Wait for the file to stay unchanged for one interval before reloading,
+            # so a dataset that is still being written is not picked up half-way.
+            if current != pending:
+                pending = current
+                continue
+
+            last_seen = current
+            pending = None
+            logger.info(f"Dataset {path} changed, reloading chatbot model")
+            self.reload()
+
+
+def _file_signature(path: str) -> Optional[Tuple[float, int]]:
+    """Return (mtime, size) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
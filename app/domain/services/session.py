@@ -1,7 +1,8 @@
 """Session service - SOLO business logic."""
 import logging
-from typing import Optional, Dict
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from app.domain.entities.session import session_shard
 from app.domain.repositories.session import SessionRepositoryInterface
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,7 @@ class SessionService:
         """Initialize with session repository dependency."""
         self._session_repo = session_repository
 
-    def create_session(self, language: str = "en") -> str:
+    def create_session(self, language: str = "en", shard: Optional[int] = None) -> str:
         """Create a new session with business validation."""
         # Business rule: validate language
         if language not in ["en", "nb"]:
@@ -22,7 +23,7 @@ class SessionService:
             language = "en"
         
         # Delegate to repository
-        session_id = self._session_repo.create_session(language)
+        session_id = self._session_repo.create_session(language, shard)
         logger.info(f"Session created: {session_id} with language {language}")
         return session_id
 
@@ -60,7 +61,138 @@ class SessionService:
             "bot_response": bot_response
         }
         
-        history = session.get("conversation_history", [])
-        history.append(message_entry)
-        
-        return self.update_session(session_id, {"conversation_history": history})
+        # Appended in place, so that stores record one turn instead of the history
+        return self._session_repo.append_turn(session_id, message_entry)
+
+    def get_history_page(
+        self, session_id: str, cursor: int = 0, limit: int = 50
+    ) -> Optional[Tuple[List[Dict], Optional[int]]]:
+        """Get one page of turns and the cursor of the next page, if any.
+
+        The cursor is the index of the first turn of a page; since turns are only
+        ever appended, it stays valid while the conversation goes on.
+        """
+        # One extra turn tells whether another page follows
+        turns = self._session_repo.get_history(session_id, cursor, limit + 1)
+        if turns is None:
+            return None
+        if len(turns) > limit:
+            return turns[:limit], cursor + limit
+        return turns, None
+
+    def iter_history(
+        self,
+        session_id: str,
+        cursor: int = 0,
+        limit: Optional[int] = None,
+        chunk_size: int = 200
+    ) -> Optional[Iterator[List[Dict]]]:
+        """Iterate over a session's turns in chunks, reading one chunk at a time.
+
+        Returns None if the session does not exist, which is checked before the
+        iterator is handed out.
+        """
+        first_size = chunk_size if limit is None else min(chunk_size, limit)
+        first = self._session_repo.get_history(session_id, cursor, first_size)
+        if first is None:
+            return None
+        return self._history_chunks(session_id, first, cursor, limit, chunk_size)
+
+    def _history_chunks(
+        self,
+        session_id: str,
+        chunk: List[Dict],
+        cursor: int,
+        limit: Optional[int],
+        chunk_size: int
+    ) -> Iterator[List[Dict]]:
+        remaining = limit
+        while chunk:
+            yield chunk
+            cursor += len(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+                if remaining <= 0:
+                    return
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = self._session_repo.get_history(session_id, cursor, size) or []
+
+    def list_sessions(
+        self,
+        cursor: int = 0,
+        limit: int = 100,
+        language: Optional[str] = None,
+        min_idle_seconds: Optional[float] = None,
+        max_idle_seconds: Optional[float] = None,
+        scan_budget: int = 10_000
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """Get summaries of the sessions matching the filters, a page at a time.
+
+        At most ``scan_budget`` sessions are examined per page, so a selective
+        filter returns short or empty pages rather than scanning the whole
+        store; the next cursor is None once the scan has reached the end.
+        """
+        from datetime import datetime, timedelta
+
+        now = datetime.now()
+        idle_after = None if min_idle_seconds is None else (
+            now - timedelta(seconds=min_idle_seconds)
+        )
+        idle_before = None if max_idle_seconds is None else (
+            now - timedelta(seconds=max_idle_seconds)
+        )
+
+        page: List[Dict] = []
+        examined = 0
+        for next_cursor, session in self._session_repo.scan_sessions(cursor):
+            examined += 1
+            last_activity = session["last_activity"]
+            if (
+                (language is None or session.get("language") == language)
+                and (idle_after is None or last_activity <= idle_after)
+                and (idle_before is None or last_activity >= idle_before)
+            ):
+                page.append({
+                    "id": session["id"],
+                    "language": session.get("language"),
+                    "created_at": session["created_at"],
+                    "last_activity": last_activity,
+                    "turns": len(session.get("conversation_history", ())),
+                })
+            if len(page) >= limit or examined >= scan_budget:
+                return page, next_cursor
+        return page, None
+
+    def get_stats(self) -> Dict:
+        """Get aggregate session statistics."""
+        return self._session_repo.get_stats()
+
+    def get_memory_usage(self, sample: int) -> Dict[str, int]:
+        """Get estimated bytes of the sessions and their histories."""
+        return self._session_repo.get_memory_usage(sample)
+
+    def export_sessions(self, shards: Collection[int]) -> List[Dict]:
+        """Get the sessions of some shards, to hand them over to another node."""
+        shards = set(shards)
+        return [
+            session
+            for _, session in self._session_repo.scan_sessions()
+            if session_shard(session["id"]) in shards
+        ]
+
+    def import_sessions(self, sessions: Iterable[Dict]) -> int:
+        """Store sessions handed over by another node; returns how many."""
+        imported = 0
+        for session in sessions:
+            self._session_repo.import_session(session)
+            imported += 1
+        logger.info(f"Imported {imported} sessions")
+        return imported
+
+    def delete_sessions(self, shards: Collection[int]) -> int:
+        """Delete the sessions of some shards, once another node holds them."""
+        deleted = 0
+        for session in self.export_sessions(shards):
+            deleted += self._session_repo.delete_session(session["id"])
+        logger.info(f"Deleted {deleted} sessions of {len(shards)} shards")
+        return deleted
@@ -0,0 +1,311 @@
+"""Query log - Samples answered messages for intent analytics."""
+# Standard library imports
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Local application imports
+from app.domain.entities.match import MatchResult
+
+
+logger = logging.getLogger(__name__)
+
+FILE_PREFIX = "queries-"
+FILE_SUFFIX = ".ndjson.gz"
+# Minutes of per-minute query and fallback counts kept for the stats
+MINUTES_KEPT = 60
+
+# (time, bot, message, intent, match, latency in seconds)
+Event = Tuple[float, str, str, Optional[str], Optional[MatchResult], float]
+
+
+def message_hash(message: str) -> str:
+    """Digest of a normalized message: repeated queries share it, text is not kept."""
+    return hashlib.blake2b(
+        message.strip().lower().encode("utf-8"), digest_size=8
+    ).hexdigest()
+
+
+class QueryStats:
+    """Aggregates of the sampled queries of one bot, updated event by event."""
+
+    def __init__(self):
+        self.queries = 0
+        self.fallbacks = 0
+        self.corrected = 0
+        self.latency_seconds = 0.0
+        self.intents: Counter = Counter()
+        # [minute start, queries, fallbacks], oldest first
+        self.minutes: Deque[List[int]] = deque(maxlen=MINUTES_KEPT)
+
+    def add(self, event: Event) -> None:
+        recorded_at, _, _, intent, match, latency = event
+        fallback = intent is None
+        self.queries += 1
+        self.fallbacks += fallback
+        self.latency_seconds += latency
+        if match is not None and match.corrected_message is not None:
+            self.corrected += 1
+        if not fallback:
+            self.intents[intent] += 1
+
+        minute = int(recorded_at // 60) * 60
+        if not self.minutes or self.minutes[-1][0] < minute:
+            self.minutes.append([minute, 0, 0])
+        self.minutes[-1][1] += 1
+        self.minutes[-1][2] += fallback
+
+
+class QueryLog:
+    """Sampled query events, aggregated and written to compressed NDJSON files.
+
+    Callers check ``sampled()`` before timing a message, so unsampled messages
+    cost one random draw. ``record`` appends the event to a ring buffer of
+    ``buffer_size`` events and returns; when the buffer is full the oldest event
+    is dropped. A background thread drains the buffer every ``flush_interval``
+    seconds into per-bot aggregates and appends the batch to a gzip NDJSON file
+    in ``directory`` (none if empty), rotated past ``rotate_bytes`` of JSON; only
+    the newest ``max_files`` of this process are kept, so workers sharing the
+    directory never delete each other's files. Files record a hash of each
+    message, not its text. Events of a failed write are kept for the next one,
+    up to ``buffer_size``. The file being written is only complete once rotated
+    or closed.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        buffer_size: int = 10_000,
+        directory: str = "",
+        flush_interval: float = 5.0,
+        rotate_bytes: int = 64 * 1024 * 1024,
+        max_files: int = 48,
+        clock=time.time
+    ):
+        """Configure the log; files are opened by the first ``flush``."""
+        self.sample_rate = sample_rate
+        self.buffer_size = buffer_size
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.max_files = max_files
+        self._clock = clock
+
+        self._buffer: Deque[Event] = deque(maxlen=buffer_size)
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self._stats: Dict[str, QueryStats] = {}
+        self._unwritten: List[Event] = []
+        self._lock = threading.Lock()
+
+        self._file_lock = threading.Lock()
+        self._file = None
+        self._file_bytes = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+
+    def sampled(self) -> bool:
+        """Whether the next message should be recorded."""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(
+        self,
+        bot: str,
+        message: str,
+        intent: Optional[str],
+        match: Optional[MatchResult],
+        latency: float
+    ) -> None:
+        """Buffer the event of an answered message; ``intent`` is None on fallback."""
+        if len(self._buffer) == self.buffer_size:
+            self.dropped += 1
+        self._buffer.append((self._clock(), bot, message, intent, match, latency))
+        self.recorded += 1
+
+    # ---- Aggregates ----
+
+    def _drain(self) -> List[Event]:
+        """Move the buffered events into the aggregates; must hold ``_lock``."""
+        events = []
+        while True:
+            try:
+                events.append(self._buffer.popleft())
+            except IndexError:
+                break
+        for event in events:
+            stats = self._stats.get(event[1])
+            if stats is None:
+                stats = self._stats[event[1]] = QueryStats()
+            stats.add(event)
+        return events
+
+    def _hold(self, events: List[Event], first: bool = False) -> None:
+        """Keep drained events for the next write, at most ``buffer_size``.
+
+        With ``first`` the events go before those already held, as they are
+        older; the oldest events are dropped past the bound.
+        """
+        if not self.directory:
+            return
+        if first:
+            self._unwritten[:0] = events
+        else:
+            self._unwritten.extend(events)
+        overflow = len(self._unwritten) - self.buffer_size
+        if overflow > 0:
+            del self._unwritten[:overflow]
+            self.dropped += overflow
+
+    def get_stats(self, bot: str, top: int = 10) -> Dict[str, Any]:
+        """Return a bot's query aggregates, including events not yet written."""
+        with self._lock:
+            self._hold(self._drain())
+            stats = self._stats.get(bot) or QueryStats()
+            queries = stats.queries
+            top_intents = [
+                {
+                    "intent": intent,
+                    "count": count,
+                    "share": count / queries,
+                }
+                for intent, count in stats.intents.most_common(top)
+            ]
+            minutes = [
+                {
+                    "minute": datetime.fromtimestamp(minute, timezone.utc),
+                    "queries": minute_queries,
+                    "fallbacks": fallbacks,
+                }
+                for minute, minute_queries, fallbacks in stats.minutes
+            ]
+            return {
+                "bot": bot,
+                "sample_rate": self.sample_rate,
+                "recorded": self.recorded,
+                "dropped": self.dropped,
+                "written": self.written,
+                "queries": queries,
+                "fallbacks": stats.fallbacks,
+                "fallback_rate": stats.fallbacks / queries if queries else 0.0,
+                "corrected": stats.corrected,
+                "mean_latency_ms": (
+                    stats.latency_seconds / queries * 1000 if queries else 0.0
+                ),
+                "top_intents": top_intents,
+                "minutes": minutes,
+            }
+
+    # ---- Files ----
+
+    def flush(self) -> int:
+        """Aggregate the buffered events and write them; returns how many.
+
+        If writing fails, the events are held for the next flush and the error
+        is raised.
+        """
+        with self._lock:
+            self._hold(self._drain())
+            events, self._unwritten = self._unwritten, []
+        if not events or not self.directory:
+            return 0
+
+        data = "".join(
+            json.dumps(_encode(event), separators=(",", ":")) + "\n"
+            for event in events
+        ).encode("utf-8")
+        try:
+            with self._file_lock:
+                if self._file is None or self._file_bytes >= self.rotate_bytes:
+                    self._rotate()
+                self._file.write(data)
+                self._file.flush()
+                self._file_bytes += len(data)
+                self.written += len(events)
+        except Exception:
+            with self._lock:
+                self._hold(events, first=True)
+            raise
+        return len(events)
+
+    def _rotate(self) -> None:
+        """Close the current file, open a new one and delete this process's oldest.
+
+        File names start with the process id, so that the workers of one server
+        writing to the same directory only prune their own files.
+        """
+        if self._file is not None:
+            file, self._file = self._file, None
+            file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = f"{FILE_PREFIX}{os.getpid()}-"
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(self.directory, f"{prefix}{stamp}{FILE_SUFFIX}")
+        self._file = gzip.open(path, "wb", compresslevel=6)
+        self._file_bytes = 0
+
+        files = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(prefix) and name.endswith(FILE_SUFFIX)
+        )
+        for name in files[:max(0, len(files) - self.max_files)]:
+            os.remove(os.path.join(self.directory, name))
+
+    # ---- Background thread ----
+
+    def start(self) -> None:
+        """Aggregate and write the buffered events periodically in a thread."""
+        if self._thread is not None:
+            return
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._stop,),
+            name="query-log",
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing the query log failed")
+
+    def close(self) -> None:
+        """Stop the thread, write the buffered events and close the file."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _encode(event: Event) -> Dict[str, Any]:
+    recorded_at, bot, message, intent, match, latency = event
+    return {
+        "ts": round(recorded_at, 3),
+        "bot": bot,
+        "message_hash": message_hash(message),
+        "intent": intent,
+        "fallback": intent is None,
+        "question_index": None if match is None else match.question_index,
+        "confidence": None if match is None else round(match.confidence, 4),
+        "corrected": match is not None and match.corrected_message is not None,
+        "latency_ms": round(latency * 1000, 3),
+    }
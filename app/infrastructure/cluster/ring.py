@@ -0,0 +1,60 @@
+"""Consistent hash ring with virtual nodes."""
+# Standard library imports
+import hashlib
+from bisect import bisect
+from typing import Iterable, List, Tuple
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+class HashRing:
+    """Maps keys to nodes so that a change of nodes moves few keys.
+
+    Every node is placed at ``vnodes`` pseudo-random points of a 64-bit ring and
+    a key belongs to the node of the first point at or after the key's hash.
+    Adding a node only moves keys to it, about ``1 / len(nodes)`` of them, and
+    removing one only moves its own keys; the many points per node even out the
+    share of each.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 64):
+        """Initialize with the nodes and the number of points of each."""
+        self.vnodes = vnodes
+        self._points: List[Tuple[int, str]] = []
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self._points) // self.vnodes
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.nodes
+
+    @property
+    def nodes(self) -> List[str]:
+        """The nodes on the ring, sorted."""
+        return sorted({node for _, node in self._points})
+
+    def add(self, node: str) -> None:
+        """Place a node on the ring."""
+        if node in self:
+            raise ValueError(f"Node '{node}' is already on the ring")
+        self._points.extend((_hash(f"{node}#{i}"), node) for i in range(self.vnodes))
+        self._points.sort()
+
+    def remove(self, node: str) -> None:
+        """Take a node off the ring."""
+        if node not in self:
+            raise ValueError(f"Node '{node}' is not on the ring")
+        self._points = [point for point in self._points if point[1] != node]
+
+    def owner(self, key: str) -> str:
+        """The node a key belongs to."""
+        if not self._points:
+            raise LookupError("The ring has no nodes")
+        position = bisect(self._points, (_hash(key),))
+        return self._points[position % len(self._points)][1]
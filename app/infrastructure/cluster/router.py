@@ -0,0 +1,395 @@
+"""Session router - Forwards requests to the node that holds their session.
+
+Nodes keep sessions in memory. Every session id starts with its shard (see
+``new_session_id``) and the router maps shards to nodes with a consistent hash
+ring, so a session's requests always reach the node that created it. New
+conversations get a random shard, sent to its node in the ``X-Session-Shard``
+header. When a node joins or leaves, the sessions of the shards that change
+hands are copied to their new node, through the nodes' ``/internal/sessions``
+routes (``CLUSTER_NODE_ENABLED``), before the old node deletes them. Those
+calls carry the nodes' ``CLUSTER_SECRET`` in the ``X-Cluster-Secret`` header,
+and the router requires the same header on its own membership routes, so that
+only holders of the secret can point it (and the secret) at a new node.
+
+Forwarded requests carry the caller's address appended to ``X-Forwarded-For``.
+Nodes only use it (for rate limits and logs) from addresses they trust, so they
+must list the router in uvicorn's ``forwarded_allow_ips``
+(``SERVER_FORWARDED_ALLOW_IPS``); otherwise every caller shares the router's
+address.
+
+Nodes are base URLs, or ASGI apps for nodes in the same process. Forwarding
+needs httpx.
+"""
+# Standard library imports
+import asyncio
+import hmac
+import json
+import logging
+import random
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, Sequence, Tuple, Union
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depends on the environment
+    httpx = None
+
+# Local application imports
+from app.domain.entities.session import SESSION_SHARDS, session_shard
+from app.infrastructure.cluster.ring import HashRing
+
+
+logger = logging.getLogger(__name__)
+
+SHARD_HEADER = "x-session-shard"
+FORWARDED_FOR_HEADER = b"x-forwarded-for"
+SECRET_HEADER = "X-Cluster-Secret"
+# Headers that belong to one connection and are not forwarded
+HOP_BY_HOP = frozenset({
+    b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization",
+    b"te", b"trailer", b"transfer-encoding", b"upgrade", b"host",
+})
+
+Node = Union[str, Any]
+
+
+class SessionRouter:
+    """ASGI app routing conversation requests to the node of their session.
+
+    Requests outside the conversation routes go to a random node. Membership is
+    changed with ``add_node`` and ``remove_node``, or over HTTP with
+    ``PUT /cluster/nodes/{name}`` (``{"url": ...}``) and
+    ``DELETE /cluster/nodes/{name}``; ``GET /cluster/nodes`` lists the nodes and
+    their shares of the shards. Requests are held while sessions move, so none
+    reaches a node in the middle of a hand-over. Sessions of a node that leaves
+    without a hand-over are lost with it. WebSockets are not forwarded.
+    Membership requests without ``secret`` in ``X-Cluster-Secret`` get 403.
+
+    ``bots`` names the bots whose sessions are moved besides the default one,
+    and ``secret`` is the nodes' ``CLUSTER_SECRET``.
+    """
+
+    def __init__(
+        self,
+        nodes: Mapping[str, Node],
+        prefix: str = "/api/v1",
+        vnodes: int = 64,
+        bots: Sequence[str] = (),
+        secret: str = "",
+        timeout: float = 30.0
+    ):
+        """Initialize with the nodes by name and the API prefix they serve."""
+        if httpx is None:
+            raise RuntimeError("The session router needs httpx: pip install httpx")
+        self.prefix = prefix
+        self.bots = list(bots)
+        self.secret = secret
+        self.timeout = timeout
+        self.ring = HashRing(vnodes=vnodes)
+        self._clients: Dict[str, "httpx.AsyncClient"] = {}
+        for name, target in nodes.items():
+            self.ring.add(name)
+            self._clients[name] = self._client(target)
+        self._owners = self._assign()
+
+        self._conversation_path = re.compile(
+            re.escape(prefix) + r"(?:/bots/[^/]+)?/conversations/([^/]+)(/.*)?$"
+        )
+        self._membership_lock = asyncio.Lock()
+        self._open = asyncio.Event()
+        self._open.set()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._in_flight = 0
+
+    def _client(self, target: Node) -> "httpx.AsyncClient":
+        if isinstance(target, str):
+            return httpx.AsyncClient(base_url=target, timeout=self.timeout)
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=target),
+            base_url="http://node",
+            timeout=self.timeout
+        )
+
+    def _assign(self) -> List[str]:
+        """The node of every shard."""
+        if not len(self.ring):
+            return []
+        return [self.ring.owner(f"shard-{shard}") for shard in range(SESSION_SHARDS)]
+
+    def owner(self, session_id: str) -> str:
+        """The node holding a session."""
+        return self._owners[session_shard(session_id)]
+
+    # ---- Requests ----
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            await send({"type": "websocket.close", "code": 1003})
+            return
+
+        if scope["path"].startswith("/cluster/nodes"):
+            await self._membership(scope, receive, send)
+            return
+
+        await self._open.wait()
+        self._in_flight += 1
+        self._drained.clear()
+        try:
+            await self._forward(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._drained.set()
+
+    async def _forward(self, scope, receive, send) -> None:
+        headers = [
+            (key, value) for key, value in scope["headers"]
+            if key not in HOP_BY_HOP
+            and key not in (SHARD_HEADER.encode(), FORWARDED_FOR_HEADER)
+        ]
+        headers.append((FORWARDED_FOR_HEADER, _forwarded_for(scope)))
+        match = self._conversation_path.match(scope["path"])
+        if match and match.group(1) == "start" and not match.group(2):
+            shard = random.randrange(SESSION_SHARDS)
+            headers.append((SHARD_HEADER.encode(), str(shard).encode()))
+            node = self._owners[shard]
+        elif match:
+            node = self.owner(match.group(1))
+        else:
+            node = random.choice(self.ring.nodes)
+
+        body = await _read_body(receive)
+        url = scope.get("raw_path") or scope["path"].encode("utf-8")
+        if scope.get("query_string"):
+            url += b"?" + scope["query_string"]
+        request = self._clients[node].build_request(
+            scope["method"], url.decode("latin-1"), headers=headers, content=body
+        )
+        try:
+            response = await self._clients[node].send(request, stream=True)
+        except httpx.TransportError as e:
+            logger.error(f"Node '{node}' unreachable for {scope['path']}: {e}")
+            await _send_json(send, 502, {"detail": f"Node '{node}' unreachable"})
+            return
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (key, value) for key, value in response.headers.raw
+                    if key.lower() not in HOP_BY_HOP
+                ],
+            })
+            async for chunk in response.aiter_raw():
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await response.aclose()
+
+    # ---- Membership ----
+
+    async def add_node(self, name: str, target: Node) -> int:
+        """Add a node and move it the sessions of its shards; returns how many."""
+        async with self._membership_lock:
+            if name in self._clients:
+                raise ValueError(f"Node '{name}' is already routed to")
+            self._clients[name] = self._client(target)
+            self.ring.add(name)
+            return await self._rebalance()
+
+    async def remove_node(self, name: str) -> int:
+        """Move a node's sessions to the others and stop routing to it."""
+        async with self._membership_lock:
+            if name not in self._clients:
+                raise ValueError(f"Node '{name}' is not routed to")
+            if name in self.ring:
+                if len(self.ring) == 1:
+                    raise ValueError("Cannot remove the last node")
+                self.ring.remove(name)
+            moved = await self._rebalance()
+            await self._clients.pop(name).aclose()
+            return moved
+
+    async def _rebalance(self) -> int:
+        """Hand over the sessions of every shard whose node changed on the ring.
+
+        New requests wait and requests in flight finish first. Shards are only
+        routed to their new node once their sessions are there: if a hand-over
+        fails, every shard stays with its old node and moves at the next change
+        of nodes (or a retried removal).
+        """
+        owners = list(self._owners)
+        moves: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for shard, new in enumerate(self._assign()):
+            if owners[shard] != new:
+                moves[owners[shard], new].append(shard)
+
+        self._open.clear()
+        try:
+            await self._drained.wait()
+            moved = await self._hand_over(moves)
+            for (_, new), shards in moves.items():
+                for shard in shards:
+                    owners[shard] = new
+        finally:
+            self._owners = owners
+            self._open.set()
+        logger.info(
+            f"Rebalanced {sum(map(len, moves.values()))} shards over "
+            f"{len(self.ring)} nodes, moving {moved} sessions"
+        )
+        return moved
+
+    def _bot_headers(self) -> List[Dict[str, str]]:
+        return [{}] + [{"X-Bot": bot} for bot in self.bots]
+
+    async def _hand_over(self, moves: Dict[Tuple[str, str], List[int]]) -> int:
+        """Copy the sessions of the moving shards to their new nodes, then delete.
+
+        Sessions are exported and imported for every move and bot first; they
+        are only deleted from their old nodes once every import succeeded. If
+        any call fails, the sessions already imported are deleted from their
+        new nodes again and the error is raised, leaving the old nodes intact.
+        """
+        moved = 0
+        imported: List[Tuple[str, List[int], Dict[str, str]]] = []
+        try:
+            for (old, new), shards in moves.items():
+                for headers in self._bot_headers():
+                    exported = await self._call(
+                        old, "export", {"shards": shards}, headers
+                    )
+                    if exported["sessions"]:
+                        imported.append((new, shards, headers))
+                        await self._call(new, "import", exported, headers)
+                    moved += len(exported["sessions"])
+        except httpx.HTTPError:
+            for new, shards, headers in imported:
+                try:
+                    await self._call(new, "delete", {"shards": shards}, headers)
+                except httpx.HTTPError as e:
+                    logger.error(f"Could not undo the hand-over to '{new}': {e}")
+            raise
+
+        for (old, new), shards in moves.items():
+            for headers in self._bot_headers():
+                try:
+                    await self._call(old, "delete", {"shards": shards}, headers)
+                except httpx.HTTPError as e:
+                    # The sessions are on the new node already, which is routed to
+                    logger.error(f"Could not delete moved sessions from '{old}': {e}")
+            logger.info(
+                f"Moved the sessions of {len(shards)} shards from '{old}' to '{new}'"
+            )
+        return moved
+
+    async def _call(
+        self, node: str, action: str, payload: Dict, headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        response = await self._clients[node].post(
+            f"{self.prefix}/internal/sessions/{action}",
+            json=payload,
+            headers={**headers, SECRET_HEADER: self.secret}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _authorized(self, scope) -> bool:
+        """Whether a request carries the secret; an empty secret matches nothing."""
+        given = b"".join(
+            value for key, value in scope["headers"]
+            if key == SECRET_HEADER.lower().encode()
+        )
+        return bool(self.secret) and hmac.compare_digest(
+            given, self.secret.encode("utf-8")
+        )
+
+    async def _membership(self, scope, receive, send) -> None:
+        """Serve ``/cluster/nodes`` to requests carrying the secret."""
+        if not self._authorized(scope):
+            await _send_json(send, 403, {"detail": "Invalid cluster secret"})
+            return
+        name = scope["path"][len("/cluster/nodes"):].strip("/")
+        method = scope["method"]
+        try:
+            if not name and method == "GET":
+                shares = defaultdict(int)
+                for node in self._owners:
+                    shares[node] += 1
+                await _send_json(send, 200, {"nodes": [
+                    {"name": node, "shards": shares[node]} for node in self.ring.nodes
+                ]})
+                return
+            if name and method == "PUT":
+                url = json.loads(await _read_body(receive) or b"{}").get("url")
+                if not isinstance(url, str):
+                    await _send_json(send, 422, {"detail": "Expected {\"url\": ...}"})
+                    return
+                moved = await self.add_node(name, url)
+            elif name and method == "DELETE":
+                moved = await self.remove_node(name)
+            else:
+                await _send_json(send, 405, {"detail": "Method not allowed"})
+                return
+        except (ValueError, json.JSONDecodeError) as e:
+            await _send_json(send, 409, {"detail": str(e)})
+            return
+        except httpx.HTTPError as e:
+            await _send_json(send, 502, {"detail": f"Hand-over failed: {e}"})
+            return
+        await _send_json(send, 200, {"moved_sessions": moved})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def aclose(self) -> None:
+        """Close the connections to the nodes."""
+        for client in self._clients.values():
+            await client.aclose()
+
+
+def _forwarded_for(scope) -> bytes:
+    """``X-Forwarded-For`` of a request with the caller's address appended."""
+    chain = [
+        value for key, value in scope["headers"] if key == FORWARDED_FOR_HEADER
+    ]
+    client = scope.get("client")
+    chain.append(client[0].encode("latin-1") if client else b"unknown")
+    return b", ".join(chain)
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send_json(send, status: int, payload: Dict[str, Any]) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
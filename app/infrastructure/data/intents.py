@@ -0,0 +1,152 @@
+"""Intent table - The dataset compiled into intents and reply pools."""
+# Standard library imports
+import random
+import sys
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Third-party imports
+import numpy as np
+
+# Local application imports
+from app.core.memory import DEFAULT_SAMPLE, sequence_bytes
+
+
+class IntentTable:
+    """Maps questions to intents and intents to per-language reply pools.
+
+    Question ``i`` belongs to intent ``question_intents[i]`` (an int32 array), and
+    each intent owns one tuple of replies per language. Reply strings are interned
+    so a reply shared by several intents is stored once, and a reply is drawn from
+    the pool on every request instead of being fixed when the data is loaded.
+
+    Intent ids 0 and 1 are reserved for greetings and fallbacks.
+    """
+
+    GREETING = 0
+    FALLBACK = 1
+
+    def __init__(self):
+        """Initialize with the reserved greeting and fallback intents."""
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._pools: Dict[str, List[Tuple[str, ...]]] = {}
+        self._question_intents = np.zeros(16, dtype=np.int32)
+        self._n_questions = 0
+        self._write_lock = threading.Lock()
+
+        self.add_intent("greeting", {})
+        self.add_intent("fallback", {})
+
+    @classmethod
+    def from_arrays(
+        cls,
+        names: List[str],
+        pools: Dict[str, List[Tuple[str, ...]]],
+        question_intents: np.ndarray
+    ) -> "IntentTable":
+        """Rebuild a table from its parts, as produced by a compiled dataset."""
+        table = cls.__new__(cls)
+        table._names = list(names)
+        table._ids = {}
+        for intent_id, name in enumerate(table._names):
+            table._ids.setdefault(name, intent_id)
+        table._pools = {language: list(pool) for language, pool in pools.items()}
+        table._question_intents = np.array(question_intents, dtype=np.int32)
+        table._n_questions = len(table._question_intents)
+        table._write_lock = threading.Lock()
+        return table
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self._pools)
+
+    @property
+    def question_intents(self) -> np.ndarray:
+        return self._question_intents[:self._n_questions]
+
+    def memory_usage(self, sample: int = DEFAULT_SAMPLE) -> Dict[str, int]:
+        """Bytes of the reply pools, estimated from samples, and question intents.
+
+        A reply shared by several intents is counted in each of their pools.
+        """
+        with self._write_lock:
+            pools = list(self._pools.values())
+        return {
+            "replies": sum(sequence_bytes(pool, sample) for pool in pools),
+            "question_intents": self._question_intents.nbytes,
+        }
+
+    def intent_id(self, name: str) -> Optional[int]:
+        """Return the id of a named intent, if it exists."""
+        return self._ids.get(name)
+
+    def intent_name(self, intent_id: int) -> str:
+        return self._names[intent_id]
+
+    def add_intent(self, name: str, replies: Mapping[str, Iterable[str]]) -> int:
+        """Register an intent with its replies per language and return its id."""
+        with self._write_lock:
+            intent_id = len(self._names)
+            for pool in self._pools.values():
+                pool.append(())
+            for language, language_replies in replies.items():
+                if not isinstance(language_replies, (list, tuple)):
+                    continue
+                pool = self._pools.get(language)
+                if pool is None:
+                    pool = self._pools[language] = [()] * (intent_id + 1)
+                pool[intent_id] = tuple(
+                    sys.intern(reply)
+                    for reply in language_replies
+                    if isinstance(reply, str) and reply
+                )
+
+            self._names.append(name)
+            self._ids.setdefault(name, intent_id)
+            return intent_id
+
+    def set_replies(
+        self, intent_id: int, language: str, replies: Iterable[str]
+    ) -> None:
+        """Replace the reply pool of an intent for one language."""
+        with self._write_lock:
+            pool = self._pools.setdefault(language, [()] * len(self._names))
+            pool[intent_id] = tuple(
+                sys.intern(reply)
+                for reply in replies
+                if isinstance(reply, str) and reply
+            )
+
+    def add_questions(self, intent_id: int, count: int) -> None:
+        """Assign the next ``count`` question indices to an intent."""
+        with self._write_lock:
+            end = self._n_questions + count
+            if end > len(self._question_intents):
+                capacity = max(end, 2 * len(self._question_intents))
+                grown = np.zeros(capacity, dtype=np.int32)
+                grown[:self._n_questions] = self._question_intents[:self._n_questions]
+                self._question_intents = grown
+            self._question_intents[self._n_questions:end] = intent_id
+            self._n_questions = end
+
+    def intent_of(self, question_index: int) -> int:
+        """Return the intent id of a question."""
+        return int(self._question_intents[question_index])
+
+    def replies(self, intent_id: int, language: str) -> Tuple[str, ...]:
+        """Return the reply pool of an intent, empty if it has none in the language."""
+        pool = self._pools.get(language)
+        return pool[intent_id] if pool is not None else ()
+
+    def choose_reply(self, intent_id: int, language: str) -> Optional[str]:
+        """Pick a random reply of an intent, or None if the pool is empty."""
+        replies = self.replies(intent_id, language)
+        return random.choice(replies) if replies else None
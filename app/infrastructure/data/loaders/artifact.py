@@ -0,0 +1,182 @@
+"""Compiled dataset artifact - A binary form of the dataset that loads quickly.
+
+Layout (little-endian)::
+
+    header  magic "CBDC", format version, source mtime (ns), source size
+    arrays  each as dtype code (1 byte), item count (uint64) and raw items
+
+All strings live in the first array, a NUL-separated UTF-8 blob, and every other
+array refers to them by index: the metadata (the language), the questions and
+their intents, the intent names, the reply pools of each language as offsets
+plus reply ids, and the keyword rules as offsets plus phrase ids. Loading is a
+handful of ``numpy.frombuffer`` calls and one split of the string blob.
+"""
+# Standard library imports
+import os
+import struct
+import tempfile
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+# Third-party imports
+import numpy as np
+
+# Local application imports
+from app.infrastructure.data.intents import IntentTable
+from app.infrastructure.data.loaders.compiler import CompiledDataset
+
+
+MAGIC = b"CBDC"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHqq")
+_ARRAY_HEADER = struct.Struct("<cQ")
+_DTYPES = {b"B": np.dtype("<u1"), b"I": np.dtype("<u4"), b"i": np.dtype("<i4")}
+_CODES = {dtype: code for code, dtype in _DTYPES.items()}
+
+# (mtime in ns, size) of the source the artifact was compiled from
+SourceSignature = Tuple[int, int]
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def id(self, text: str) -> int:
+        index = self.ids.get(text)
+        if index is None:
+            if "\0" in text:
+                raise ValueError("Strings containing NUL cannot be stored")
+            index = self.ids[text] = len(self.ids)
+        return index
+
+    def ids_of(self, texts: List[str]) -> np.ndarray:
+        return np.asarray([self.id(text) for text in texts], dtype=np.uint32)
+
+    def blob(self) -> np.ndarray:
+        data = "\0".join(self.ids).encode("utf-8")
+        return np.frombuffer(data, dtype=np.uint8)
+
+
+def write_artifact(
+    path: str, dataset: CompiledDataset, source: SourceSignature
+) -> None:
+    """Write the compiled dataset atomically to ``path``."""
+    strings = _StringTable()
+    intents = dataset.intents
+    n_intents = len(intents)
+
+    arrays = [
+        strings.ids_of([dataset.language]),
+        strings.ids_of(dataset.questions),
+        np.asarray(intents.question_intents, dtype=np.int32),
+        strings.ids_of(intents.names),
+        strings.ids_of(intents.languages),
+    ]
+    for language in intents.languages:
+        pools = [intents.replies(intent_id, language) for intent_id in range(n_intents)]
+        arrays.append(_offsets(pools))
+        arrays.append(strings.ids_of([reply for pool in pools for reply in pool]))
+
+    rules = list(dataset.keyword_rules.items())
+    arrays.append(strings.ids_of([name for name, _ in rules]))
+    arrays.append(_offsets([phrases for _, phrases in rules]))
+    arrays.append(
+        strings.ids_of([phrase for _, phrases in rules for phrase in phrases])
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, *source))
+            for array in [strings.blob()] + arrays:
+                _write_array(f, array)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def read_artifact(
+    path: str, source: Optional[SourceSignature] = None
+) -> Optional[CompiledDataset]:
+    """Load a compiled dataset.
+
+    Returns None if the file is missing, was written by another format version,
+    or was compiled from a source with a different signature than ``source``.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, mtime_ns, size = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    if source is not None and (mtime_ns, size) != tuple(source):
+        return None
+
+    offset = _HEADER.size
+    arrays = []
+    while offset < len(data):
+        array, offset = _read_array(data, offset)
+        arrays.append(array)
+
+    blob = arrays[0].tobytes().decode("utf-8")
+    strings = blob.split("\0")
+
+    def texts(ids: np.ndarray) -> List[str]:
+        return [strings[i] for i in ids.tolist()]
+
+    language = strings[int(arrays[1][0])]
+    questions = texts(arrays[2])
+    question_intents = arrays[3]
+    names = texts(arrays[4])
+    languages = texts(arrays[5])
+
+    pools = {}
+    position = 6
+    for pool_language in languages:
+        bounds = arrays[position].tolist()
+        replies = texts(arrays[position + 1])
+        pools[pool_language] = [
+            tuple(replies[bounds[i]:bounds[i + 1]]) for i in range(len(names))
+        ]
+        position += 2
+
+    rule_names = texts(arrays[position])
+    bounds = arrays[position + 1].tolist()
+    phrases = texts(arrays[position + 2])
+    keyword_rules = {
+        name: phrases[bounds[i]:bounds[i + 1]] for i, name in enumerate(rule_names)
+    }
+
+    return CompiledDataset(
+        language=language,
+        questions=questions,
+        intents=IntentTable.from_arrays(names, pools, question_intents),
+        keyword_rules=keyword_rules,
+    )
+
+
+def _offsets(groups: List) -> np.ndarray:
+    offsets = np.zeros(len(groups) + 1, dtype=np.uint32)
+    offsets[1:] = np.cumsum([len(group) for group in groups])
+    return offsets
+
+
+def _write_array(f: BinaryIO, array: np.ndarray) -> None:
+    dtype = array.dtype.newbyteorder("<")
+    f.write(_ARRAY_HEADER.pack(_CODES[dtype], len(array)))
+    f.write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+
+
+def _read_array(data: bytes, offset: int) -> Tuple[np.ndarray, int]:
+    code, count = _ARRAY_HEADER.unpack_from(data, offset)
+    offset += _ARRAY_HEADER.size
+    dtype = _DTYPES[code]
+    array = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+    return array, offset + count * dtype.itemsize
@@ -0,0 +1,105 @@
+"""Chatbot data loader - Loads the dataset file into its compiled form."""
+# Standard library imports
+import logging
+import os
+from typing import Optional
+
+# Local application imports
+from app.core.config import settings
+from app.core.exceptions import DataLoadingException
+from app.infrastructure.data.loaders.artifact import (
+    SourceSignature,
+    read_artifact,
+    write_artifact,
+)
+from app.infrastructure.data.loaders.compiler import CompiledDataset, compile_entries
+from app.infrastructure.data.loaders.stream import iter_sections
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_compiled_path(path: str) -> str:
+    """Return where the compiled artifact of a dataset file is kept by default."""
+    return os.path.splitext(path)[0] + ".bin"
+
+
+def default_model_path(path: Optional[str] = None) -> Optional[str]:
+    """Where the fitted model of a dataset file is cached, if at all.
+
+    Defaults to the configured dataset file.
+    """
+    if not settings.CHATBOT_DATA_COMPILE:
+        return None
+    if path is None:
+        compiled_path = settings.CHATBOT_DATA_COMPILED_PATH or default_compiled_path(
+            settings.CHATBOT_DATA_PATH
+        )
+    else:
+        compiled_path = default_compiled_path(path)
+    return os.path.splitext(compiled_path)[0] + ".model.npz"
+
+
+def load_dataset(
+    path: Optional[str] = None,
+    language: str = "en",
+    compiled_path: Optional[str] = None,
+    use_compiled: Optional[bool] = None
+) -> CompiledDataset:
+    """Load a dataset file, from its compiled artifact when it is up to date.
+
+    The JSON source is streamed entry by entry, validated and compiled; the result
+    is then written as a binary artifact next to it (or to ``compiled_path``) so
+    that the next load skips parsing. An artifact is only used while the size and
+    modification time of the source match the ones it was compiled from.
+
+    Raises ``DataLoadingException`` if the file cannot be read or parsed, and
+    ``DatasetValidationError`` listing every schema problem found.
+    """
+    if path is None:
+        path = settings.CHATBOT_DATA_PATH
+        compiled_path = compiled_path or settings.CHATBOT_DATA_COMPILED_PATH
+    compiled_path = compiled_path or default_compiled_path(path)
+    if use_compiled is None:
+        use_compiled = settings.CHATBOT_DATA_COMPILE
+
+    source = _source_signature(path)
+
+    if use_compiled:
+        try:
+            dataset = read_artifact(compiled_path, source)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable compiled dataset {compiled_path}: {e}")
+            dataset = None
+        if dataset is not None and dataset.language == language:
+            logger.info(f"Loaded compiled dataset from {compiled_path}")
+            return dataset
+
+    dataset = compile_file(path, language)
+
+    if use_compiled:
+        try:
+            write_artifact(compiled_path, dataset, source)
+            logger.info(f"Wrote compiled dataset to {compiled_path}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not write compiled dataset {compiled_path}: {e}")
+
+    return dataset
+
+
+def compile_file(path: str, language: str = "en") -> CompiledDataset:
+    """Stream, validate and compile a JSON dataset file."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return compile_entries(iter_sections(f), language)
+    except (OSError, ValueError) as e:
+        # JSON syntax errors are ValueErrors, schema errors are not
+        raise DataLoadingException(f"Cannot load chatbot data from {path}: {e}") from e
+
+
+def _source_signature(path: str) -> SourceSignature:
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise DataLoadingException(f"Cannot load chatbot data from {path}: {e}") from e
+    return stat.st_mtime_ns, stat.st_size
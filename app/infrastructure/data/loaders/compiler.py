@@ -0,0 +1,162 @@
+"""Dataset compiler - Turns dataset entries into questions, intents and rules."""
+# Standard library imports
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Local application imports
+from app.core.exceptions import DatasetValidationError
+from app.infrastructure.data.intents import IntentTable
+from app.infrastructure.data.loaders.schema import (
+    SECTIONS,
+    validate_entry,
+    validate_section,
+)
+
+
+logger = logging.getLogger(__name__)
+
+GREETING_INTENT = "greeting"
+
+# Used when the dataset does not declare greeting keywords of its own
+DEFAULT_GREETING_KEYWORDS = ["hello", "hi", "hey", "hola", "hei", "hallo"]
+
+
+@dataclass
+class CompiledDataset:
+    """Everything the chatbot needs from a dataset, for one language."""
+    language: str
+    questions: List[str]
+    intents: IntentTable
+    keyword_rules: Dict[str, List[str]]
+
+
+class DatasetCompiler:
+    """Validates and compiles dataset entries one at a time.
+
+    Entries can come from a dict in memory or from a streamed file; either way
+    only the compiled form is kept. All schema problems are collected and raised
+    together by ``finish`` as a ``DatasetValidationError``.
+    """
+
+    def __init__(self, language: str):
+        """Initialize an empty compilation for the given language."""
+        self.language = language
+        self.errors: List[str] = []
+        self._questions: List[str] = []
+        self._intents = IntentTable()
+        self._rules: Dict[str, List[str]] = {GREETING_INTENT: []}
+        self._seen_first = set()
+
+    def add(self, section: str, index: Optional[int], entry: Any) -> None:
+        """Compile one entry; ``index`` is None for a section that is not a list."""
+        if section not in SECTIONS:
+            return
+
+        if index is None:
+            self.errors.extend(validate_section(section, entry))
+            return
+
+        errors = validate_entry(section, index, entry)
+        if errors:
+            self.errors.extend(errors)
+            return
+
+        if section == "dialogues":
+            self._add_dialogue(index, entry)
+        elif section == "keywords":
+            self._add_keywords(index, entry)
+        else:
+            if section == "greetings":
+                self._rules[GREETING_INTENT].extend(_keyword_phrases(entry))
+            # Only the first greeting and fallback entry provide replies
+            if section not in self._seen_first:
+                self._seen_first.add(section)
+                intent_id = (
+                    IntentTable.GREETING if section == "greetings"
+                    else IntentTable.FALLBACK
+                )
+                for language, replies in entry["replies"].items():
+                    self._intents.set_replies(intent_id, language, replies)
+
+    def _add_dialogue(self, index: int, dialogue: Dict[str, Any]) -> None:
+        name = dialogue.get("id", f"dialogue-{index}")
+        replies = dialogue["replies"].get(self.language, [])
+        if not replies:
+            logger.warning(f"No replies found for dialogue ID: {name}")
+            return
+
+        questions = [
+            sample.lower().strip()
+            for sample in dialogue["samples"].get(self.language, [])
+            if sample.strip()
+        ]
+        if not questions:
+            return
+
+        intent_id = self._intents.add_intent(name, dialogue["replies"])
+        self._intents.add_questions(intent_id, len(questions))
+        self._questions.extend(questions)
+
+    def _add_keywords(self, index: int, entry: Dict[str, Any]) -> None:
+        name = entry["id"]
+        if name == GREETING_INTENT:
+            self.errors.append(f"keywords[{index}].id: '{name}' is reserved")
+            return
+
+        self._rules.setdefault(name, []).extend(_keyword_phrases(entry))
+        if self._intents.intent_id(name) is None:
+            self._intents.add_intent(name, entry["replies"])
+
+    def finish(self) -> CompiledDataset:
+        """Return the compiled dataset, or raise if any entry was invalid."""
+        if self.errors:
+            raise DatasetValidationError(self.errors)
+
+        if not self._rules[GREETING_INTENT]:
+            self._rules[GREETING_INTENT] = list(DEFAULT_GREETING_KEYWORDS)
+
+        logger.info(
+            f"Compiled {len(self._questions)} questions and "
+            f"{len(self._intents)} intents."
+        )
+        return CompiledDataset(
+            language=self.language,
+            questions=self._questions,
+            intents=self._intents,
+            keyword_rules=self._rules,
+        )
+
+
+def compile_entries(
+    entries: Iterable[Tuple[str, Optional[int], Any]], language: str
+) -> CompiledDataset:
+    """Compile ``(section, index, entry)`` triples, as yielded by ``iter_sections``."""
+    compiler = DatasetCompiler(language)
+    for section, index, entry in entries:
+        compiler.add(section, index, entry)
+    return compiler.finish()
+
+
+def compile_dataset(data: Dict[str, Any], language: str) -> CompiledDataset:
+    """Compile a dataset already loaded into memory."""
+    if not isinstance(data, dict):
+        raise DatasetValidationError(["expected an object at the top level"])
+    return compile_entries(_iter_entries(data), language)
+
+
+def _iter_entries(data: Dict[str, Any]) -> Iterable[Tuple[str, Optional[int], Any]]:
+    for section, value in data.items():
+        if not isinstance(value, list):
+            yield section, None, value
+            continue
+        for index, entry in enumerate(value):
+            yield section, index, entry
+
+
+def _keyword_phrases(entry: Dict[str, Any]) -> List[str]:
+    """Flatten the keywords of an entry, given per language or as a plain list."""
+    keywords = entry.get("keywords", [])
+    if isinstance(keywords, dict):
+        keywords = [phrase for phrases in keywords.values() for phrase in phrases]
+    return list(keywords)
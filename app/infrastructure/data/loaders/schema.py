@@ -0,0 +1,89 @@
+"""Chatbot dataset schema - Validates dataset entries and reports precise paths."""
+# Standard library imports
+from typing import Any, List
+
+
+SECTIONS = ("greetings", "dialogues", "keywords", "fallbacks")
+
+# Fields of each section entry: (name, kind, required)
+_FIELDS = {
+    "greetings": (("replies", "texts", True), ("keywords", "phrases", False)),
+    "dialogues": (
+        ("id", "id", False),
+        ("samples", "texts", True),
+        ("replies", "texts", True),
+    ),
+    "keywords": (
+        ("id", "id", True),
+        ("keywords", "phrases", True),
+        ("replies", "texts", True),
+    ),
+    "fallbacks": (("replies", "texts", True),),
+}
+
+
+def validate_section(section: str, value: Any) -> List[str]:
+    """Check the type of a top-level section; its entries are validated one by one."""
+    if section in _FIELDS and not isinstance(value, list):
+        return [f"{section}: expected a list, got {_type_name(value)}"]
+    return []
+
+
+def validate_entry(section: str, index: int, entry: Any) -> List[str]:
+    """Return the problems found in one entry of a section, empty if it is valid."""
+    path = f"{section}[{index}]"
+    if not isinstance(entry, dict):
+        return [f"{path}: expected an object, got {_type_name(entry)}"]
+
+    errors = []
+    for field, kind, required in _FIELDS.get(section, ()):
+        field_path = f"{path}.{field}"
+        if field not in entry:
+            if required:
+                errors.append(f"{field_path}: missing")
+            continue
+
+        value = entry[field]
+        if kind == "id":
+            if not isinstance(value, str) or not value.strip():
+                errors.append(f"{field_path}: expected a non-empty string")
+        elif kind == "phrases" and isinstance(value, list):
+            errors.extend(_validate_strings(field_path, value))
+        else:
+            errors.extend(_validate_texts(field_path, value))
+    return errors
+
+
+def _validate_texts(path: str, value: Any) -> List[str]:
+    """A mapping of language code to a list of strings."""
+    if not isinstance(value, dict):
+        return [
+            f"{path}: expected an object of language -> list, got {_type_name(value)}"
+        ]
+
+    errors = []
+    for language, texts in value.items():
+        if not isinstance(texts, list):
+            errors.append(
+                f"{path}.{language}: expected a list, got {_type_name(texts)}"
+            )
+            continue
+        errors.extend(_validate_strings(f"{path}.{language}", texts))
+    return errors
+
+
+def _validate_strings(path: str, values: List[Any]) -> List[str]:
+    return [
+        f"{path}[{index}]: expected a string, got {_type_name(value)}"
+        for index, value in enumerate(values)
+        if not isinstance(value, str)
+    ]
+
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    return {
+        dict: "object", list: "list", str: "string", bool: "boolean",
+        int: "number", float: "number"
+    }.get(type(value), type(value).__name__)
@@ -0,0 +1,115 @@
+"""Streaming JSON reader - Yields dataset entries without loading the whole file."""
+# Standard library imports
+import json
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """A growable window over a text stream, decoded one JSON value at a time."""
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read more text, dropping what was consumed. False at end of stream."""
+        if self._eof:
+            return False
+        # Read at least as much as is still pending, so that decoding a value
+        # larger than the chunk size stays linear in its length.
+        pending = len(self._buffer) - self._pos
+        chunk = self._stream.read(max(self._chunk_size, pending))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in _WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"Expected {char!r} but found {found or 'end of file'!r} "
+                f"near offset {self._pos}"
+            )
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+
+            # A number or literal running into the end of the buffer may continue
+            # in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_sections(
+    stream: TextIO, chunk_size: int = 1 << 16
+) -> Iterator[Tuple[str, Optional[int], Any]]:
+    """Yield ``(key, index, item)`` for each item of the top-level object's arrays.
+
+    Only one array item is held in memory at a time. A top-level value that is
+    not an array is yielded whole as ``(key, None, value)``.
+    """
+    reader = _Reader(stream, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError(f"Expected an object key, got {key!r}")
+        reader.expect(":")
+
+        if reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                index = 0
+                while True:
+                    yield key, index, reader.value()
+                    index += 1
+                    if reader.peek() == "]":
+                        reader.expect("]")
+                        break
+                    reader.expect(",")
+        else:
+            yield key, None, reader.value()
+
+        if reader.peek() == "}":
+            reader.expect("}")
+            break
+        reader.expect(",")
+
+    if reader.peek():
+        raise ValueError("Unexpected data after the top-level object")
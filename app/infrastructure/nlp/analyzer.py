@@ -0,0 +1,70 @@
+"""Text analyzer - Pure Python equivalent of scikit-learn's word n-gram analyzer."""
+# Standard library imports
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+# Distinct whitespace-separated chunks whose tokens ``tokenize`` keeps, and the
+# longest chunk it caches
+TOKEN_CACHE_SIZE = 1 << 16
+MAX_CACHED_CHUNK = 64
+
+
+def strip_accents(text: str) -> str:
+    """Remove accents by NFKD decomposition, as ``strip_accents='unicode'`` does."""
+    try:
+        text.encode("ASCII", errors="strict")
+        return text
+    except UnicodeEncodeError:
+        normalized = unicodedata.normalize("NFKD", text)
+        return "".join([c for c in normalized if not unicodedata.combining(c)])
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _chunk_tokens(chunk: str) -> Tuple[str, ...]:
+    return tuple(TOKEN_PATTERN.findall(strip_accents(chunk.lower())))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, accent-stripped word tokens, as scikit-learn's analyzer finds them.
+
+    The text is normalized one whitespace-separated chunk at a time, with the
+    tokens of each distinct chunk cached: lowercasing, NFKD decomposition and
+    the token pattern never look across whitespace, so this gives the tokens of
+    normalizing the whole text, while a recurring word costs one cache lookup.
+    """
+    tokens: List[str] = []
+    for chunk in text.split():
+        if len(chunk) <= MAX_CACHED_CHUNK:
+            tokens.extend(_chunk_tokens(chunk))
+        else:
+            tokens.extend(TOKEN_PATTERN.findall(strip_accents(chunk.lower())))
+    return tokens
+
+
+def build_analyzer(ngram_range: Tuple[int, int] = (1, 2)) -> Callable[[str], List[str]]:
+    """Return a function turning a text into its word n-gram features.
+
+    Produces the same features, in the same order, as the analyzer of
+    ``CountVectorizer(strip_accents='unicode', lowercase=True, ngram_range=...)``,
+    so that a model can be fitted with scikit-learn and served without it.
+    """
+    min_n, max_n = ngram_range
+
+    def analyze(text: str) -> List[str]:
+        tokens = tokenize(text)
+        if max_n == 1:
+            return tokens
+
+        n_tokens = len(tokens)
+        features = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, n_tokens) + 1):
+            features.extend(
+                " ".join(tokens[i:i + n]) for i in range(n_tokens - n + 1)
+            )
+        return features
+
+    return analyze
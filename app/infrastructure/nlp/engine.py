@@ -0,0 +1,124 @@
+"""NLP engine - Builds question matchers, loading the NLP stack on first use.
+
+Nothing here imports SciPy or scikit-learn at module level, so that importing
+the application (and serving ``/health``) does not wait for them.
+"""
+# Standard library imports
+import hashlib
+import logging
+import os
+from typing import (
+    TYPE_CHECKING, Any, Dict, Optional, Protocol, Sequence, Tuple, Type
+)
+
+# Local application imports
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("tfidf", "lsa", "hashing")
+
+
+class Matcher(Protocol):
+    """Question index shared by the NLP engines."""
+
+    @property
+    def n_documents(self) -> int:
+        """Number of indexed questions."""
+
+    def score(self, text: str) -> "np.ndarray":
+        """Cosine similarity of one text against every question."""
+
+    def best_matches(
+        self, texts: Sequence[str]
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Index and score of the best question for each text."""
+
+    def add_documents(self, texts: Sequence[str]) -> None:
+        """Append questions without refitting the index."""
+
+    def save(self, path: str, fingerprint: str = "") -> None:
+        """Write the model to a file that the engine's ``load`` accepts."""
+
+    def memory_usage(self, sample: int) -> Dict[str, int]:
+        """Estimated bytes of each part of the index."""
+
+
+def questions_fingerprint(questions: Sequence[str]) -> str:
+    """Digest identifying a list of questions."""
+    digest = hashlib.blake2b(digest_size=16)
+    for question in questions:
+        digest.update(question.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _engine(name: str) -> Tuple[Type[Any], Dict[str, Any]]:
+    """Matcher class of an engine and the options it is built and loaded with."""
+    if name == "tfidf":
+        from app.infrastructure.nlp.tfidf import TfidfMatcher
+
+        return TfidfMatcher, {"dtype": settings.NLP_MATRIX_DTYPE}
+    if name == "lsa":
+        from app.infrastructure.nlp.lsa import LsaMatcher
+
+        return LsaMatcher, {"rank": settings.LSA_RANK}
+    if name == "hashing":
+        from app.infrastructure.nlp.hashing import HashingMatcher
+
+        return HashingMatcher, {
+            "n_features": settings.HASHING_N_FEATURES,
+            "dtype": settings.NLP_MATRIX_DTYPE,
+        }
+    raise ValueError(f"Unknown NLP engine '{name}', expected one of {ENGINES}")
+
+
+def build_matcher(
+    questions: Sequence[str],
+    model_path: Optional[str] = None,
+    engine: Optional[str] = None
+) -> Matcher:
+    """Return a matcher for the questions, using ``NLP_ENGINE`` by default.
+
+    With ``model_path``, a model of the same engine saved there for the same
+    questions is loaded instead of fitting one, and a freshly fitted model is
+    saved there.
+    """
+    engine = engine or settings.NLP_ENGINE
+    matcher_class, options = _engine(engine)
+
+    fingerprint = questions_fingerprint(questions) if model_path else ""
+
+    if model_path and os.path.exists(model_path):
+        try:
+            matcher = matcher_class.load(model_path, fingerprint, **options)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable model {model_path}: {e}")
+            matcher = None
+        if matcher is not None:
+            logger.info(f"Loaded {engine} model from {model_path}")
+            return matcher
+
+    matcher = matcher_class(questions, **options)
+
+    if model_path:
+        try:
+            matcher.save(model_path, fingerprint)
+            logger.info(f"Saved {engine} model to {model_path}")
+        except OSError as e:
+            logger.warning(f"Could not save model {model_path}: {e}")
+
+    return matcher
+
+
+def warm_up(engine: Optional[str] = None) -> None:
+    """Import everything an engine uses, by fitting and querying a tiny model.
+
+    The NLP stack is imported lazily, partly from inside the fitting code; this
+    makes sure it is loaded before models whose memory is measured are built.
+    """
+    build_matcher(["warm up", "warm up again"], engine=engine).score("warm up")
@@ -0,0 +1,136 @@
+"""TF-IDF question index over hashed features, without a vocabulary."""
+# Standard library imports
+import logging
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zlib import crc32
+
+# Third-party imports
+import numpy as np
+import scipy.sparse as sp
+
+# Local application imports
+from app.infrastructure.nlp.analyzer import build_analyzer
+from app.infrastructure.nlp.tfidf import MODEL_FORMAT_VERSION, TfidfMatcher, read_counts
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_N_FEATURES = 1 << 20
+
+
+class HashingMatcher(TfidfMatcher):
+    """TF-IDF matcher over a fixed space of hashed features.
+
+    Each unigram and bigram is mapped to the column given by the CRC-32 of its
+    UTF-8 bytes modulo ``n_features``, so no vocabulary is kept: the whole model
+    is a few NumPy arrays, which forked workers share without touching, and the
+    feature space never grows with new terms. Features that hash to the same
+    column are merged, which rarely changes a match with the default 2**20
+    columns.
+
+    Fitting is a single streaming pass that keeps only the hashed counts of each
+    question, so the questions can come from a generator, and needs neither
+    scikit-learn nor the questions themselves once counted. Added questions,
+    segments and compaction work as in ``TfidfMatcher``.
+    """
+
+    KIND = "hashing"
+
+    def __init__(
+        self,
+        questions: Iterable[str],
+        n_features: int = DEFAULT_N_FEATURES,
+        compaction_ratio: float = 0.25,
+        dtype: str = "float64"
+    ):
+        """Count the hashed features of the questions in one pass."""
+        self._n_features = n_features
+        self._analyze = build_analyzer((1, 2))
+        counts = self._count(questions)
+        self._setup({}, counts, compaction_ratio, dtype)
+        logger.info(
+            f"Hashed {counts.shape[0]} questions into {n_features} features "
+            f"({counts.nnz} non-zeros)"
+        )
+
+    @property
+    def n_features(self) -> int:
+        """Width of the feature space, fixed when the model is built."""
+        return self._n_features
+
+    def _hash_row(self, text: str) -> Counter:
+        n_features = self._n_features
+        return Counter(
+            crc32(feature.encode("utf-8")) % n_features
+            for feature in self._analyze(text)
+        )
+
+    def _count(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """Hashed feature counts of texts, consumed one at a time."""
+        indices, data, indptr = array("i"), array("i"), array("q", [0])
+        for text in texts:
+            counter = self._hash_row(text)
+            indices.extend(counter.keys())
+            data.extend(counter.values())
+            indptr.append(len(indices))
+
+        return sp.csr_matrix(
+            (
+                np.asarray(data, dtype=np.int32),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int64)
+            ),
+            shape=(len(indptr) - 1, self._n_features)
+        )
+
+    def _count_row(self, text: str) -> Tuple[List[int], List[int]]:
+        """Count the features of a text that land in a column some question uses.
+
+        Like features missing from a vocabulary, the others cannot match anything
+        and would only lower the similarity through the norm of the text.
+        """
+        df = self._df
+        counter = self._hash_row(text)
+        known = [index for index in counter if df[index]]
+        return known, [counter[index] for index in known]
+
+    def _count_new(
+        self, texts: Sequence[str]
+    ) -> Tuple[sp.csr_matrix, Dict[str, int]]:
+        return self._count(texts), {}
+
+    def _model_fields(self) -> Dict[str, np.ndarray]:
+        return {"n_features": np.array(self._n_features)}
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        fingerprint: Optional[str] = None,
+        n_features: Optional[int] = None,
+        compaction_ratio: float = 0.25,
+        dtype: str = "float64"
+    ) -> Optional["HashingMatcher"]:
+        """Load a model written by ``save``.
+
+        Returns None if it has another format version, another fingerprint than
+        the given one or another number of features.
+        """
+        with np.load(path, allow_pickle=False) as model:
+            if int(model["version"]) != MODEL_FORMAT_VERSION:
+                return None
+            if str(model.get("kind", "tfidf")) != cls.KIND:
+                return None
+            if fingerprint is not None and str(model["fingerprint"]) != fingerprint:
+                return None
+            if n_features is not None and int(model["n_features"]) != n_features:
+                return None
+
+            counts = read_counts(model)
+
+        matcher = cls.__new__(cls)
+        matcher._n_features = counts.shape[1]
+        matcher._setup({}, counts, compaction_ratio, dtype)
+        return matcher
@@ -0,0 +1,90 @@
+"""Keyword pre-router built on a token-level Aho-Corasick automaton."""
+# Standard library imports
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded word tokens."""
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+
+class KeywordRouter:
+    """Routes a message to an intent when it contains one of the intent's phrases.
+
+    Phrases are matched on whole tokens, so "hi" matches "hi there" but not
+    "this" or "which", and multi-word phrases such as "thank you" are supported.
+    All phrases are compiled into one automaton over tokens, which finds the
+    earliest-ending phrase in a single left-to-right pass over the message no
+    matter how many rules there are.
+    """
+
+    def __init__(self, rules: Mapping[str, Iterable[str]]):
+        """Compile intent -> phrases rules into the automaton."""
+        self._goto: List[Dict[str, int]] = [{}]
+        # (intent, phrase length) reported when a state is reached
+        self._output: List[Optional[Tuple[str, int]]] = [None]
+        self._fail: List[int] = [0]
+
+        for intent, phrases in rules.items():
+            for phrase in phrases:
+                self._insert(tokenize(phrase), intent)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self._goto) - 1
+
+    def _insert(self, tokens: List[str], intent: str) -> None:
+        if not tokens:
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._output.append(None)
+                self._fail.append(0)
+            state = next_state
+
+        # The first rule declaring a phrase wins
+        if self._output[state] is None:
+            self._output[state] = (intent, len(tokens))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+                # A state without its own phrase reports the longest suffix phrase
+                if self._output[next_state] is None:
+                    self._output[next_state] = self._output[self._fail[next_state]]
+
+    def route(self, text: str) -> Optional[str]:
+        """Return the intent of the first phrase found in the text, if any."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+
+            if output[state] is not None:
+                return output[state][0]
+
+        return None
@@ -0,0 +1,243 @@
+"""Dense latent semantic (LSA) question index scored with BLAS."""
+# Standard library imports
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+# Third-party imports
+import numpy as np
+import scipy.sparse as sp
+
+# Local application imports
+from app.core.memory import DEFAULT_SAMPLE, mapping_bytes
+from app.infrastructure.nlp.analyzer import build_analyzer
+from app.infrastructure.nlp.tfidf import (
+    MAX_BATCH_SCORES,
+    MODEL_FORMAT_VERSION,
+    TfidfMatcher,
+    decode_terms,
+    encode_terms,
+    write_model,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class LsaMatcher:
+    """Scores messages against questions by cosine similarity in a latent space.
+
+    The TF-IDF question matrix, weighted exactly as ``TfidfMatcher`` does, is
+    projected by a truncated SVD onto its ``rank`` strongest directions. Each
+    question becomes an L2-normalized float32 row of one C-contiguous matrix, so
+    scoring a message is a single matrix-vector product (matrix-matrix for
+    batches) run by BLAS, and questions sharing no n-gram with a message can
+    still match it through co-occurring terms.
+
+    The vocabulary and IDF weights are frozen when fitting: added questions are
+    folded into the existing latent space, ignoring terms first seen in them.
+    Readers never lock; rows are written before the view covering them is
+    published.
+    """
+
+    def __init__(self, questions: Sequence[str], rank: int = 256):
+        """Fit the TF-IDF weights and the latent projection on the questions."""
+        tfidf = TfidfMatcher(questions)
+        matrix = tfidf.question_vectors
+        projection = _fit_projection(matrix, rank)
+        self._setup(
+            tfidf.vocabulary,
+            tfidf.idf.astype(np.float32),
+            projection,
+            _normalize(np.asarray(matrix @ projection, dtype=np.float32)),
+            rank,
+        )
+        logger.info(
+            f"Fitted LSA projection of {matrix.shape[1]} features "
+            f"to rank {projection.shape[1]}"
+        )
+
+    def _setup(
+        self,
+        vocabulary: Dict[str, int],
+        idf: np.ndarray,
+        projection: np.ndarray,
+        embeddings: np.ndarray,
+        requested_rank: int
+    ) -> None:
+        self._analyze = build_analyzer((1, 2))
+        self.vocabulary: Dict[str, int] = vocabulary
+        self.requested_rank = requested_rank
+        self._idf = idf
+        # features x rank, so that a message's features select contiguous rows
+        self._projection = np.ascontiguousarray(projection, dtype=np.float32)
+        self._buffer = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self._embeddings = self._buffer[:len(embeddings)]
+        self._write_lock = threading.Lock()
+
+    @property
+    def n_documents(self) -> int:
+        return self._embeddings.shape[0]
+
+    @property
+    def rank(self) -> int:
+        return self._projection.shape[1]
+
+    def memory_usage(self, sample: int = DEFAULT_SAMPLE) -> Dict[str, int]:
+        """Bytes of the vocabulary, estimated from a sample, and of the arrays.
+
+        Callers must not add documents meanwhile.
+        """
+        return {
+            "vocabulary": mapping_bytes(self.vocabulary, sample),
+            "idf": self._idf.nbytes,
+            "projection": self._projection.nbytes,
+            "embeddings": self._buffer.nbytes,
+        }
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """Project texts into the latent space as L2-normalized float32 rows."""
+        indices, data, indptr = [], [], [0]
+        for text in texts:
+            counter = Counter(
+                self.vocabulary[feature]
+                for feature in self._analyze(text)
+                if feature in self.vocabulary
+            )
+            indices.extend(counter.keys())
+            data.extend(counter.values())
+            indptr.append(len(indices))
+
+        index_array = np.asarray(indices, dtype=np.int32)
+        weights = sp.csr_matrix(
+            (
+                np.asarray(data, dtype=np.float32) * self._idf[index_array],
+                index_array,
+                indptr
+            ),
+            shape=(len(indptr) - 1, len(self._idf))
+        )
+        # The TF-IDF norm is left out: rows are normalized after projecting
+        return _normalize(np.asarray(weights @ self._projection))
+
+    def score(self, text: str) -> np.ndarray:
+        """Cosine similarity of one text against every question."""
+        return self._embeddings @ self.embed([text])[0]
+
+    def best_matches(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Index and score of the best question for each text."""
+        vectors = self.embed(texts)
+        embeddings = self._embeddings
+        step = max(1, MAX_BATCH_SCORES // max(1, embeddings.shape[0]))
+
+        best_indices, best_scores = [], []
+        for start in range(0, vectors.shape[0], step):
+            similarities = vectors[start:start + step] @ embeddings.T
+            indices = similarities.argmax(axis=1)
+            best_indices.append(indices)
+            best_scores.append(similarities[np.arange(len(indices)), indices])
+
+        if not best_indices:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        return np.concatenate(best_indices), np.concatenate(best_scores)
+
+    def add_documents(self, texts: Sequence[str]) -> None:
+        """Fold new questions into the latent space without refitting."""
+        if not texts:
+            return
+
+        rows = self.embed(texts)
+        with self._write_lock:
+            n_docs = self._embeddings.shape[0]
+            needed = n_docs + len(rows)
+            buffer = self._buffer
+            if needed > len(buffer):
+                buffer = np.empty(
+                    (max(needed, 2 * len(buffer)), self.rank), dtype=np.float32
+                )
+                buffer[:n_docs] = self._embeddings
+            buffer[n_docs:needed] = rows
+
+            self._buffer = buffer
+            self._embeddings = buffer[:needed]
+
+        logger.debug(f"Folded {len(texts)} documents into the LSA index")
+
+    def save(self, path: str, fingerprint: str = "") -> None:
+        """Write the model to a ``.npz`` file, atomically.
+
+        ``fingerprint`` identifies the questions the model was built from, so
+        that ``load`` can reject a model that no longer matches them.
+        """
+        with self._write_lock:
+            embeddings = self._embeddings
+
+        write_model(
+            path,
+            version=MODEL_FORMAT_VERSION,
+            kind=np.array("lsa"),
+            fingerprint=np.array(fingerprint),
+            requested_rank=self.requested_rank,
+            terms=encode_terms(self.vocabulary),
+            idf=self._idf,
+            projection=self._projection,
+            embeddings=embeddings,
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        fingerprint: Optional[str] = None,
+        rank: Optional[int] = None
+    ) -> Optional["LsaMatcher"]:
+        """Load a model written by ``save``.
+
+        Returns None if it has another format version, another fingerprint than
+        the given one or was fitted for another rank.
+        """
+        with np.load(path, allow_pickle=False) as model:
+            if int(model["version"]) != MODEL_FORMAT_VERSION:
+                return None
+            if str(model.get("kind", "tfidf")) != "lsa":
+                return None
+            if fingerprint is not None and str(model["fingerprint"]) != fingerprint:
+                return None
+            if rank is not None and int(model["requested_rank"]) != rank:
+                return None
+
+            terms = decode_terms(model["terms"])
+            matcher = cls.__new__(cls)
+            matcher._setup(
+                dict(zip(terms, range(len(terms)))),
+                model["idf"],
+                model["projection"],
+                model["embeddings"],
+                int(model["requested_rank"]),
+            )
+        return matcher
+
+
+def _fit_projection(matrix: sp.csr_matrix, rank: int) -> np.ndarray:
+    """Right singular vectors (features x rank) of the strongest directions."""
+    n_docs, n_features = matrix.shape
+    if rank < min(n_docs, n_features):
+        from sklearn.decomposition import TruncatedSVD
+
+        svd = TruncatedSVD(n_components=rank, random_state=0)
+        svd.fit(matrix)
+        return svd.components_.T
+
+    # The rank covers the whole matrix: an exact SVD of the small side is cheaper
+    _, _, vt = np.linalg.svd(matrix.toarray(), full_matrices=False)
+    return vt.T
+
+
+def _normalize(rows: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length in place, leaving all-zero rows as they are."""
+    rows = np.ascontiguousarray(rows, dtype=np.float32)
+    norms = np.sqrt(np.einsum("ij,ij->i", rows, rows))
+    norms[norms == 0] = 1.0
+    rows /= norms[:, None]
+    return rows
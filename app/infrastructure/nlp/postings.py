@@ -0,0 +1,132 @@
+"""Compact column-major storage of weighted question rows for scoring."""
+# Standard library imports
+from typing import Optional
+
+# Third-party imports
+import numpy as np
+import scipy.sparse as sp
+
+
+MATRIX_DTYPES = ("float64", "float32", "uint16", "uint8")
+
+
+class PostingMatrix:
+    """Question rows stored as one posting list per feature, in a compact dtype.
+
+    Only features that occur in some row get a posting list, so the size is
+    proportional to the non-zeros however wide the feature space is. Values are
+    kept as ``float64`` or ``float32``, or quantized to ``uint16``/``uint8``
+    with one float32 scale per row (TF-IDF weights are never negative); row
+    numbers are int32. A text is scored by summing only the postings of its own
+    features, so scoring reads neither the whole matrix nor a converted copy of
+    it.
+
+    ``counts``, a matrix of the same non-zeros as ``rows`` (the term counts the
+    rows were weighted from), is kept as one small unsigned integer per posting
+    and rebuilt on demand by ``counts``, sharing the posting structure instead
+    of holding a second sparse matrix.
+    """
+
+    def __init__(
+        self,
+        rows: sp.csr_matrix,
+        dtype: str = "float64",
+        counts: Optional[sp.csr_matrix] = None
+    ):
+        """Store the rows of a non-negative CSR matrix, and their counts if given."""
+        if dtype not in MATRIX_DTYPES:
+            raise ValueError(
+                f"Unknown matrix dtype '{dtype}', expected one of {MATRIX_DTYPES}"
+            )
+
+        self.shape = rows.shape
+        self.dtype = np.dtype(dtype)
+        columns = rows.tocsc()
+
+        values = columns.data
+        self._scale: Optional[np.ndarray] = None
+        if self.dtype.kind == "u":
+            # Per-row scale mapping the largest weight of each row to the top code
+            row_max = np.zeros(rows.shape[0])
+            np.maximum.at(row_max, columns.indices, values)
+            scale = row_max / np.iinfo(self.dtype).max
+            scale[scale == 0] = 1.0
+            values = np.rint(values / scale[columns.indices])
+            self._scale = scale.astype(np.float32)
+
+        lengths = np.diff(columns.indptr)
+        features = np.flatnonzero(lengths)
+        self._features = features.astype(np.int32)
+        self._starts = np.append(columns.indptr[features], columns.nnz).astype(
+            np.int32 if columns.nnz < 2 ** 31 else np.int64
+        )
+        self._rows = columns.indices.astype(np.int32)
+        self._values = values.astype(self.dtype)
+
+        self._counts: Optional[np.ndarray] = None
+        if counts is not None:
+            if counts.shape != rows.shape or counts.nnz != rows.nnz:
+                raise ValueError("Counts must have the non-zeros of the rows")
+            # Same structure, so the same column-major order as the postings
+            count_values = counts.tocsc().data
+            largest = int(count_values.max()) if len(count_values) else 0
+            self._counts = count_values.astype(_smallest_uint(largest))
+
+    def counts(self) -> sp.csr_matrix:
+        """The int32 count matrix given when the rows were stored."""
+        if self._counts is None:
+            raise ValueError("No counts were stored with these rows")
+        indptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+        indptr[self._features + 1] = np.diff(self._starts)
+        columns = sp.csc_matrix(
+            (self._counts.astype(np.int32), self._rows, np.cumsum(indptr)),
+            shape=self.shape
+        )
+        return columns.tocsr()
+
+    @property
+    def counts_nbytes(self) -> int:
+        """Bytes held by the stored counts."""
+        return 0 if self._counts is None else self._counts.nbytes
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays of the matrix, without the counts."""
+        arrays = [self._features, self._starts, self._rows, self._values]
+        if self._scale is not None:
+            arrays.append(self._scale)
+        return sum(array.nbytes for array in arrays)
+
+    def scores(self, features: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Dot product of every row with a sparse vector of feature weights."""
+        n_rows = self.shape[0]
+        positions = np.searchsorted(self._features, features)
+        found = positions < len(self._features)
+        found[found] = self._features[positions[found]] == features[found]
+        positions, weights = positions[found], weights[found]
+
+        begins = self._starts[positions].astype(np.int64)
+        lengths = self._starts[positions + 1] - begins
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(n_rows)
+
+        # Offsets of all postings of the text's features, range after range
+        ends = np.cumsum(lengths)
+        offsets = np.arange(total) + np.repeat(begins - (ends - lengths), lengths)
+
+        compute = np.float64 if self.dtype == np.float64 else np.float32
+        values = self._values[offsets].astype(compute, copy=False)
+        values *= np.repeat(weights.astype(compute), lengths)
+        scores = np.bincount(self._rows[offsets], weights=values, minlength=n_rows)
+        if self._scale is not None:
+            scores *= self._scale
+        return scores
+
+
+def _smallest_uint(largest: int) -> np.dtype:
+    """Narrowest unsigned integer type holding values up to ``largest``."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if largest <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
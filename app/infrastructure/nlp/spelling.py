@@ -0,0 +1,178 @@
+"""Typo correction over the training vocabulary with a symmetric delete index."""
+# Standard library imports
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+# Third-party imports
+from cachetools import LRUCache
+
+# Local application imports
+from app.core.memory import DEFAULT_SAMPLE, mapping_bytes
+from app.infrastructure.nlp.analyzer import tokenize
+
+
+logger = logging.getLogger(__name__)
+
+PREFIX_LENGTH = 7
+CORRECTION_CACHE_SIZE = 10_000
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """Every string obtained by deleting 1 to ``max_distance`` characters."""
+    result: Set[str] = set()
+    frontier = {word}
+    for _ in range(max_distance):
+        reached = set()
+        for text in frontier:
+            if len(text) > 1:
+                reached.update(text[:i] + text[i + 1:] for i in range(len(text)))
+        reached -= result
+        result |= reached
+        frontier = reached
+    return result
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or ``max_distance + 1`` once exceeded."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    # A common prefix and suffix cost nothing: align only what lies between
+    start, end = 0, 0
+    shortest = min(len(a), len(b))
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    while end < shortest - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return min(len(a) + len(b), max_distance + 1)
+
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if (
+                i > 1 and j > 1
+                and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SpellingCorrector:
+    """Corrects unknown tokens to the closest training word (SymSpell-style).
+
+    Every word of the questions is indexed under the strings obtained by
+    deleting up to ``max_distance`` characters from its first ``PREFIX_LENGTH``
+    characters. A misspelled token generates its own deletes, which meet the
+    words within that edit distance in the index: correcting a token takes a few
+    dictionary lookups and distance checks on the handful of candidates found,
+    never a scan of the vocabulary. Ties go to the word used in more questions.
+    Corrections are kept in an LRU cache, so a recurring typo costs one lookup.
+
+    Tokens of one or two characters, and tokens with digits, are left alone;
+    tokens of up to four characters are corrected by one edit at most.
+    """
+
+    def __init__(self, questions: Iterable[str] = (), max_distance: int = 2):
+        """Index the words of the questions."""
+        self.max_distance = max_distance
+        self._frequencies: Counter = Counter()
+        self._index: Dict[str, List[str]] = {}
+        self._corrections: LRUCache = LRUCache(maxsize=CORRECTION_CACHE_SIZE)
+        self._cache_lock = threading.Lock()
+
+        started = time.perf_counter()
+        self.add_words(questions)
+        logger.info(
+            f"Indexed {len(self._frequencies)} words for spelling correction "
+            f"({len(self._index)} keys) in {time.perf_counter() - started:.2f}s"
+        )
+
+    def __len__(self) -> int:
+        return len(self._frequencies)
+
+    def memory_usage(self, sample: int = DEFAULT_SAMPLE) -> Dict[str, int]:
+        """Bytes of the words and their delete index, estimated from samples.
+
+        The index's lists hold the words themselves, so only the lists count
+        towards it. Callers must not add words meanwhile.
+        """
+        return {
+            "spelling_words": mapping_bytes(self._frequencies, sample),
+            "spelling_index": mapping_bytes(self._index, sample, deep=False),
+        }
+
+    def add_words(self, questions: Iterable[str]) -> None:
+        """Index the words of more questions."""
+        for question in questions:
+            for word in set(tokenize(question)):
+                if word not in self._frequencies:
+                    self._insert(word)
+                self._frequencies[word] += 1
+        with self._cache_lock:
+            # New words can be closer to a token than its cached correction
+            self._corrections.clear()
+
+    def _insert(self, word: str) -> None:
+        prefix = word[:PREFIX_LENGTH]
+        for key in deletes(prefix, self.max_distance) | {prefix}:
+            self._index.setdefault(key, []).append(word)
+
+    def _allowed_distance(self, token: str) -> int:
+        if len(token) <= 2 or not token.isalpha():
+            return 0
+        return 1 if len(token) <= 4 else self.max_distance
+
+    def lookup(self, token: str) -> Optional[str]:
+        """The known word closest to a normalized token, None if none is close."""
+        if token in self._frequencies:
+            return token
+        with self._cache_lock:
+            if token in self._corrections:
+                return self._corrections[token]
+
+        correction = self._closest(token)
+        with self._cache_lock:
+            self._corrections[token] = correction
+        return correction
+
+    def _closest(self, token: str) -> Optional[str]:
+        max_distance = self._allowed_distance(token)
+        if max_distance == 0:
+            return None
+
+        prefix = token[:PREFIX_LENGTH]
+        candidates: Set[str] = set()
+        for key in deletes(prefix, max_distance) | {prefix}:
+            candidates.update(self._index.get(key, ()))
+
+        best, best_rank = None, None
+        for word in candidates:
+            distance = edit_distance(token, word, max_distance)
+            if distance > max_distance:
+                continue
+            rank = (distance, -self._frequencies[word], word)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = word, rank
+        return best
+
+    def correct(self, text: str) -> Optional[str]:
+        """The text's tokens with unknown ones corrected, None if nothing changed."""
+        tokens = tokenize(text)
+        corrected = [self.lookup(token) or token for token in tokens]
+        if corrected == tokens:
+            return None
+        return " ".join(corrected)
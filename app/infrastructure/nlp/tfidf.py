@@ -0,0 +1,455 @@
+"""TF-IDF question index with incremental additions."""
+# Standard library imports
+import logging
+import os
+import tempfile
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Third-party imports
+import numpy as np
+import scipy.sparse as sp
+
+# Local application imports
+from app.core.memory import DEFAULT_SAMPLE, mapping_bytes
+from app.infrastructure.nlp.analyzer import build_analyzer, tokenize
+from app.infrastructure.nlp.postings import PostingMatrix
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the dense score block built per batch (rows x questions)
+MAX_BATCH_SCORES = 2_000_000
+
+MODEL_FORMAT_VERSION = 1
+
+
+class TfidfMatcher:
+    """Scores messages against questions by TF-IDF cosine similarity.
+
+    The initial build reproduces ``TfidfVectorizer(strip_accents='unicode',
+    ngram_range=(1, 2))`` exactly. Document frequencies are kept alongside the
+    matrix so that new questions can be appended as a separate row segment,
+    growing the vocabulary for unseen terms, in time proportional to the added
+    text. Query IDF weights are computed from the live counts; rows of earlier
+    segments keep the weights they were built with until ``compact`` merges all
+    segments and reweights them, which runs in the background once enough rows
+    have been added.
+
+    Each segment is scored from posting lists (see ``PostingMatrix``) whose
+    values are stored as ``dtype``: float64 by default, or float32, uint16 or
+    uint8 to shrink the matrix at the cost of ties between near-equal scores.
+    The term counts that compaction, ``save`` and ``question_vectors`` need are
+    stored with the postings, one small integer each, and rebuilt on demand.
+
+    Readers never lock: segments are published as a new tuple and the vocabulary
+    only ever gains keys, after the arrays they index into have been grown.
+
+    Fitting uses scikit-learn, imported on first use; a model written by ``save``
+    is served by ``load`` with NumPy and SciPy only.
+    """
+
+    KIND = "tfidf"
+
+    def __init__(
+        self,
+        questions: Sequence[str],
+        compaction_ratio: float = 0.25,
+        dtype: str = "float64"
+    ):
+        """Fit the vocabulary and question matrix on the initial questions."""
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        analyze = build_analyzer((1, 2))
+        vectorizer = CountVectorizer(analyzer=analyze)
+        counts = vectorizer.fit_transform(questions).tocsr()
+        self._setup(vectorizer.vocabulary_, counts, compaction_ratio, dtype)
+
+    def _setup(
+        self,
+        vocabulary: Dict[str, int],
+        counts: sp.csr_matrix,
+        compaction_ratio: float,
+        dtype: str = "float64"
+    ) -> None:
+        self._analyze = build_analyzer((1, 2))
+        self.vocabulary: Dict[str, int] = vocabulary
+        self.dtype = dtype
+
+        n_features = counts.shape[1]
+        self._df = np.zeros(max(n_features, 16), dtype=np.int64)
+        self._df[:n_features] = np.bincount(counts.indices, minlength=n_features)
+        self._n_docs = counts.shape[0]
+
+        self._segments: Tuple[PostingMatrix, ...] = (self._postings(counts),)
+
+        self.compaction_ratio = compaction_ratio
+        self._compacted_docs = self._n_docs
+        self._write_lock = threading.Lock()
+        self._compaction_lock = threading.Lock()
+        self._compacting = False
+
+    @property
+    def n_documents(self) -> int:
+        return self._n_docs
+
+    @property
+    def n_features(self) -> int:
+        """Width of the feature space, here the size of the vocabulary."""
+        return len(self.vocabulary)
+
+    @property
+    def question_vectors(self) -> sp.csr_matrix:
+        """TF-IDF rows of all questions, weighted with the current IDF."""
+        return self._weigh(self._merged_counts())
+
+    def _merged_counts(
+        self, segments: Optional[Tuple[PostingMatrix, ...]] = None
+    ) -> sp.csr_matrix:
+        """Term counts of the given segments (all by default), as one matrix."""
+        with self._write_lock:
+            if segments is None:
+                segments = self._segments
+            width = self.n_features
+        counts = [_with_width(segment.counts(), width) for segment in segments]
+        return counts[0] if len(counts) == 1 else sp.vstack(counts, format="csr")
+
+    @property
+    def matrix_nbytes(self) -> int:
+        """Bytes held by the scoring matrix of all segments."""
+        return sum(segment.nbytes for segment in self._segments)
+
+    def memory_usage(self, sample: int = DEFAULT_SAMPLE) -> Dict[str, int]:
+        """Bytes of the vocabulary, estimated from a sample, and of the arrays.
+
+        Callers must not add documents meanwhile.
+        """
+        return {
+            "vocabulary": mapping_bytes(self.vocabulary, sample),
+            "matrix": self.matrix_nbytes,
+            "term_counts": sum(segment.counts_nbytes for segment in self._segments),
+            "document_frequencies": self._df.nbytes,
+        }
+
+    @property
+    def idf(self) -> np.ndarray:
+        """Current IDF weight of every feature."""
+        return self._idf(np.arange(self.n_features))
+
+    def _idf(self, indices: np.ndarray) -> np.ndarray:
+        """Smoothed IDF of the given features from the live document counts."""
+        return np.log((1 + self._n_docs) / (1 + self._df[indices])) + 1
+
+    def _weigh(self, counts: sp.csr_matrix) -> sp.csr_matrix:
+        """Turn a count matrix into L2-normalized TF-IDF rows sharing its structure."""
+        data = counts.data * self._idf(counts.indices)
+        row_ids = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+        norms = np.sqrt(
+            np.bincount(row_ids, weights=data ** 2, minlength=counts.shape[0])
+        )
+        norms[norms == 0] = 1.0
+        data /= norms[row_ids]
+        return sp.csr_matrix((data, counts.indices, counts.indptr), shape=counts.shape)
+
+    def _postings(self, counts: sp.csr_matrix) -> PostingMatrix:
+        """Scoring matrix of a count matrix, in the configured dtype."""
+        return PostingMatrix(self._weigh(counts), self.dtype, counts)
+
+    def _count_row(self, text: str) -> Tuple[List[int], List[int]]:
+        """Count the known features of a text, in the analyzer's feature order.
+
+        Tokens are looked up once each, and a bigram only when both of its words
+        are known: every bigram of the vocabulary comes from a question that
+        also contributed its two words.
+        """
+        vocabulary = self.vocabulary
+        tokens = tokenize(text)
+        known = [vocabulary.get(token) for token in tokens]
+        counter: Counter = Counter(index for index in known if index is not None)
+        for i in range(len(tokens) - 1):
+            if known[i] is not None and known[i + 1] is not None:
+                index = vocabulary.get(f"{tokens[i]} {tokens[i + 1]}")
+                if index is not None:
+                    counter[index] += 1
+        return list(counter.keys()), list(counter.values())
+
+    def transform(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """Vectorize texts into L2-normalized TF-IDF rows."""
+        indices, data, indptr = [], [], [0]
+        for text in texts:
+            row_indices, row_counts = self._count_row(text)
+            indices.extend(row_indices)
+            data.extend(row_counts)
+            indptr.append(len(indices))
+
+        counts = sp.csr_matrix(
+            (
+                np.asarray(data, dtype=np.float64),
+                np.asarray(indices, dtype=np.int32),
+                indptr
+            ),
+            shape=(len(indptr) - 1, self.n_features)
+        )
+        return self._weigh(counts)
+
+    def _vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Features and weights of one L2-normalized TF-IDF row, without a matrix.
+
+        The row of ``transform``, for the single-message path where building and
+        weighing a sparse matrix would cost more than the scoring itself.
+        """
+        indices, counts = self._count_row(text)
+        features = np.asarray(indices, dtype=np.int32)
+        weights = np.asarray(counts, dtype=np.float64) * self._idf(features)
+        norm = np.sqrt(np.dot(weights, weights))
+        if norm:
+            weights /= norm
+        return features, weights
+
+    def _row_scores(
+        self,
+        segments: Tuple[PostingMatrix, ...],
+        features: np.ndarray,
+        weights: np.ndarray
+    ) -> np.ndarray:
+        """Cosine similarities of one row against the questions of all segments."""
+        if len(segments) == 1:
+            return segments[0].scores(features, weights)
+        return np.concatenate(
+            [segment.scores(features, weights) for segment in segments]
+        )
+
+    def _similarities(self, vectors: sp.csr_matrix) -> np.ndarray:
+        """Dense (len(vectors) x n_documents) cosine similarities."""
+        segments = self._segments
+        similarities = np.empty(
+            (vectors.shape[0], sum(segment.shape[0] for segment in segments))
+        )
+        for row in range(vectors.shape[0]):
+            start, end = vectors.indptr[row], vectors.indptr[row + 1]
+            similarities[row] = self._row_scores(
+                segments, vectors.indices[start:end], vectors.data[start:end]
+            )
+        return similarities
+
+    def score(self, text: str) -> np.ndarray:
+        """Cosine similarity of one text against every question."""
+        return self._row_scores(self._segments, *self._vectorize(text))
+
+    def best_matches(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Index and score of the best question for each text."""
+        vectors = self.transform(texts)
+        step = max(1, MAX_BATCH_SCORES // max(1, self._n_docs))
+
+        best_indices, best_scores = [], []
+        for start in range(0, vectors.shape[0], step):
+            similarities = self._similarities(vectors[start:start + step])
+            indices = similarities.argmax(axis=1)
+            best_indices.append(indices)
+            best_scores.append(similarities[np.arange(len(indices)), indices])
+
+        if not best_indices:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        return np.concatenate(best_indices), np.concatenate(best_scores)
+
+    def add_documents(self, texts: Sequence[str]) -> None:
+        """Append questions without refitting the existing rows."""
+        if not texts:
+            return
+
+        with self._write_lock:
+            counts, new_terms = self._count_new(texts)
+
+            # Grow the counts before publishing the new vocabulary entries so that
+            # concurrent readers never look up a feature without a count.
+            width = counts.shape[1]
+            if width > len(self._df):
+                grown = np.zeros(max(width, 2 * len(self._df)), dtype=np.int64)
+                grown[:len(self._df)] = self._df
+                self._df = grown
+            np.add.at(self._df, counts.indices, 1)
+            self._n_docs += len(texts)
+            if new_terms:
+                self.vocabulary.update(new_terms)
+
+            self._segments = self._segments + (self._postings(counts),)
+
+            logger.debug(
+                f"Added {len(texts)} documents and {len(new_terms)} new terms "
+                f"({len(self._segments)} segments)"
+            )
+
+            should_compact = (
+                not self._compacting
+                and self._n_docs - self._compacted_docs
+                > self.compaction_ratio * self._compacted_docs
+            )
+            if should_compact:
+                self._compacting = True
+
+        if should_compact:
+            threading.Thread(
+                target=self.compact, name="tfidf-compaction", daemon=True
+            ).start()
+
+    def _count_new(
+        self, texts: Sequence[str]
+    ) -> Tuple[sp.csr_matrix, Dict[str, int]]:
+        """Count the features of new texts, numbering unseen terms after the rest.
+
+        Returns the counts and the unseen terms, which the caller publishes.
+        """
+        new_terms: Dict[str, int] = {}
+        next_index = len(self.vocabulary)
+        indices, data, indptr = [], [], [0]
+
+        for text in texts:
+            counter = Counter()
+            for feature in self._analyze(text):
+                index = self.vocabulary.get(feature)
+                if index is None:
+                    index = new_terms.get(feature)
+                if index is None:
+                    index = new_terms[feature] = next_index
+                    next_index += 1
+                counter[index] += 1
+            indices.extend(counter.keys())
+            data.extend(counter.values())
+            indptr.append(len(indices))
+
+        counts = sp.csr_matrix(
+            (
+                np.asarray(data, dtype=np.int32),
+                np.asarray(indices, dtype=np.int32),
+                indptr
+            ),
+            shape=(len(texts), next_index)
+        )
+        return counts, new_terms
+
+    def save(self, path: str, fingerprint: str = "") -> None:
+        """Write the model to a ``.npz`` file, atomically.
+
+        ``fingerprint`` identifies the questions the model was built from, so
+        that ``load`` can reject a model that no longer matches them.
+        """
+        with self._write_lock:
+            segments = self._segments
+            fields = self._model_fields()
+
+        merged = self._merged_counts(segments)
+        write_model(
+            path,
+            version=MODEL_FORMAT_VERSION,
+            kind=np.array(self.KIND),
+            fingerprint=np.array(fingerprint),
+            data=merged.data,
+            indices=merged.indices,
+            indptr=merged.indptr,
+            shape=np.array(merged.shape),
+            **fields,
+        )
+
+    def _model_fields(self) -> Dict[str, np.ndarray]:
+        """Arrays that ``save`` writes besides the counts, here the vocabulary."""
+        return {"terms": encode_terms(self.vocabulary)}
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        fingerprint: Optional[str] = None,
+        compaction_ratio: float = 0.25,
+        dtype: str = "float64"
+    ) -> Optional["TfidfMatcher"]:
+        """Load a model written by ``save``.
+
+        Returns None if it has another format version, or another fingerprint
+        than the given one.
+        """
+        with np.load(path, allow_pickle=False) as model:
+            if int(model["version"]) != MODEL_FORMAT_VERSION:
+                return None
+            if str(model.get("kind", "tfidf")) != "tfidf":
+                return None
+            if fingerprint is not None and str(model["fingerprint"]) != fingerprint:
+                return None
+
+            terms = decode_terms(model["terms"])
+            counts = read_counts(model)
+
+        matcher = cls.__new__(cls)
+        matcher._setup(
+            dict(zip(terms, range(len(terms)))), counts, compaction_ratio, dtype
+        )
+        return matcher
+
+    def compact(self) -> None:
+        """Merge all row segments and reweight them with the current IDF."""
+        with self._compaction_lock:
+            try:
+                self._merge_segments()
+            finally:
+                self._compacting = False
+
+    def _merge_segments(self) -> None:
+        with self._write_lock:
+            segments = self._segments
+
+        merged_counts = self._merged_counts(segments)
+        merged = self._postings(merged_counts)
+
+        with self._write_lock:
+            # Segments appended while merging stay as they are
+            merged_segments = len(segments)
+            self._segments = (merged,) + self._segments[merged_segments:]
+            self._compacted_docs = merged_counts.shape[0]
+        logger.info(f"Compacted TF-IDF index to {merged_counts.shape[0]} rows")
+
+
+def read_counts(model) -> sp.csr_matrix:
+    """Count matrix stored by ``TfidfMatcher.save`` in a loaded ``.npz`` file."""
+    return sp.csr_matrix(
+        (model["data"], model["indices"], model["indptr"]),
+        shape=tuple(model["shape"])
+    )
+
+
+def write_model(path: str, **arrays: np.ndarray) -> None:
+    """Write arrays to an uncompressed ``.npz`` file, replacing it atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def encode_terms(vocabulary: Dict[str, int]) -> np.ndarray:
+    """Pack a vocabulary into one UTF-8 byte array, terms in index order."""
+    terms = [""] * len(vocabulary)
+    for term, index in vocabulary.items():
+        terms[index] = term
+    # Features never contain newlines
+    return np.frombuffer("\n".join(terms).encode("utf-8"), np.uint8)
+
+
+def decode_terms(blob: np.ndarray) -> List[str]:
+    """Unpack the terms packed by ``encode_terms``."""
+    text = blob.tobytes().decode("utf-8")
+    return text.split("\n") if text else []
+
+
+def _with_width(matrix: sp.csr_matrix, width: int) -> sp.csr_matrix:
+    """Return the matrix with exactly ``width`` columns, dropping or padding columns."""
+    if matrix.shape[1] == width:
+        return matrix
+    if matrix.shape[1] > width:
+        return matrix[:, :width]
+    return sp.csr_matrix(
+        (matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width)
+    )
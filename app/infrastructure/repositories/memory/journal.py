@@ -0,0 +1,306 @@
+"""Snapshot plus append-only journal persistence for the in-memory session store.
+
+Every change to the store is recorded as an event: a length-prefixed pickle
+frame appended to a buffer that a background thread writes to the current
+journal file every ``flush_interval`` seconds. Every ``snapshot_interval``
+seconds the thread also captures the whole store, switching to a new journal
+file at the same moment, writes the capture as a snapshot and removes the
+journal files it covers. Restoring loads the snapshot and replays the journal
+files written after it; a frame torn by a crash ends the replay of its file.
+
+Files are only ever read back by the process that wrote them (or its
+successor), from a directory it owns; pickle must not be used on files from
+anywhere else. One process at a time holds the directory, through an
+exclusive lock on ``LOCK_FILE``.
+"""
+# Standard library imports
+import logging
+import os
+import pickle
+import re
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.bin"
+LOCK_FILE = "journal.lock"
+SNAPSHOT_MAGIC = b"CBSS"
+SNAPSHOT_VERSION = 1
+
+_JOURNAL_NAME = re.compile(r"^journal-(\d{10})\.log$")
+_FRAME = struct.Struct("<I")
+_SNAPSHOT_HEADER = struct.Struct("<4sHQ")
+
+# Events, as tuples: (CREATE, session_id, session), (APPEND, session_id, turn,
+# at), (UPDATE, session_id, data, at), (DELETE, session_id)
+CREATE = "c"
+APPEND = "t"
+UPDATE = "u"
+DELETE = "d"
+
+Capture = Callable[[], Tuple[List[Dict[str, Any]], int]]
+
+
+class JournalLockedError(RuntimeError):
+    """The journal directory is already used by another process."""
+
+
+def apply_event(sessions: Dict[str, Dict[str, Any]], event: Tuple) -> None:
+    """Replay one event onto a sessions dictionary."""
+    kind, session_id = event[0], event[1]
+    if kind == CREATE:
+        sessions[session_id] = event[2]
+    elif kind == DELETE:
+        sessions.pop(session_id, None)
+    else:
+        session = sessions.get(session_id)
+        if session is None:
+            return
+        if kind == APPEND:
+            session.setdefault("conversation_history", []).append(event[2])
+        else:
+            session.update(event[2])
+        session["last_activity"] = event[3]
+
+
+def _journal_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f"journal-{generation:010d}.log")
+
+
+def _journal_generations(directory: str) -> List[int]:
+    generations = []
+    for name in os.listdir(directory):
+        match = _JOURNAL_NAME.match(name)
+        if match:
+            generations.append(int(match.group(1)))
+    return sorted(generations)
+
+
+class SessionJournal:
+    """Durability layer of ``InMemorySessionRepository``."""
+
+    def __init__(
+        self,
+        directory: str,
+        flush_interval: float = 1.0,
+        snapshot_interval: float = 300.0,
+        fsync: bool = False
+    ):
+        """Configure the journal; nothing is opened until ``restore``."""
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+
+        self._buffer: List[bytes] = []
+        self._buffer_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._file = None
+        self._lock_file = None
+        self._generation = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+
+    # ---- Restoring ----
+
+    def restore(self) -> Dict[str, Dict[str, Any]]:
+        """Lock the directory, rebuild the sessions and open a new journal file.
+
+        Raises ``JournalLockedError`` if another process holds the directory.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._acquire_directory()
+
+        started = time.perf_counter()
+        sessions, generation = self._read_snapshot()
+        replayed = 0
+        generations = [
+            journal for journal in _journal_generations(self.directory)
+            if journal >= generation
+        ]
+        for journal_generation in generations:
+            replayed += self._replay(journal_generation, sessions)
+
+        self._generation = max([generation] + generations) + 1
+        self._file = open(_journal_path(self.directory, self._generation), "ab")
+        logger.info(
+            f"Restored {len(sessions)} sessions from {self.directory} "
+            f"({replayed} journal events) in {time.perf_counter() - started:.2f}s"
+        )
+        return sessions
+
+    def _acquire_directory(self) -> None:
+        self._lock_file = open(os.path.join(self.directory, LOCK_FILE), "a+b")
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as e:
+            self._lock_file.close()
+            self._lock_file = None
+            raise JournalLockedError(
+                f"Session journal {self.directory} is used by another process"
+            ) from e
+
+    def _read_snapshot(self) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """Sessions of the snapshot and the first journal generation after it."""
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        try:
+            with open(path, "rb") as f:
+                magic, version, generation = _SNAPSHOT_HEADER.unpack(
+                    f.read(_SNAPSHOT_HEADER.size)
+                )
+                if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                    raise ValueError(f"unsupported snapshot format {magic!r} {version}")
+                sessions = pickle.load(f)
+        except FileNotFoundError:
+            return {}, 0
+        return {session["id"]: session for session in sessions}, generation
+
+    def _replay(self, generation: int, sessions: Dict[str, Dict[str, Any]]) -> int:
+        path = _journal_path(self.directory, generation)
+        with open(path, "rb") as f:
+            data = f.read()
+
+        offset, events = 0, 0
+        while offset + _FRAME.size <= len(data):
+            (length,) = _FRAME.unpack_from(data, offset)
+            end = offset + _FRAME.size + length
+            if end > len(data):
+                break
+            apply_event(sessions, pickle.loads(data[offset + _FRAME.size:end]))
+            offset, events = end, events + 1
+
+        if offset != len(data):
+            logger.warning(
+                f"Ignoring {len(data) - offset} bytes of a torn frame at the end of "
+                f"{path}"
+            )
+        return events
+
+    # ---- Recording ----
+
+    def record(self, event: Tuple) -> None:
+        """Buffer one event; it reaches the file at the next flush."""
+        frame = pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._buffer_lock:
+            self._buffer.append(_FRAME.pack(len(frame)))
+            self._buffer.append(frame)
+
+    def flush(self) -> None:
+        """Write the buffered events to the current journal file."""
+        with self._file_lock:
+            self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        with self._buffer_lock:
+            buffer, self._buffer = self._buffer, []
+        if not buffer or self._file is None:
+            return
+        self._file.write(b"".join(buffer))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def rotate(self) -> int:
+        """Switch to a new journal file and return its generation.
+
+        Must be called while no event can be recorded, that is under the lock
+        the store records its events under, so that every event before the
+        switch is in the old files and every event after it in the new one.
+        """
+        with self._file_lock:
+            self._write_buffer()
+            self._file.close()
+            self._generation += 1
+            self._file = open(_journal_path(self.directory, self._generation), "ab")
+            return self._generation
+
+    # ---- Snapshots ----
+
+    def write_snapshot(self, sessions: List[Dict[str, Any]], generation: int) -> None:
+        """Write a snapshot covering every journal file before ``generation``."""
+        started = time.perf_counter()
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(
+                    _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, generation)
+                )
+                pickle.dump(sessions, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(temp_path, os.path.join(self.directory, SNAPSHOT_FILE))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        for old in _journal_generations(self.directory):
+            if old < generation:
+                os.unlink(_journal_path(self.directory, old))
+        logger.info(
+            f"Wrote snapshot of {len(sessions)} sessions "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def snapshot(self, capture: Capture) -> None:
+        """Capture the store and write it as a snapshot."""
+        sessions, generation = capture()
+        self.write_snapshot(sessions, generation)
+
+    # ---- Background thread ----
+
+    def start(self, capture: Capture) -> None:
+        """Flush and snapshot periodically in a background thread."""
+        if self._thread is not None:
+            return
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(capture, self._stop),
+            name="session-journal",
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, capture: Capture, stop: threading.Event) -> None:
+        next_snapshot = time.monotonic() + self.snapshot_interval
+        while not stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                if self.snapshot_interval > 0 and time.monotonic() >= next_snapshot:
+                    self.snapshot(capture)
+                    next_snapshot = time.monotonic() + self.snapshot_interval
+            except Exception:
+                logger.exception("Session journal maintenance failed")
+
+    def close(self, capture: Optional[Capture] = None) -> None:
+        """Stop the thread, flush, optionally write a final snapshot and unlock."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        if self._file is None:
+            return
+        if capture is not None:
+            self.snapshot(capture)
+        self.flush()
+        with self._file_lock:
+            self._file.close()
+            self._file = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
@@ -1,27 +1,86 @@
 """In-memory session repository implementation."""
 # Standard library imports
 import logging
+import random
+import sys
+import threading
+from bisect import bisect_left
 from datetime import datetime
-from uuid import uuid4
-from typing import Dict, Optional
-
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+# Local application imports
+from app.core.memory import DEFAULT_SAMPLE, deep_sizeof
+from app.domain.entities.session import new_session_id
 from app.domain.repositories.session import SessionRepositoryInterface
+from app.infrastructure.repositories.memory.journal import (
+    APPEND,
+    CREATE,
+    DELETE,
+    UPDATE,
+    SessionJournal,
+)
+from app.infrastructure.repositories.memory.stats import SessionStats
+
 
 logger = logging.getLogger(__name__)
 
+# Turns sized per sampled session by ``get_memory_usage``
+TURNS_SAMPLED = 8
+
 
 class InMemorySessionRepository(SessionRepositoryInterface):
-    """In-memory implementation of session repository."""
+    """In-memory implementation of session repository.
+
+    With a ``SessionJournal``, sessions are restored from it on creation and
+    every change is recorded to it, so that they survive restarts. Reads that
+    only refresh ``last_activity`` are not recorded.
+
+    Sessions are also kept in creation order with increasing sequence numbers,
+    which scans resume from, and ``SessionStats`` follows every change.
+    """
     
-    def __init__(self):
-        """Initialize with empty sessions dictionary."""
-        self._sessions: Dict[str, Dict] = {}
+    def __init__(self, journal: Optional[SessionJournal] = None):
+        """Initialize with empty sessions dictionary, or the journal's sessions."""
+        self._lock = threading.Lock()
+        self._journal = journal
+        self._sessions: Dict[str, Dict] = journal.restore() if journal else {}
+
+        self._stats = SessionStats()
+        self._scan_ids: List[str] = []
+        self._scan_seqs: List[int] = []
+        restored = sorted(self._sessions.values(), key=lambda s: s["created_at"])
+        for session in restored:
+            self._index(session)
         logger.info("InMemorySessionRepository initialized")
 
-    def create_session(self, language: str = "en") -> str:
-        """Create a new session and return session ID."""
-        session_id = str(uuid4())
+    def _index(self, session: Dict) -> None:
+        """Count a session and give it the next place in scan order."""
+        self._stats.add(session)
+        seq = self._scan_seqs[-1] + 1 if self._scan_seqs else 0
+        # Ids first: scans read up to the length of the sequence list
+        self._scan_ids.append(session["id"])
+        self._scan_seqs.append(seq)
+
+    def _unindex(self, session: Dict) -> None:
+        """Stop counting a session; its scan entry is dropped at the next compaction."""
+        self._stats.remove(session)
+        if len(self._scan_ids) > 2 * len(self._sessions) + 64:
+            live = [
+                (seq, session_id)
+                for seq, session_id in zip(self._scan_seqs, self._scan_ids)
+                if session_id in self._sessions
+            ]
+            # New lists, so that running scans keep reading the old ones
+            self._scan_ids = [session_id for _, session_id in live]
+            self._scan_seqs = [seq for seq, _ in live]
+
+    def _record(self, event: Tuple) -> None:
+        if self._journal is not None:
+            self._journal.record(event)
+
+    def create_session(self, language: str = "en", shard: Optional[int] = None) -> str:
+        """Create a new session, in a shard if given, and return session ID."""
+        session_id = new_session_id(shard)
         session_data = {
             "id": session_id,
             "language": language,
@@ -30,16 +89,35 @@ class InMemorySessionRepository(SessionRepositoryInterface):
             "last_activity": datetime.now()
         }
         
-        self._sessions[session_id] = session_data
+        with self._lock:
+            self._sessions[session_id] = session_data
+            self._index(session_data)
+            self._record((CREATE, session_id, session_data))
         logger.debug(f"Session created: {session_id} with language {language}")
         return session_id
 
+    def import_session(self, session: Dict) -> None:
+        """Store a session handed over by another node, replacing any same id."""
+        session_id = session["id"]
+        with self._lock:
+            previous = self._sessions.pop(session_id, None)
+            if previous is not None:
+                self._unindex(previous)
+            self._sessions[session_id] = session
+            self._index(session)
+            self._record((CREATE, session_id, session))
+        logger.debug(f"Session imported: {session_id}")
+
     def get_session(self, session_id: str) -> Optional[Dict]:
         """Get session by ID."""
         session = self._sessions.get(session_id)
         if session:
             # Update last activity
-            session["last_activity"] = datetime.now()
+            now = datetime.now()
+            with self._lock:
+                if self._sessions.get(session_id) is session:
+                    self._stats.touch(session["last_activity"], now)
+                    session["last_activity"] = now
             logger.debug(f"Session retrieved: {session_id}")
         else:
             logger.debug(f"Session not found: {session_id}")
@@ -47,38 +125,131 @@ class InMemorySessionRepository(SessionRepositoryInterface):
 
     def update_session(self, session_id: str, data: Dict) -> bool:
         """Update session data."""
-        if session_id not in self._sessions:
-            logger.warning(f"Cannot update non-existent session: {session_id}")
-            return False
-        
-        self._sessions[session_id].update(data)
-        self._sessions[session_id]["last_activity"] = datetime.now()
+        with self._lock:
+            if session_id not in self._sessions:
+                logger.warning(f"Cannot update non-existent session: {session_id}")
+                return False
+            
+            now = datetime.now()
+            session = self._sessions[session_id]
+            language = session.get("language")
+            turns = len(session.get("conversation_history", ()))
+            self._stats.touch(session["last_activity"], now)
+            session.update(data)
+            session["last_activity"] = now
+            self._stats.change_language(language, session.get("language"))
+            self._stats.turns += len(session.get("conversation_history", ())) - turns
+            self._record((UPDATE, session_id, data, now))
         logger.debug(f"Session updated: {session_id}")
         return True
 
+    def append_turn(self, session_id: str, turn: Dict) -> bool:
+        """Append one exchange to a session's history."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                logger.warning(f"Cannot append to non-existent session: {session_id}")
+                return False
+            
+            now = datetime.now()
+            session.setdefault("conversation_history", []).append(turn)
+            self._stats.touch(session["last_activity"], now)
+            self._stats.turns += 1
+            session["last_activity"] = now
+            self._record((APPEND, session_id, turn, now))
+        return True
+
     def delete_session(self, session_id: str) -> bool:
         """Delete session."""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
-            logger.debug(f"Session deleted: {session_id}")
-            return True
+        with self._lock:
+            if session_id in self._sessions:
+                session = self._sessions.pop(session_id)
+                self._unindex(session)
+                self._record((DELETE, session_id))
+                logger.debug(f"Session deleted: {session_id}")
+                return True
         
         logger.warning(f"Cannot delete non-existent session: {session_id}")
         return False
     
-    def get_all_sessions(self) -> Dict[str, Dict]:
-        """Get all sessions (for debugging)."""
-        logger.debug(f"Retrieved all sessions: {len(self._sessions)} total")
-        return self._sessions.copy()
+    def get_history(
+        self, session_id: str, start: int = 0, limit: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """Get a range of a session's turns, copying only the range."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        history = session.get("conversation_history", [])
+        end = None if limit is None else start + limit
+        return history[start:end]
+    
+    def scan_sessions(self, cursor: int = 0) -> Iterator[Tuple[int, Dict]]:
+        """Iterate over sessions in creation order, from a scan cursor.
+
+        Each session comes with the cursor that resumes the scan after it.
+        Nothing is copied: sessions are read one at a time from the live store,
+        so sessions created during the scan are reached and deleted ones skipped.
+        """
+        seqs, ids = self._scan_seqs, self._scan_ids
+        position = bisect_left(seqs, cursor)
+        while position < len(seqs):
+            session = self._sessions.get(ids[position])
+            if session is not None:
+                yield seqs[position] + 1, session
+            position += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counts and histograms maintained as sessions change."""
+        with self._lock:
+            return self._stats.summary()
+    
+    def get_memory_usage(self, sample: int = DEFAULT_SAMPLE) -> Dict[str, int]:
+        """Estimate bytes per session and per turn from a random sample of each.
+
+        Session and turn counts are maintained, so only the sampled sessions,
+        and a few turns of each, are sized.
+        """
+        with self._lock:
+            ids = self._scan_ids
+            picked = random.sample(ids, min(sample, len(ids)))
+            sessions = [self._sessions[i] for i in picked if i in self._sessions]
+            session_bytes = turn_bytes = sampled_turns = 0
+            for session in sessions:
+                history = session.get("conversation_history", [])
+                session_bytes += deep_sizeof(session, exclude={id(history)})
+                session_bytes += sys.getsizeof(history)
+                turns = random.sample(history, min(TURNS_SAMPLED, len(history)))
+                turn_bytes += sum(deep_sizeof(turn) for turn in turns)
+                sampled_turns += len(turns)
+            n_sessions, n_turns = len(self._sessions), self._stats.turns
+            index_bytes = (
+                sys.getsizeof(self._sessions)
+                + sys.getsizeof(self._scan_ids)
+                + sys.getsizeof(self._scan_seqs)
+            )
+
+        return {
+            "sessions": index_bytes + (
+                session_bytes * n_sessions // len(sessions) if sessions else 0
+            ),
+            "histories": (
+                turn_bytes * n_turns // sampled_turns if sampled_turns else 0
+            ),
+        }
     
     def cleanup_expired_sessions(self, max_age_hours: int = 24) -> int:
         """Remove sessions older than max_age_hours."""
         from datetime import timedelta
         
         cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+        with self._lock:
+            oldest = self._stats.oldest_activity()
+        if oldest is None or oldest >= cutoff_time:
+            # No activity minute before the cutoff: nothing to scan for
+            return 0
         expired_sessions = []
         
-        for session_id, session_data in self._sessions.items():
+        for session_id, session_data in list(self._sessions.items()):
             last_activity = session_data.get("last_activity", session_data.get("created_at"))
             if last_activity < cutoff_time:
                 expired_sessions.append(session_id)
@@ -88,3 +259,39 @@ class InMemorySessionRepository(SessionRepositoryInterface):
         
         logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
         return len(expired_sessions)
+
+    def capture_snapshot(self) -> Tuple[List[Dict[str, Any]], int]:
+        """Copy the sessions for a snapshot and start the journal file after it.
+
+        Only references are taken under the lock: each session, its history list
+        and the history's length. The copies are made afterwards, so writers are
+        not held up by a copy of the whole store. Changes made in between are in
+        the new journal file, which is replayed over the snapshot: updates and
+        deletions are replayed idempotently, and histories are cut to the length
+        they had at the rotation, since turns are only ever appended.
+        """
+        with self._lock:
+            captured = [
+                (session, history, len(history))
+                for session in self._sessions.values()
+                for history in [session.get("conversation_history", [])]
+            ]
+            generation = self._journal.rotate()
+
+        sessions = []
+        for session, history, length in captured:
+            copy = dict(session)
+            copy["conversation_history"] = history[:length]
+            sessions.append(copy)
+        return sessions, generation
+
+    def start_journal(self) -> None:
+        """Start flushing the journal and writing snapshots in the background."""
+        if self._journal is not None:
+            self._journal.start(self.capture_snapshot)
+
+    def close_journal(self) -> None:
+        """Flush the journal and write a final snapshot."""
+        if self._journal is not None:
+            self._journal.close(self.capture_snapshot)
+            self._journal = None
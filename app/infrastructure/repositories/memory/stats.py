@@ -0,0 +1,103 @@
+"""Aggregate statistics of the in-memory session store, kept up to date."""
+# Standard library imports
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+# Upper bounds, in seconds, of the age and idle time histogram bins; a last bin
+# holds everything older
+HISTOGRAM_BOUNDS = (60, 300, 900, 3600, 6 * 3600, 24 * 3600)
+
+
+def _minute(moment: datetime) -> int:
+    return int(moment.timestamp()) // 60
+
+
+class SessionStats:
+    """Counts maintained as sessions are created, used, changed and deleted.
+
+    Creation and last activity times are counted per minute, so that reading
+    the age and idle time histograms costs one step per distinct minute, which
+    the session TTL bounds, and never one per session. Ages are measured from
+    the start of their minute.
+    """
+
+    def __init__(self):
+        """Start from an empty store."""
+        self.sessions = 0
+        self.turns = 0
+        self.languages: Counter = Counter()
+        self._created: Counter = Counter()
+        self._active: Counter = Counter()
+
+    def add(self, session: Dict[str, Any]) -> None:
+        """Count a new or restored session."""
+        self.sessions += 1
+        self.turns += len(session.get("conversation_history", ()))
+        self.languages[session.get("language")] += 1
+        self._created[_minute(session["created_at"])] += 1
+        self._active[_minute(session["last_activity"])] += 1
+
+    def remove(self, session: Dict[str, Any]) -> None:
+        """Stop counting a deleted session."""
+        self.sessions -= 1
+        self.turns -= len(session.get("conversation_history", ()))
+        _decrement(self.languages, session.get("language"))
+        _decrement(self._created, _minute(session["created_at"]))
+        _decrement(self._active, _minute(session["last_activity"]))
+
+    def touch(self, previous: datetime, now: datetime) -> None:
+        """Move a session's last activity from ``previous`` to ``now``."""
+        before, after = _minute(previous), _minute(now)
+        if before != after:
+            _decrement(self._active, before)
+            self._active[after] += 1
+
+    def change_language(self, previous: Optional[str], language: Optional[str]) -> None:
+        """Count a session under another language."""
+        if previous != language:
+            _decrement(self.languages, previous)
+            self.languages[language] += 1
+
+    def oldest_activity(self) -> Optional[datetime]:
+        """Start of the minute of the least recent activity, if any session."""
+        if not self._active:
+            return None
+        return datetime.fromtimestamp(min(self._active) * 60)
+
+    def summary(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Counts, languages and the age and idle time histograms."""
+        now = now or datetime.now()
+        return {
+            "total_sessions": self.sessions,
+            "total_turns": self.turns,
+            "languages": {
+                str(language): count for language, count in self.languages.items()
+            },
+            "age_histogram": _histogram(self._created, now),
+            "idle_histogram": _histogram(self._active, now),
+        }
+
+
+def _decrement(counter: Counter, key: Any) -> None:
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+
+
+def _histogram(minutes: Counter, now: datetime) -> List[Dict[str, Any]]:
+    bins = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    current = now.timestamp()
+    for minute, count in minutes.items():
+        elapsed = current - minute * 60
+        index = 0
+        while index < len(HISTOGRAM_BOUNDS) and elapsed > HISTOGRAM_BOUNDS[index]:
+            index += 1
+        bins[index] += count
+
+    bounds: List[Optional[int]] = list(HISTOGRAM_BOUNDS) + [None]
+    return [
+        {"max_seconds": bound, "sessions": count}
+        for bound, count in zip(bounds, bins)
+    ]
@@ -1,14 +1,55 @@
 """FastAPI Chatbot Application - Entry Point."""
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 
-# Load environment variables FIRST
-from dotenv import load_dotenv
-load_dotenv()
+from fastapi import Depends, FastAPI
+from fastapi.middleware.cors import CORSMiddleware
 
+# Environment variables and .env are read by Settings itself
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.api.v1.routes import conversation, health
+from app.api.dependencies import (
+    close_session_repository,
+    get_chatbot_reloader,
+    get_loop_monitor,
+    get_query_log,
+    get_session_repository,
+    require_admin_token,
+    require_cluster_secret,
+)
+from app.api.middleware.bots import BotRoutingMiddleware
+from app.api.middleware.rate_limit import RateLimitMiddleware
+from app.api.v1.routes import (
+    admin,
+    cluster,
+    conversation,
+    conversation_ws,
+    health,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background services."""
+    reloader = get_chatbot_reloader()
+    if settings.CHATBOT_DATA_WATCH:
+        reloader.start_watching(
+            settings.CHATBOT_DATA_PATH,
+            settings.CHATBOT_DATA_WATCH_INTERVAL_SECONDS
+        )
+    if settings.SESSION_JOURNAL_ENABLED:
+        # Restore persisted sessions before the first request
+        get_session_repository()
+    loop_monitor = get_loop_monitor()
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    if settings.QUERY_LOG_ENABLED:
+        get_query_log().start()
+    yield
+    await loop_monitor.stop()
+    if settings.QUERY_LOG_ENABLED:
+        get_query_log().close()
+    reloader.stop_watching()
+    close_session_repository()
 
 
 def create_app() -> FastAPI:
@@ -24,8 +65,33 @@ def create_app() -> FastAPI:
         debug=settings.DEBUG,
         docs_url="/docs",  # ← Forzar docs siempre
         redoc_url="/redoc",  # ← Forzar redoc siempre
+        lifespan=lifespan,
     )
     
+    # Add rate limiting of the conversation routes (inside CORS, so that 429
+    # responses carry CORS headers too)
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(
+            RateLimitMiddleware,
+            prefix=f"{settings.API_V1_PREFIX}/conversations",
+            client_rate=settings.RATE_LIMIT_CLIENT_PER_SECOND,
+            client_burst=settings.RATE_LIMIT_CLIENT_BURST,
+            session_rate=settings.RATE_LIMIT_SESSION_PER_SECOND,
+            session_burst=settings.RATE_LIMIT_SESSION_BURST,
+            max_keys=settings.RATE_LIMIT_MAX_TRACKED_KEYS,
+            log_interval=settings.RATE_LIMIT_LOG_INTERVAL_SECONDS,
+        )
+    
+    # Route requests to their bot (outside rate limiting, so that it sees the
+    # paths without their bot prefix)
+    if settings.BOTS:
+        app.add_middleware(
+            BotRoutingMiddleware,
+            prefix=settings.API_V1_PREFIX,
+            header=settings.BOT_HEADER,
+            bots=settings.BOTS,
+        )
+    
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -39,11 +105,29 @@ def create_app() -> FastAPI:
         conversation.router, 
         prefix=settings.API_V1_PREFIX
     )
+    app.include_router(
+        conversation_ws.router, 
+        prefix=settings.API_V1_PREFIX
+    )
     app.include_router(
         health.router, 
         prefix=settings.API_V1_PREFIX
     )
     
+    if settings.ADMIN_ENABLED:
+        app.include_router(
+            admin.router,
+            prefix=settings.API_V1_PREFIX,
+            dependencies=[Depends(require_admin_token)]
+        )
+    
+    if settings.CLUSTER_NODE_ENABLED:
+        app.include_router(
+            cluster.router,
+            prefix=settings.API_V1_PREFIX,
+            dependencies=[Depends(require_cluster_secret)]
+        )
+    
     # Root endpoint
     @app.get("/")
     async def root():
@@ -57,7 +141,8 @@ def create_app() -> FastAPI:
                 "GET /docs", 
                 "GET /api/v1/health",
                 "POST /api/v1/conversations/start",
-                "POST /api/v1/conversations/{session_id}/messages"
+                "POST /api/v1/conversations/{session_id}/messages",
+                "WS /api/v1/conversations/{session_id}/ws"
             ]
         }
     
@@ -0,0 +1,121 @@
+"""Per-message cost of turning a message into TF-IDF features.
+
+Compares, one message at a time, scikit-learn's ``TfidfVectorizer.transform``,
+the previous request path (the whole message normalized on every call and every
+n-gram looked up as a string), ``TfidfMatcher``'s cached tokenizer with its
+token-to-feature lookup, and the row it scores a single message with, built
+without a sparse matrix; after checking that all of them give the same vectors.
+
+    python -m benchmarks.bench_analyzer --questions 20000 --messages 5000
+    python -m benchmarks.bench_analyzer --dataset path/to/data-bot.json
+"""
+# Standard library imports
+import argparse
+import random
+import time
+from collections import Counter
+from typing import Callable, List
+
+# Third-party imports
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Local application imports
+from app.infrastructure.data.loaders.chatbot_data import compile_file
+from app.infrastructure.nlp.analyzer import TOKEN_PATTERN, strip_accents
+from app.infrastructure.nlp.tfidf import TfidfMatcher
+
+
+WORDS = [
+    "opening", "hours", "café", "crème", "brûlée", "weather", "today", "hvordan",
+    "går", "det", "med", "deg", "address", "where", "when", "joke", "price",
+    "ticket", "refund", "order", "delivery", "øl", "smørbrød", "what", "is", "the",
+]
+
+
+def synthetic_texts(n_texts: int, seed: int) -> List[str]:
+    """Short questions over a small vocabulary with accents and capitals."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n_texts):
+        words = rng.choices(WORDS, k=rng.randint(3, 10))
+        words = [word.capitalize() if rng.random() < 0.2 else word for word in words]
+        texts.append(" ".join(words) + rng.choice(["?", "!", ""]))
+    return texts
+
+
+def previous_count_row(matcher: TfidfMatcher) -> Callable[[str], Counter]:
+    """The request path before the cached tokenizer, for comparison."""
+    vocabulary = matcher.vocabulary
+
+    def count(text: str) -> Counter:
+        tokens = TOKEN_PATTERN.findall(strip_accents(text.lower()))
+        features = tokens + [
+            " ".join(tokens[i:i + 2]) for i in range(len(tokens) - 1)
+        ]
+        return Counter(
+            vocabulary[feature] for feature in features if feature in vocabulary
+        )
+
+    return count
+
+
+def per_message(function: Callable[[str], object], messages: List[str]) -> float:
+    """Best of three runs of the mean time per message, in seconds."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for message in messages:
+            function(message)
+        best = min(best, (time.perf_counter() - started) / len(messages))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=20_000)
+    parser.add_argument("--messages", type=int, default=5_000)
+    parser.add_argument("--dataset", help="Use the questions of a dataset file")
+    args = parser.parse_args()
+
+    if args.dataset:
+        questions = list(compile_file(args.dataset).questions)
+    else:
+        questions = synthetic_texts(args.questions, seed=0)
+    messages = synthetic_texts(args.messages, seed=1)
+
+    vectorizer = TfidfVectorizer(
+        min_df=1, strip_accents='unicode', lowercase=True, ngram_range=(1, 2)
+    ).fit(questions)
+    matcher = TfidfMatcher(questions)
+    previous = previous_count_row(matcher)
+
+    sample = messages[:500]
+    expected = vectorizer.transform(sample).toarray()
+    actual = matcher.transform(sample).toarray()
+    np.testing.assert_allclose(actual, expected, atol=1e-12)
+    for message, row in zip(sample, expected):
+        indices, counts = matcher._count_row(message)
+        assert dict(zip(indices, counts)) == previous(message)
+        features, weights = matcher._vectorize(message)
+        np.testing.assert_allclose(row[features], weights, atol=1e-12)
+        assert np.count_nonzero(row) == len(features)
+    print(f"{len(questions)} questions, {len(messages)} messages: vectors identical")
+
+    results = {
+        "TfidfVectorizer.transform": per_message(
+            lambda message: vectorizer.transform([message]), messages
+        ),
+        "previous features": per_message(previous, messages),
+        "cached features": per_message(matcher._count_row, messages),
+        "TfidfMatcher.transform": per_message(
+            lambda message: matcher.transform([message]), messages
+        ),
+        "TfidfMatcher._vectorize": per_message(matcher._vectorize, messages),
+    }
+    for label, seconds in results.items():
+        print(f"{label:>26}: {seconds * 1e6:8.2f} us/message")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark the message route with and without FAST_JSON_RESPONSES.
+
+Requests are driven straight through the ASGI app, without a server or HTTP
+client, so the numbers show the per-request cost of the application itself.
+
+    python -m benchmarks.bench_message_route --requests 2000
+"""
+# Standard library imports
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import List, Tuple
+
+# Local application imports
+from app.api.dependencies import get_chatbot_service, get_session_repository
+from app.core.config import settings
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.repositories.memory.session import InMemorySessionRepository
+from app.main import app
+
+
+DATASET = {
+    "greetings": [{"replies": {"en": ["Hello! I am a chatbot!"]}}],
+    "dialogues": [
+        {
+            "id": "opening-hours",
+            "samples": {"en": ["What are your opening hours?", "When are you open?"]},
+            "replies": {"en": ["We are open from 9 to 17."]},
+        },
+        {
+            "id": "joke",
+            "samples": {"en": ["Tell me a joke", "Do you know any jokes?"]},
+            "replies": {"en": ["Why did the scarecrow win? Outstanding in his field."]},
+        },
+    ],
+    "fallbacks": [{"replies": {"en": ["I'm sorry, I didn't understand that."]}}],
+}
+
+SESSION_MESSAGES = 20
+
+
+async def _request(path: str, body: bytes) -> Tuple[int, bytes]:
+    """Send one POST request through the ASGI app."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"benchmark"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+    status, chunks = 0, []
+
+    async def receive():
+        return pending.pop() if pending else {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+async def _start_session() -> str:
+    _, body = await _request(f"{settings.API_V1_PREFIX}/conversations/start", b"{}")
+    return json.loads(body)["session_id"]
+
+
+async def _run(body: bytes, requests: int, repository) -> float:
+    """Seconds per message request over ``requests`` sequential requests.
+
+    Messages go to a fresh session every ``SESSION_MESSAGES`` requests, which is
+    deleted afterwards, so that neither the conversation history nor the number
+    of sessions grows during the measurement.
+    """
+    elapsed = 0.0
+    for start in range(0, requests, SESSION_MESSAGES):
+        session_id = await _start_session()
+        path = f"{settings.API_V1_PREFIX}/conversations/{session_id}/messages"
+
+        started = time.perf_counter()
+        for _ in range(min(SESSION_MESSAGES, requests - start)):
+            status, _ = await _request(path, body)
+            if status != 200:
+                raise RuntimeError(f"Unexpected status {status}")
+        elapsed += time.perf_counter() - started
+        repository.delete_session(session_id)
+    return elapsed / requests
+
+
+async def benchmark(requests: int, repeats: int) -> List[Tuple[str, float]]:
+    """Best time per request of each response mode."""
+    repository = InMemorySessionRepository()
+    app.dependency_overrides[get_session_repository] = lambda: repository
+    chatbot = ChatbotService(data=DATASET)
+    app.dependency_overrides[get_chatbot_service] = lambda: chatbot
+    message = json.dumps({"message": "When are you open?"}).encode()
+
+    # Alternate the modes so that drift affects both alike
+    best = {False: float("inf"), True: float("inf")}
+    for repeat in range(repeats + 1):
+        for fast in (False, True):
+            settings.FAST_JSON_RESPONSES = fast
+            seconds = await _run(message, requests, repository)
+            if repeat:  # the first round is a warm-up
+                best[fast] = min(best[fast], seconds)
+
+    settings.FAST_JSON_RESPONSES = False
+    app.dependency_overrides.clear()
+    return [("standard", best[False]), ("fast", best[True])]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    # Keep the routes' logging out of the measurement
+    logging.disable(logging.CRITICAL)
+
+    results = asyncio.run(benchmark(args.requests, args.repeats))
+    for label, seconds in results:
+        print(f"{label:>8}: {seconds * 1e6:8.1f} us/request")
+    saved = results[0][1] - results[1][1]
+    print(f"   saved: {saved * 1e6:8.1f} us/request ({saved / results[0][1]:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Compare the NLP engines on fit time, model memory, latency and agreement.
+
+Model memory is what a fitted matcher keeps allocated, vocabulary included, as
+traced by tracemalloc. Queries are questions of the corpus with one word
+dropped. Agreement counts the queries for which an engine picks a question of
+the same intent as the TF-IDF engine does.
+
+    python -m benchmarks.bench_nlp_engines --questions 50000 --rank 256
+    python -m benchmarks.bench_nlp_engines --engines tfidf --dtypes float32,uint8
+    python -m benchmarks.bench_nlp_engines --dataset path/to/data-bot.json
+"""
+# Standard library imports
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+# Third-party imports
+import numpy as np
+
+# Local application imports
+from app.infrastructure.data.loaders.chatbot_data import compile_file
+from app.infrastructure.nlp.hashing import HashingMatcher
+from app.infrastructure.nlp.lsa import LsaMatcher
+from app.infrastructure.nlp.tfidf import TfidfMatcher
+
+
+VOCABULARY_SIZE = 20_000
+INTENT_SIZE = 20
+
+
+def synthetic_corpus(n_questions: int, seed: int = 0) -> Tuple[List[str], np.ndarray]:
+    """Questions drawn from per-intent word pools with a Zipf-like word frequency."""
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(VOCABULARY_SIZE)]
+    weights = [1.0 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+
+    questions, intents = [], []
+    for intent in range(n_questions // INTENT_SIZE + 1):
+        pool = rng.choices(words, weights, k=12)
+        for _ in range(INTENT_SIZE):
+            questions.append(" ".join(rng.sample(pool, rng.randint(4, 8))))
+            intents.append(intent)
+    return questions[:n_questions], np.asarray(intents[:n_questions])
+
+
+def make_queries(questions: List[str], n_queries: int, seed: int = 1) -> List[str]:
+    """Questions with one word dropped."""
+    rng = random.Random(seed)
+    queries = []
+    for question in rng.sample(questions, min(n_queries, len(questions))):
+        words = question.split()
+        if len(words) > 1:
+            del words[rng.randrange(len(words))]
+        queries.append(" ".join(words))
+    return queries
+
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated by a freshly built matcher once building is done."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        matcher = build()  # noqa: F841 - kept alive while measuring
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def measure(matcher, queries: List[str]) -> Tuple[float, float, np.ndarray]:
+    """Median single-query latency, batch time per query and batch winners."""
+    latencies = []
+    for query in queries[:200]:
+        started = time.perf_counter()
+        matcher.score(query)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    best, _ = matcher.best_matches(queries)
+    batch = (time.perf_counter() - started) / len(queries)
+    return float(np.median(latencies)), batch, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", help="JSON dataset instead of a synthetic one")
+    parser.add_argument("--questions", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--rank", type=int, default=256)
+    parser.add_argument("--n-features", type=int, default=1 << 20)
+    parser.add_argument("--engines", default="tfidf,lsa,hashing")
+    parser.add_argument(
+        "--dtypes", default="",
+        help="Scoring matrix dtypes to compare the TF-IDF engine in, e.g. uint8"
+    )
+    args = parser.parse_args()
+
+    if args.dataset:
+        dataset = compile_file(args.dataset)
+        questions = dataset.questions
+        intents = dataset.intents.question_intents
+    else:
+        questions, intents = synthetic_corpus(args.questions)
+    queries = make_queries(questions, args.queries)
+    print(f"{len(questions)} questions, {len(queries)} queries, rank {args.rank}")
+
+    builders = {
+        "tfidf": lambda: TfidfMatcher(questions),
+        "lsa": lambda: LsaMatcher(questions, rank=args.rank),
+        # Streamed: the hashing engine never needs the list of questions
+        "hashing": lambda: HashingMatcher(
+            (question for question in questions), n_features=args.n_features
+        ),
+    }
+    for dtype in filter(None, args.dtypes.split(",")):
+        builders[f"tfidf-{dtype}"] = (
+            lambda dtype=dtype: TfidfMatcher(questions, dtype=dtype)
+        )
+    requested = args.engines.split(",") + [
+        f"tfidf-{dtype}" for dtype in filter(None, args.dtypes.split(","))
+    ]
+    engines = ["tfidf"] + [
+        name for name in requested if name in builders and name != "tfidf"
+    ]
+
+    results = {}
+    for label in engines:
+        started = time.perf_counter()
+        matcher = builders[label]()
+        fit = time.perf_counter() - started
+        single, batch, best = measure(matcher, queries)
+        results[label] = best
+        del matcher
+        mib = retained_bytes(builders[label]) / 2**20
+        print(
+            f"{label:>13}: fit {fit:6.2f}s, model {mib:7.1f} MiB, "
+            f"single {single * 1e6:8.1f} us, batch {batch * 1e6:7.1f} us/query"
+        )
+
+    for label in engines[1:]:
+        same_question = np.mean(results[label] == results["tfidf"])
+        same_intent = np.mean(intents[results[label]] == intents[results["tfidf"]])
+        print(
+            f"{label:>13} agreement: {same_question:.1%} same question, "
+            f"{same_intent:.1%} same intent"
+        )
+
+
+if __name__ == "__main__":
+    main()
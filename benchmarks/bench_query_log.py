@@ -0,0 +1,65 @@
+"""Measure what the query log adds to answering a message.
+
+Messages are answered without a query log, then with sample rates of 10% and
+100%; the buffered events are then aggregated and written as gzip NDJSON, as
+the background thread would, to time that work per event.
+
+    python -m benchmarks.bench_query_log --questions 5000 --messages 20000
+"""
+# Standard library imports
+import argparse
+import logging
+import random
+import tempfile
+import time
+
+# Local application imports
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.analytics.query_log import QueryLog
+from app.infrastructure.data.loaders.compiler import compile_dataset
+from benchmarks.bench_spelling import synthetic_questions
+
+
+def main() -> None:
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=5_000)
+    parser.add_argument("--messages", type=int, default=20_000)
+    args = parser.parse_args()
+
+    questions = synthetic_questions(args.questions)
+    dialogues = [
+        {"id": f"intent-{i}", "samples": {"en": [question]}, "replies": {"en": ["ok"]}}
+        for i, question in enumerate(questions)
+    ]
+    chatbot = ChatbotService(
+        dataset=compile_dataset({"dialogues": dialogues}, "en")
+    )
+    chatbot.bot = "default"
+    rng = random.Random(2)
+    messages = rng.choices(questions, k=args.messages)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, rate in [("no log", None), ("10%", 0.1), ("100%", 1.0)]:
+            chatbot.query_log = None if rate is None else QueryLog(
+                sample_rate=rate, buffer_size=len(messages), directory=directory
+            )
+            started = time.perf_counter()
+            for message in messages:
+                chatbot.process_message(message)
+            per_message = (time.perf_counter() - started) / len(messages)
+            print(f"{label:>7}: {per_message * 1e6:8.1f} us/message")
+
+        query_log = chatbot.query_log
+        started = time.perf_counter()
+        written = query_log.flush()
+        query_log.close()
+        elapsed = time.perf_counter() - started
+        print(
+            f"  flush: {elapsed / written * 1e6:8.1f} us/event in the background "
+            f"({written} events)"
+        )
+
+
+if __name__ == "__main__":
+    main()
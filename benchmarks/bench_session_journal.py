@@ -0,0 +1,76 @@
+"""Measure the session journal: restore time and per-operation overhead.
+
+Restore time is measured for a store of ``--sessions`` sessions, once from a
+snapshot and once from journal files only. The overhead is the time of creating
+a session and appending turns to it, with and without a journal, the buffer
+being flushed in the background as in the application.
+
+    python -m benchmarks.bench_session_journal --sessions 100000 --turns 4
+"""
+# Standard library imports
+import argparse
+import logging
+import tempfile
+import time
+
+# Local application imports
+from app.domain.services.session import SessionService
+from app.infrastructure.repositories.memory.journal import SessionJournal
+from app.infrastructure.repositories.memory.session import InMemorySessionRepository
+
+
+def fill(repository: InMemorySessionRepository, sessions: int, turns: int) -> float:
+    """Create sessions with a few turns each; return the time per operation."""
+    service = SessionService(repository)
+    started = time.perf_counter()
+    for index in range(sessions):
+        session_id = service.create_session("en")
+        for turn in range(turns):
+            service.add_message_to_history(
+                session_id, f"question {index} {turn}", f"answer {index} {turn}"
+            )
+    return (time.perf_counter() - started) / (sessions * (turns + 1))
+
+
+def restore(directory: str) -> float:
+    """Seconds taken to rebuild the store from the directory."""
+    started = time.perf_counter()
+    repository = InMemorySessionRepository(journal=SessionJournal(directory))
+    elapsed = time.perf_counter() - started
+    repository.close_journal()
+    return elapsed
+
+
+def main() -> None:
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--fsync", action="store_true")
+    args = parser.parse_args()
+    print(f"{args.sessions} sessions of {args.turns} turns")
+
+    plain = fill(InMemorySessionRepository(), args.sessions, args.turns)
+    print(f"  without journal: {plain * 1e6:6.2f} us/operation")
+
+    with tempfile.TemporaryDirectory() as directory:
+        repository = InMemorySessionRepository(
+            journal=SessionJournal(directory, fsync=args.fsync)
+        )
+        repository.start_journal()
+        journaled = fill(repository, args.sessions, args.turns)
+        print(
+            f"  with journal:    {journaled * 1e6:6.2f} us/operation "
+            f"(+{(journaled - plain) * 1e6:.2f} us)"
+        )
+
+        # Stop without a final snapshot, so that only journal files remain
+        journal = repository._journal
+        journal.close()
+        print(f"  restore from journal:  {restore(directory):6.2f}s")
+        # That restore's shutdown wrote a snapshot
+        print(f"  restore from snapshot: {restore(directory):6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
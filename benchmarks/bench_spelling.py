@@ -0,0 +1,114 @@
+"""Measure typo correction: fallback rate and the latency it adds.
+
+Queries are questions of the corpus with one typo (a deleted, inserted,
+replaced or swapped letter) in each word of five letters or more. Messages are
+matched with correction disabled and enabled; correction only runs for the ones
+below the confidence threshold, so its cost is averaged over all messages, then
+measured alone for messages seen the first time and again (cached typos).
+
+    python -m benchmarks.bench_spelling --questions 20000 --queries 2000
+    python -m benchmarks.bench_spelling --dataset path/to/data-bot.json
+"""
+# Standard library imports
+import argparse
+import logging
+import random
+import string
+import time
+from typing import List
+
+# Local application imports
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.data.loaders.chatbot_data import compile_file
+from app.infrastructure.data.loaders.compiler import compile_dataset
+from app.infrastructure.nlp.spelling import SpellingCorrector
+
+
+def synthetic_questions(n_questions: int, seed: int = 0) -> List[str]:
+    """Questions of 4 to 8 made-up words from a 5000-word vocabulary."""
+    rng = random.Random(seed)
+    consonants, vowels = "bcdfghklmnprstv", "aeiou"
+    words = [
+        "".join(
+            rng.choice(consonants) + rng.choice(vowels)
+            for _ in range(rng.randint(2, 5))
+        )
+        for _ in range(5000)
+    ]
+    return [
+        " ".join(rng.choices(words, k=rng.randint(4, 8))) for _ in range(n_questions)
+    ]
+
+
+def add_typos(questions: List[str], n_queries: int, seed: int = 1) -> List[str]:
+    """Questions with one typo in each word of five letters or more."""
+    rng = random.Random(seed)
+    queries = []
+    for question in rng.sample(questions, min(n_queries, len(questions))):
+        words = []
+        for word in question.split():
+            if len(word) >= 5:
+                i = rng.randrange(len(word) - 1)
+                letter = rng.choice(string.ascii_lowercase)
+                word = rng.choice([
+                    word[:i] + word[i + 1:],
+                    word[:i] + letter + word[i:],
+                    word[:i] + letter + word[i + 1:],
+                    word[:i] + word[i + 1] + word[i] + word[i + 2:],
+                ])
+            words.append(word)
+        queries.append(" ".join(words))
+    return queries
+
+
+def main() -> None:
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--dataset", help="Use the questions of a dataset file")
+    args = parser.parse_args()
+
+    if args.dataset:
+        dataset = compile_file(args.dataset)
+    else:
+        dialogue = {
+            "id": "synthetic",
+            "samples": {"en": synthetic_questions(args.questions)},
+            "replies": {"en": ["ok"]},
+        }
+        dataset = compile_dataset({"dialogues": [dialogue]}, "en")
+    queries = add_typos(dataset.questions, args.queries)
+
+    chatbot = ChatbotService(dataset=dataset)
+    started = time.perf_counter()
+    corrector = SpellingCorrector(dataset.questions)
+    build = time.perf_counter() - started
+    print(
+        f"{len(dataset.questions)} questions, {len(queries)} queries; "
+        f"{len(corrector)} words indexed in {build:.2f}s"
+    )
+
+    for label, enabled in [("without", None), ("with", corrector)]:
+        chatbot.corrector = enabled
+        started = time.perf_counter()
+        results = [chatbot.match(query) for query in queries]
+        elapsed = time.perf_counter() - started
+        fallbacks = sum(result.is_fallback for result in results)
+        corrected = sum(result.corrected_message is not None for result in results)
+        print(
+            f"{label:>7} correction: {fallbacks / len(queries):6.1%} fallbacks, "
+            f"{elapsed / len(queries) * 1e6:8.1f} us/message, "
+            f"{corrected} messages corrected"
+        )
+
+    for label in ["first", "repeated"]:
+        started = time.perf_counter()
+        for query in queries:
+            corrector.correct(query)
+        per_message = (time.perf_counter() - started) / len(queries)
+        print(f"{label:>8} correction: {per_message * 1e6:8.1f} us/message")
+
+
+if __name__ == "__main__":
+    main()
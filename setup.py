@@ -18,7 +18,17 @@ setup(
         "python-dotenv~=1.0.0",
         "cachetools~=6.1.0",
     ],
+    entry_points={
+        "console_scripts": [
+            "chatbot-score=app.cli.score:main",
+            "chatbot-serve=app.cli.serve:main",
+            "chatbot-route=app.cli.route:main",
+        ]
+    },
     extras_require={
+        "router": [
+            "httpx~=0.27.0",
+        ],
         "dev": [
             "pytest~=8.0.0",
             "pytest-cov~=4.1.0",
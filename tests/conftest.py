@@ -0,0 +1,55 @@
+"""Shared pytest fixtures."""
+
+# ✅ Third-Party Imports
+import pytest
+
+
+@pytest.fixture
+def sample_chatbot_data():
+    """Small dataset following the chatbot_data schema."""
+    return {
+        "greetings": [
+            {
+                "replies": {
+                    "en": ["Hello! I am a chatbot!"],
+                    "nb": ["Hallo! Jeg er en chatbot!"],
+                }
+            }
+        ],
+        "dialogues": [
+            {
+                "id": "opening-hours",
+                "samples": {
+                    "en": ["What are your opening hours?", "When are you open?"]
+                },
+                "replies": {"en": ["We are open from 9 to 17."]},
+            },
+            {
+                "id": "joke",
+                "samples": {"en": ["Tell me a joke", "Do you know any jokes?"]},
+                "replies": {
+                    "en": ["What do you get if you clone a pirate? A pirate copy!"]
+                },
+            },
+            {
+                "id": "weather",
+                "samples": {"en": ["How is the weather today?"]},
+                "replies": {"en": ["I cannot see outside, sorry."]},
+            },
+        ],
+        "keywords": [
+            {
+                "id": "bye",
+                "keywords": {"en": ["bye", "good bye"], "nb": ["ha det"]},
+                "replies": {"en": ["Goodbye!"]},
+            },
+            {
+                "id": "thanks",
+                "keywords": {"en": ["thanks", "thank you"], "nb": ["takk"]},
+                "replies": {"en": ["You're welcome!"]},
+            },
+        ],
+        "fallbacks": [
+            {"replies": {"en": ["I'm sorry, I didn't understand that."]}}
+        ],
+    }
@@ -0,0 +1,59 @@
+"""Shared fixtures of the API integration tests."""
+
+# ✅ Third-Party Imports
+import pytest
+from fastapi.testclient import TestClient
+
+# ✅ Local Application Imports
+from app.api.dependencies import get_chatbot_service, get_session_repository
+from app.core.config import settings
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.repositories.memory.session import InMemorySessionRepository
+from app.main import create_app
+
+
+@pytest.fixture
+def repository():
+    """An empty, isolated session repository."""
+    return InMemorySessionRepository()
+
+
+@pytest.fixture
+def chatbot(sample_chatbot_data):
+    """A chatbot answering from the small test dataset."""
+    return ChatbotService(data=sample_chatbot_data)
+
+
+@pytest.fixture
+def make_client(repository, chatbot):
+    """Build test clients of fresh apps wired to ``repository`` and ``chatbot``.
+
+    Settings read by ``create_app`` must be patched before calling it.
+    """
+    def make(**kwargs):
+        app = create_app()
+        app.dependency_overrides[get_session_repository] = lambda: repository
+        app.dependency_overrides[get_chatbot_service] = lambda: chatbot
+        return TestClient(app, **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def client(make_client):
+    """Test client wired to an isolated repository and a small dataset."""
+    return make_client()
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """Enable the admin routes and return the headers that authorize them."""
+    monkeypatch.setattr(settings, "ADMIN_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    return {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture
+def admin_client(make_client, admin_headers):
+    """Test client of an app with the admin routes, sending the admin token."""
+    return make_client(headers=admin_headers)
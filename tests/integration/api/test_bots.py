@@ -0,0 +1,132 @@
+"""Integration tests for serving several bots from one app."""
+
+# ✅ Standard Library Imports
+import copy
+import json
+
+# ✅ Third-Party Imports
+import pytest
+from fastapi.testclient import TestClient
+
+# ✅ Local Application Imports
+from app.api import dependencies
+from app.core.config import settings
+from app.main import create_app
+
+
+@pytest.fixture
+def client(sample_chatbot_data, admin_headers, tmp_path, monkeypatch):
+    """An app hosting bots "a" and "b", which answer the joke differently."""
+    bots = {}
+    for name in ["a", "b"]:
+        data = copy.deepcopy(sample_chatbot_data)
+        data["dialogues"][1]["replies"]["en"] = [f"Joke of bot {name}"]
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(data))
+        bots[name] = str(path)
+
+    monkeypatch.setattr(settings, "BOTS", bots)
+    monkeypatch.setattr(settings, "CHATBOT_DATA_COMPILE", False)
+    monkeypatch.setattr(dependencies, "_bot_registry_instance", None)
+    yield TestClient(create_app(), headers=admin_headers)
+
+
+def _start(client, **kwargs):
+    response = client.post("/api/v1/conversations/start", json={}, **kwargs)
+    assert response.status_code == 200
+    return response.json()["session_id"]
+
+
+def test_bots_are_selected_by_path_prefix_or_header(client):
+    """Each bot answers from its own dataset."""
+    session_a = _start(client, headers={"X-Bot": "a"})
+    response = client.post("/api/v1/bots/b/conversations/start", json={})
+    session_b = response.json()["session_id"]
+
+    reply_a = client.post(
+        f"/api/v1/conversations/{session_a}/messages",
+        json={"message": "tell me a joke"},
+        headers={"X-Bot": "a"},
+    )
+    reply_b = client.post(
+        f"/api/v1/bots/b/conversations/{session_b}/messages",
+        json={"message": "tell me a joke"},
+    )
+    assert reply_a.json()["message"] == "Joke of bot a"
+    assert reply_b.json()["message"] == "Joke of bot b"
+
+
+def test_sessions_belong_to_one_bot(client):
+    """A session started with one bot is unknown to the others."""
+    session_id = _start(client, headers={"X-Bot": "a"})
+    response = client.post(
+        f"/api/v1/bots/b/conversations/{session_id}/messages",
+        json={"message": "hello"},
+    )
+    assert response.status_code == 404
+
+
+def test_unknown_bot_is_not_found(client):
+    """Requests for a bot that is not configured get 404 before routing."""
+    assert client.post("/api/v1/bots/z/conversations/start", json={}).status_code == 404
+    response = client.post(
+        "/api/v1/conversations/start", json={}, headers={"X-Bot": "z"}
+    )
+    assert response.status_code == 404
+
+
+def test_admin_lists_bot_metrics(client):
+    """Only bots that served requests are loaded, each with its own counters."""
+    _start(client, headers={"X-Bot": "a"})
+    _start(client, headers={"X-Bot": "a"})
+
+    status = client.get("/api/v1/admin/bots").json()
+    bots = {bot["name"]: bot for bot in status["bots"]}
+    assert bots["a"]["loaded"] and bots["a"]["requests"] == 2
+    assert bots["a"]["sessions"] == 2 and bots["a"]["memory_bytes"] > 0
+    assert not bots["b"]["loaded"] and bots["b"]["sessions"] == 0
+    assert status["loaded_bytes"] == bots["a"]["memory_bytes"]
+
+
+def test_admin_routes_require_the_token(client, admin_headers, monkeypatch):
+    """Admin routes reject a missing or wrong token and are absent when disabled."""
+    assert client.get(
+        "/api/v1/admin/bots", headers={"X-Admin-Token": ""}
+    ).status_code == 403
+    assert client.get(
+        "/api/v1/admin/bots", headers={"X-Admin-Token": "wrong"}
+    ).status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_ENABLED", False)
+    disabled = TestClient(create_app(), headers=admin_headers)
+    assert disabled.get("/api/v1/admin/bots").status_code == 404
+
+
+def test_reload_is_refused_for_other_bots(client):
+    """A reload routed to a bot does not silently reload the default bot."""
+    response = client.post("/api/v1/bots/a/admin/chatbot/reload")
+    assert response.status_code == 404
+    assert client.get(
+        "/api/v1/admin/chatbot/reload", headers={"X-Bot": "b"}
+    ).status_code == 404
+
+
+def test_query_stats_are_kept_per_bot(client, monkeypatch):
+    """Each bot's sampled queries are aggregated apart from the others'."""
+    monkeypatch.setattr(settings, "QUERY_LOG_ENABLED", True)
+    monkeypatch.setattr(settings, "QUERY_LOG_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "QUERY_LOG_DIR", "")
+    monkeypatch.setattr(dependencies, "_query_log_instance", None)
+
+    session_id = _start(client, headers={"X-Bot": "a"})
+    for message in ["tell me a joke", "any jokes?", "qwertyuiop"]:
+        client.post(
+            f"/api/v1/bots/a/conversations/{session_id}/messages",
+            json={"message": message},
+        )
+
+    stats = client.get("/api/v1/bots/a/admin/queries").json()
+    assert stats["queries"] == 3
+    assert stats["fallbacks"] == 1
+    assert stats["top_intents"][0]["intent"] == "joke"
+    assert client.get("/api/v1/bots/b/admin/queries").json()["queries"] == 0
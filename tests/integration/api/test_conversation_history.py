@@ -0,0 +1,107 @@
+"""Integration tests for the conversation history endpoint."""
+
+# ✅ Standard Library Imports
+import json
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.core.config import settings
+from app.domain.services.session import SessionService
+
+TURNS = 7
+
+
+@pytest.fixture
+def session_id(repository):
+    """A session with TURNS exchanges."""
+    service = SessionService(repository)
+    session_id = service.create_session("en")
+    for turn in range(TURNS):
+        service.add_message_to_history(session_id, f"question {turn}", f"answer {turn}")
+    return session_id
+
+
+def _history_url(session_id):
+    return f"/api/v1/conversations/{session_id}/history"
+
+
+# ---------------------- #
+# ✅ TEST PAGINATION
+# ---------------------- #
+
+def test_pages_follow_the_cursor_to_the_end(client, session_id):
+    """Following next_cursor returns every turn once, in order."""
+    messages, cursor = [], 0
+    while cursor is not None:
+        response = client.get(
+            _history_url(session_id), params={"cursor": cursor, "limit": 3}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["turns"]) <= 3
+        messages.extend(turn["user_message"] for turn in page["turns"])
+        cursor = page["next_cursor"]
+
+    assert messages == [f"question {turn}" for turn in range(TURNS)]
+
+
+def test_default_page_size_and_maximum(client, session_id, monkeypatch):
+    """Pages default to HISTORY_PAGE_SIZE and never exceed HISTORY_PAGE_MAX."""
+    monkeypatch.setattr(settings, "HISTORY_PAGE_SIZE", 2)
+    monkeypatch.setattr(settings, "HISTORY_PAGE_MAX", 4)
+
+    assert len(client.get(_history_url(session_id)).json()["turns"]) == 2
+    page = client.get(_history_url(session_id), params={"limit": 100}).json()
+    assert len(page["turns"]) == 4
+    assert page["next_cursor"] == 4
+
+
+def test_cursor_past_the_end_is_an_empty_last_page(client, session_id):
+    """A cursor beyond the history returns no turns and no next cursor."""
+    page = client.get(_history_url(session_id), params={"cursor": 100}).json()
+    assert page == {"session_id": session_id, "turns": [], "next_cursor": None}
+
+
+def test_unknown_session_is_404(client):
+    """Both modes report a missing session before sending anything."""
+    assert client.get(_history_url("missing")).status_code == 404
+    assert client.get(
+        _history_url("missing"), params={"stream": True}
+    ).status_code == 404
+
+
+# ---------------------- #
+# ✅ TEST STREAMING
+# ---------------------- #
+
+def test_stream_sends_one_turn_per_line(client, session_id, monkeypatch):
+    """NDJSON mode streams every turn from the cursor, across several chunks."""
+    monkeypatch.setattr(settings, "HISTORY_STREAM_CHUNK", 2)
+    response = client.get(
+        _history_url(session_id), params={"stream": True, "cursor": 1}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    turns = [json.loads(line) for line in response.text.splitlines()]
+    assert [turn["bot_response"] for turn in turns] == [
+        f"answer {turn}" for turn in range(1, TURNS)
+    ]
+
+
+def test_stream_honours_limit(client, session_id, monkeypatch):
+    """A limit caps the number of streamed turns."""
+    monkeypatch.setattr(settings, "HISTORY_STREAM_CHUNK", 2)
+    response = client.get(
+        _history_url(session_id), params={"stream": True, "limit": 3}
+    )
+    assert len(response.text.splitlines()) == 3
+
+
+def test_reading_history_is_not_activity(repository, session_id):
+    """The range read leaves the session's last activity untouched."""
+    last_activity = repository._sessions[session_id]["last_activity"]
+    repository.get_history(session_id, 0, 2)
+    assert repository._sessions[session_id]["last_activity"] == last_activity
@@ -0,0 +1,98 @@
+"""Integration tests for the conversation WebSocket endpoint."""
+
+# ✅ Standard Library Imports
+import asyncio
+
+# ✅ Third-Party Imports
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+# ✅ Local Application Imports
+from app.api.v1.routes import conversation_ws
+
+
+def test_messages_stream_over_one_connection(client, repository):
+    """Several turns share one connection and are recorded in the session."""
+    session_id = repository.create_session("en")
+
+    with client.websocket_connect(f"/api/v1/conversations/{session_id}/ws") as ws:
+        ws.send_text("tell me a joke")
+        first = ws.receive_json()
+        ws.send_text('{"message": "when are you open?"}')
+        second = ws.receive_json()
+
+    assert first["success"] and first["session_id"] == session_id
+    assert first["message"] == "What do you get if you clone a pirate? A pirate copy!"
+    assert second["message"] == "We are open from 9 to 17."
+    assert len(repository.get_session(session_id)["conversation_history"]) == 2
+
+
+def test_messages_are_answered_off_the_event_loop(
+    client, repository, chatbot, monkeypatch
+):
+    """Matching runs in the threadpool, where no event loop is running."""
+    process_message = chatbot.process_message
+    loops = []
+
+    def recording(message):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return process_message(message)
+
+    monkeypatch.setattr(chatbot, "process_message", recording)
+    session_id = repository.create_session("en")
+
+    with client.websocket_connect(f"/api/v1/conversations/{session_id}/ws") as ws:
+        ws.send_text("tell me a joke")
+        assert ws.receive_json()["success"]
+
+    assert loops == [None]
+
+
+def test_unknown_session_is_rejected(client):
+    """The handshake fails when the session does not exist."""
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/api/v1/conversations/missing/ws") as ws:
+            ws.receive_text()
+
+
+def test_oversized_message_gets_error_frame(client, repository):
+    """Invalid frames are answered with an error and the connection stays open."""
+    session_id = repository.create_session("en")
+
+    with client.websocket_connect(f"/api/v1/conversations/{session_id}/ws") as ws:
+        ws.send_text("x" * 5000)
+        error = ws.receive_json()
+        ws.send_text("tell me a joke")
+        reply = ws.receive_json()
+
+    assert error["success"] is False
+    assert reply["success"] is True
+
+
+def test_binary_frame_gets_error_frame(client, repository):
+    """Binary frames are answered with an error instead of closing the socket."""
+    session_id = repository.create_session("en")
+
+    with client.websocket_connect(f"/api/v1/conversations/{session_id}/ws") as ws:
+        ws.send_bytes(b"tell me a joke")
+        error = ws.receive_json()
+        ws.send_text("tell me a joke")
+        reply = ws.receive_json()
+
+    assert error == {"success": False, "detail": "Frames must be text"}
+    assert reply["success"] is True
+
+
+def test_connection_limit(client, repository, monkeypatch):
+    """Connections beyond the per-worker limit are refused."""
+    monkeypatch.setattr(conversation_ws.connection_limiter, "max_connections", 0)
+    session_id = repository.create_session("en")
+
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect(f"/api/v1/conversations/{session_id}/ws") as ws:
+            ws.receive_text()
+
+    assert exc_info.value.code == 1013
@@ -0,0 +1,46 @@
+"""Integration tests for the fast JSON response mode."""
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.api.responses import build_response
+from app.api.v1.schemas.conversation import MessageResponse
+from app.core.config import settings
+
+
+def _conversation(client):
+    start = client.post("/api/v1/conversations/start", json={"language": "en"})
+    session_id = start.json()["session_id"]
+    reply = client.post(
+        f"/api/v1/conversations/{session_id}/messages",
+        json={"message": "When are you open?"}
+    )
+    return start, reply
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_responses_are_identical_in_both_modes(client, monkeypatch, fast):
+    """Fast mode returns the same JSON documents, in the same field order."""
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+    start, reply = _conversation(client)
+
+    assert start.status_code == 200
+    assert start.headers["content-type"] == "application/json"
+    assert list(start.json()) == ["session_id", "message", "success"]
+    assert reply.json() == {
+        "session_id": start.json()["session_id"],
+        "message": "We are open from 9 to 17.",
+        "confidence": None,
+        "timestamp": None,
+        "success": True,
+    }
+    assert list(reply.json()) == list(MessageResponse.model_fields)
+
+
+def test_fast_mode_still_requires_fields(monkeypatch):
+    """Missing required fields are reported even though values are not validated."""
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+
+    with pytest.raises(TypeError, match="success"):
+        build_response(MessageResponse, session_id="abc", message="hi")
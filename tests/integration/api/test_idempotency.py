@@ -0,0 +1,164 @@
+"""Integration tests for idempotency keys of message submissions."""
+
+# ✅ Standard Library Imports
+import asyncio
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.api.dependencies import get_idempotency_store
+from app.api.idempotency import IdempotencyStore
+from app.core.exceptions import IdempotencyConflictException
+from app.domain.services.chatbot import ChatbotService
+from app.domain.services.session import SessionService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingChatbot(ChatbotService):
+    """Chatbot counting the messages it processes."""
+
+    processed = 0
+    fail_next = False
+
+    def process_message(self, user_message):
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("overloaded")
+        self.processed += 1
+        return super().process_message(user_message)
+
+
+@pytest.fixture
+def chatbot(sample_chatbot_data):
+    return CountingChatbot(data=sample_chatbot_data)
+
+
+@pytest.fixture
+def client(client):
+    """The shared test client, with an isolated key store."""
+    store = IdempotencyStore(max_keys=100, ttl_seconds=60)
+    client.app.dependency_overrides[get_idempotency_store] = lambda: store
+    return client
+
+
+@pytest.fixture
+def session_id(repository):
+    return SessionService(repository).create_session("en")
+
+
+# ---------------------- #
+# ✅ TEST MESSAGE ROUTE
+# ---------------------- #
+
+def test_retry_is_answered_from_the_store(client, chatbot, repository, session_id):
+    """A retried message is processed and added to the history once."""
+    url = f"/api/v1/conversations/{session_id}/messages"
+    headers = {"Idempotency-Key": "attempt-1"}
+    first = client.post(url, json={"message": "tell me a joke"}, headers=headers)
+    retry = client.post(url, json={"message": "tell me a joke"}, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert chatbot.processed == 1
+    assert len(repository.get_session(session_id)["conversation_history"]) == 1
+
+    client.post(url, json={"message": "tell me a joke"})
+    assert chatbot.processed == 2
+
+
+def test_key_reused_for_another_message_is_rejected(client, chatbot, session_id):
+    """A key sent again with a different message gets 422."""
+    url = f"/api/v1/conversations/{session_id}/messages"
+    headers = {"Idempotency-Key": "attempt-1"}
+    client.post(url, json={"message": "tell me a joke"}, headers=headers)
+    response = client.post(url, json={"message": "bye"}, headers=headers)
+
+    assert response.status_code == 422
+    assert chatbot.processed == 1
+
+
+def test_failures_are_not_stored(client, chatbot, session_id):
+    """A request that failed runs again when retried with its key."""
+    url = f"/api/v1/conversations/{session_id}/messages"
+    headers = {"Idempotency-Key": "attempt-1"}
+    chatbot.fail_next = True
+    assert client.post(url, json={"message": "hi"}, headers=headers).status_code == 500
+    assert client.post(url, json={"message": "hi"}, headers=headers).status_code == 200
+    assert chatbot.processed == 1
+
+
+# ---------------------- #
+# ✅ TEST STORE
+# ---------------------- #
+
+def test_concurrent_duplicates_wait_for_the_first_attempt():
+    """Duplicates arriving mid-flight share the first attempt's response."""
+    store = IdempotencyStore(max_keys=10, ttl_seconds=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "response"
+
+    async def main():
+        return await asyncio.gather(
+            *(store.run("key", "payload", compute) for _ in range(5))
+        )
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results[0] == ("response", False)
+    assert results[1:] == [("response", True)] * 4
+
+
+def test_waiters_run_again_when_the_first_attempt_fails():
+    """Only successful responses are replayed."""
+    store = IdempotencyStore(max_keys=10, ttl_seconds=60)
+    attempts = []
+
+    async def compute():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("overloaded")
+        return "response"
+
+    async def main():
+        return await asyncio.gather(
+            store.run("key", "payload", compute),
+            store.run("key", "payload", compute),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, RuntimeError)
+    assert second == ("response", False)
+
+
+def test_keys_expire_and_conflicts_raise():
+    """Keys are forgotten after the TTL; another payload under a key raises."""
+    clock = FakeClock()
+    store = IdempotencyStore(max_keys=10, ttl_seconds=60, clock=clock)
+
+    async def run(payload):
+        async def compute():
+            return payload
+
+        return await store.run("key", payload, compute)
+
+    assert asyncio.run(run("a")) == ("a", False)
+    assert asyncio.run(run("a")) == ("a", True)
+    with pytest.raises(IdempotencyConflictException):
+        asyncio.run(run("b"))
+
+    clock.now += 61
+    assert asyncio.run(run("b")) == ("b", False)
@@ -0,0 +1,74 @@
+"""Integration tests for the memory accounting admin routes."""
+
+# ✅ Standard Library Imports
+import tracemalloc
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.api import dependencies
+
+
+@pytest.fixture
+def client(admin_client, monkeypatch):
+    """The admin test client, with a fresh memory tracer stopped afterwards."""
+    monkeypatch.setattr(dependencies, "_memory_tracer_instance", None)
+    yield admin_client
+    dependencies.get_memory_tracer().stop()
+
+
+def test_memory_reports_every_component(client):
+    """The model's parts and the sessions' histories are estimated apart."""
+    session_id = client.post("/api/v1/conversations/start", json={}).json()[
+        "session_id"
+    ]
+    before = client.get("/api/v1/admin/memory").json()
+    for _ in range(3):
+        client.post(
+            f"/api/v1/conversations/{session_id}/messages",
+            json={"message": "tell me a joke"},
+        )
+
+    memory = client.get("/api/v1/admin/memory?sample=10").json()
+    components = {entry["name"]: entry["bytes"] for entry in memory["components"]}
+    assert {
+        "questions", "replies", "vocabulary", "matrix", "sessions", "histories"
+    } <= set(components)
+    assert all(size > 0 for size in components.values())
+    assert memory["estimated_bytes"] == sum(components.values())
+    assert memory["sessions"] == 1 and memory["turns"] == 3
+    assert memory["sample_size"] == 10
+    assert memory["rss_bytes"] is None or memory["rss_bytes"] > 0
+    assert before["turns"] == 0 and not memory["tracing"]
+
+
+def test_snapshots_diff_and_stop(client):
+    """Snapshots are compared to the previous one until tracing is stopped."""
+    first = client.post("/api/v1/admin/memory/snapshots").json()
+    assert first["compared_to"] is None and first["differences"] == []
+    assert client.get("/api/v1/admin/memory").json()["tracing"]
+
+    second = client.post("/api/v1/admin/memory/snapshots?top=3&group_by=filename")
+    assert second.status_code == 200
+    assert second.json()["compared_to"] == first["taken_at"]
+    assert len(second.json()["differences"]) <= 3
+
+    assert client.post(
+        "/api/v1/admin/memory/snapshots?group_by=nothing"
+    ).status_code == 422
+    assert client.delete("/api/v1/admin/memory/snapshots").status_code == 204
+    assert not client.get("/api/v1/admin/memory").json()["tracing"]
+
+
+def test_anonymous_callers_cannot_start_tracing(client):
+    """Without the admin token no snapshot is taken and tracing stays off."""
+    for token in ["", "wrong"]:
+        headers = {"X-Admin-Token": token}
+        assert client.post(
+            "/api/v1/admin/memory/snapshots", headers=headers
+        ).status_code == 403
+        assert client.delete(
+            "/api/v1/admin/memory/snapshots", headers=headers
+        ).status_code == 403
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,169 @@
+"""Integration tests for the rate limit middleware."""
+
+# ✅ Standard Library Imports
+import logging
+
+# ✅ Third-Party Imports
+import pytest
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+# ✅ Local Application Imports
+from app.api.middleware.rate_limit import RateLimitMiddleware, TokenBuckets
+from app.core.config import settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limited_client(clock):
+    """A bare app behind the middleware, with a controllable clock."""
+    app = FastAPI()
+
+    @app.post("/api/conversations/{session_id}/messages")
+    async def send_message(session_id: str):
+        return {"session_id": session_id}
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.websocket("/api/conversations/{session_id}/ws")
+    async def echo(websocket: WebSocket, session_id: str):
+        await websocket.accept()
+        try:
+            while True:
+                await websocket.send_json({"echo": await websocket.receive_text()})
+        except WebSocketDisconnect:
+            pass
+
+    limited = RateLimitMiddleware(
+        app,
+        prefix="/api/conversations",
+        client_rate=10,
+        client_burst=3,
+        session_rate=1,
+        session_burst=2,
+        max_keys=100,
+        clock=clock,
+    )
+    return TestClient(limited)
+
+
+def test_session_burst_then_429_with_retry_after(limited_client, clock):
+    """A session may spend its burst, then must wait for tokens to refill."""
+    assert limited_client.post("/api/conversations/a/messages").status_code == 200
+    assert limited_client.post("/api/conversations/a/messages").status_code == 200
+
+    rejected = limited_client.post("/api/conversations/a/messages")
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "1"
+    assert rejected.json() == {"detail": "Too many requests"}
+
+    clock.now += 1.0
+    assert limited_client.post("/api/conversations/a/messages").status_code == 200
+
+
+def test_client_limit_spans_sessions(limited_client, clock):
+    """The client bucket caps requests across all of its sessions."""
+    statuses = [
+        limited_client.post(f"/api/conversations/{session}/messages").status_code
+        for session in "abcd"
+    ]
+    assert statuses == [200, 200, 200, 429]
+
+    # A rejected request spends nothing, so one refilled token admits one request
+    clock.now += 0.1
+    assert limited_client.post("/api/conversations/d/messages").status_code == 200
+
+
+def test_websocket_frames_spend_session_tokens(limited_client, clock):
+    """Frames over the session rate get an error frame instead of an answer."""
+    with limited_client.websocket_connect("/api/conversations/a/ws") as ws:
+        replies = []
+        for frame in ["one", "two", "three"]:
+            ws.send_text(frame)
+            replies.append(ws.receive_json())
+
+        clock.now += 1.0
+        ws.send_text("four")
+        replies.append(ws.receive_json())
+
+    assert replies[:2] == [{"echo": "one"}, {"echo": "two"}]
+    assert replies[2]["success"] is False
+    assert replies[2]["detail"] == "Too many requests"
+    assert replies[2]["retry_after"] == pytest.approx(1.0)
+    assert replies[3] == {"echo": "four"}
+
+
+def test_websocket_upgrade_spends_a_client_token(limited_client):
+    """A client over its rate cannot open another socket."""
+    for session in "abc":
+        response = limited_client.post(f"/api/conversations/{session}/messages")
+        assert response.status_code == 200
+
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with limited_client.websocket_connect("/api/conversations/d/ws"):
+            pass
+    assert closed.value.code == 1013
+
+
+def test_rejections_are_warned_once_per_interval(limited_client, clock, caplog):
+    """A flood of rejections logs one warning per interval, with a count."""
+    with caplog.at_level(logging.WARNING, logger="app.api.middleware.rate_limit"):
+        for _ in range(20):
+            limited_client.post("/api/conversations/a/messages")
+        clock.now += 61
+        for _ in range(3):
+            limited_client.post("/api/conversations/b/messages")
+
+    warnings = [record.getMessage() for record in caplog.records]
+    assert len(warnings) == 2
+    assert "more since the last report" not in warnings[0]
+    assert "(17 more since the last report)" in warnings[1]
+
+
+def test_unlimited_paths_pass_through(limited_client):
+    """Routes outside the prefix are never limited."""
+    assert all(limited_client.get("/api/health").status_code == 200 for _ in range(10))
+
+
+def test_buckets_are_bounded():
+    """Old keys are evicted instead of growing memory without bound."""
+    buckets = TokenBuckets(rate=1, burst=1, max_keys=3)
+    for i in range(10):
+        buckets.spend(f"10.0.0.{i}", buckets.available(f"10.0.0.{i}", 0.0), 0.0)
+
+    assert len(buckets) == 3
+    assert buckets.available("10.0.0.0", 0.0) == 1  # evicted, so a full bucket
+
+
+def test_app_rejects_before_any_nlp_work(
+    make_client, repository, chatbot, monkeypatch
+):
+    """With rate limiting enabled, over-limit messages never reach the chatbot."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_SESSION_PER_SECOND", 0.001)
+    monkeypatch.setattr(settings, "RATE_LIMIT_SESSION_BURST", 1)
+
+    processed = []
+    monkeypatch.setattr(chatbot, "process_message", lambda m: processed.append(m) or m)
+
+    session_id = repository.create_session("en")
+    url = f"/api/v1/conversations/{session_id}/messages"
+    with make_client() as client:
+        assert client.post(url, json={"message": "hi"}).status_code == 200
+        assert client.post(url, json={"message": "again"}).status_code == 429
+
+    assert processed == ["hi"]
@@ -0,0 +1,79 @@
+"""Integration tests for the admin session listing and statistics endpoints."""
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.core.config import settings
+from app.domain.services.session import SessionService
+from app.infrastructure.repositories.memory.session import InMemorySessionRepository
+
+LISTING_URL = "/api/v1/admin/sessions"
+
+
+@pytest.fixture
+def repository():
+    repository = InMemorySessionRepository()
+    service = SessionService(repository)
+    for language in ["en", "en", "nb", "en", "nb"]:
+        session_id = service.create_session(language)
+        service.add_message_to_history(session_id, "hi", "hello")
+    return repository
+
+
+def test_listing_pages_through_matching_sessions(admin_client, repository):
+    """Following next_cursor lists every matching session once, in order."""
+    ids, cursor = [], 0
+    while cursor is not None:
+        response = admin_client.get(
+            LISTING_URL, params={"cursor": cursor, "limit": 2, "language": "en"}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert page["total_sessions"] == 5
+        assert all(session["turns"] == 1 for session in page["sessions"])
+        ids.extend(session["id"] for session in page["sessions"])
+        cursor = page["next_cursor"]
+
+    expected = [
+        session_id for session_id, session in repository._sessions.items()
+        if session["language"] == "en"
+    ]
+    assert ids == expected
+
+
+def test_listing_caps_the_page_size(admin_client, monkeypatch):
+    """Pages never hold more than SESSION_LIST_PAGE_MAX sessions."""
+    monkeypatch.setattr(settings, "SESSION_LIST_PAGE_MAX", 3)
+    page = admin_client.get(LISTING_URL, params={"limit": 100}).json()
+    assert len(page["sessions"]) == 3
+    assert page["next_cursor"] is not None
+
+
+def test_idle_filter(admin_client):
+    """Sessions just used are not idle for a minute."""
+    page = admin_client.get(LISTING_URL, params={"min_idle_seconds": 60}).json()
+    assert page["sessions"] == [] and page["next_cursor"] is None
+
+
+def test_stats(admin_client):
+    """Statistics report counts, languages and both histograms."""
+    stats = admin_client.get(f"{LISTING_URL}/stats").json()
+    assert stats["total_sessions"] == 5
+    assert stats["total_turns"] == 5
+    assert stats["languages"] == {"en": 3, "nb": 2}
+    assert sum(b["sessions"] for b in stats["age_histogram"]) == 5
+    assert stats["idle_histogram"][-1]["max_seconds"] is None
+
+
+def test_listing_is_an_admin_route(make_client, admin_headers, monkeypatch):
+    """Sessions are listed only with the admin token, not under the public API."""
+    client = make_client()
+    assert client.get("/api/v1/conversations/debug/sessions").status_code == 404
+    assert client.get(LISTING_URL).status_code == 403
+    assert client.get(LISTING_URL, headers=admin_headers).status_code == 200
+
+    monkeypatch.setattr(settings, "ADMIN_ENABLED", False)
+    disabled = make_client(headers=admin_headers)
+    assert disabled.get(LISTING_URL).status_code == 404
+    assert disabled.get(f"{LISTING_URL}/stats").status_code == 404
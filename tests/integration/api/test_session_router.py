@@ -0,0 +1,235 @@
+"""Integration tests for routing sessions across in-process chatbot nodes."""
+
+# ✅ Standard Library Imports
+import asyncio
+
+# ✅ Third-Party Imports
+import httpx
+import pytest
+
+# ✅ Local Application Imports
+from app.api.dependencies import get_chatbot_service, get_session_repository
+from app.core.config import settings
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.cluster.router import SessionRouter
+from app.infrastructure.repositories.memory.session import InMemorySessionRepository
+from app.main import create_app
+
+SESSIONS = 60
+SECRET = "cluster-secret"
+
+
+@pytest.fixture
+def make_node(sample_chatbot_data, monkeypatch):
+    """Build app instances, each holding sessions in its own repository."""
+    monkeypatch.setattr(settings, "CLUSTER_NODE_ENABLED", True)
+    monkeypatch.setattr(settings, "CLUSTER_SECRET", SECRET)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    chatbot = ChatbotService(data=sample_chatbot_data)
+
+    def make():
+        app = create_app()
+        app.state.repository = InMemorySessionRepository()
+        app.dependency_overrides[get_session_repository] = lambda: app.state.repository
+        app.dependency_overrides[get_chatbot_service] = lambda: chatbot
+        return app
+
+    return make
+
+
+def _client(router):
+    transport = httpx.ASGITransport(app=router)
+    return httpx.AsyncClient(transport=transport, base_url="http://router")
+
+
+def _run(scenario):
+    return asyncio.run(scenario())
+
+
+async def _start_sessions(client):
+    session_ids = []
+    for _ in range(SESSIONS):
+        response = await client.post("/api/v1/conversations/start", json={})
+        assert response.status_code == 200
+        session_ids.append(response.json()["session_id"])
+    return session_ids
+
+
+async def _talk(client, session_id):
+    response = await client.post(
+        f"/api/v1/conversations/{session_id}/messages",
+        json={"message": "tell me a joke"},
+    )
+    assert response.status_code == 200
+    history = await client.get(f"/api/v1/conversations/{session_id}/history")
+    return len(history.json()["turns"])
+
+
+def _holders(nodes, session_id):
+    return [
+        name for name, app in nodes.items()
+        if app.state.repository.get_session(session_id) is not None
+    ]
+
+
+def test_sessions_are_routed_to_the_node_that_created_them(make_node):
+    """Every request of a session reaches the one node holding it."""
+    nodes = {"a": make_node(), "b": make_node(), "c": make_node()}
+    router = SessionRouter(nodes, secret=SECRET)
+
+    async def scenario():
+        async with _client(router) as client:
+            session_ids = await _start_sessions(client)
+            for session_id in session_ids:
+                assert await _talk(client, session_id) == 1
+                assert _holders(nodes, session_id) == [router.owner(session_id)]
+            return session_ids
+
+    session_ids = _run(scenario)
+    assert len({router.owner(session_id) for session_id in session_ids}) == 3
+
+
+def test_sessions_move_when_nodes_join_and_leave(make_node):
+    """Joining and leaving nodes hand their sessions over, history included."""
+    nodes = {"a": make_node(), "b": make_node()}
+    router = SessionRouter(nodes, secret=SECRET)
+
+    async def scenario():
+        async with _client(router) as client:
+            session_ids = await _start_sessions(client)
+            for session_id in session_ids:
+                await _talk(client, session_id)
+            before = {s: router.owner(s) for s in session_ids}
+
+            nodes["c"] = make_node()
+            moved = await router.add_node("c", nodes["c"])
+            changed = [s for s in session_ids if router.owner(s) != before[s]]
+            assert moved == len(changed) > 0
+            assert all(router.owner(s) == "c" for s in changed)
+
+            for session_id in session_ids:
+                assert _holders(nodes, session_id) == [router.owner(session_id)]
+                assert await _talk(client, session_id) == 2
+
+            await router.remove_node("a")
+            assert "a" not in router.ring
+            assert len(nodes["a"].state.repository._sessions) == 0
+            for session_id in session_ids:
+                assert _holders(nodes, session_id) == [router.owner(session_id)]
+                assert await _talk(client, session_id) == 3
+
+            listing = await client.get(
+                "/cluster/nodes", headers={"X-Cluster-Secret": SECRET}
+            )
+            shares = {node["name"]: node["shards"] for node in listing.json()["nodes"]}
+            assert set(shares) == {"b", "c"}
+
+    _run(scenario)
+
+
+def test_failed_hand_over_keeps_every_session_on_its_node(make_node):
+    """If one import fails, nothing is deleted and the imports done are undone."""
+    nodes = {"a": make_node(), "b": make_node()}
+    router = SessionRouter(nodes, secret=SECRET)
+    joining = make_node()
+    imports = []
+
+    async def failing_second_import(scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/sessions/import"):
+            imports.append(scope["path"])
+            if len(imports) == 2:
+                await send({
+                    "type": "http.response.start", "status": 500, "headers": []
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+        await joining(scope, receive, send)
+
+    async def scenario():
+        async with _client(router) as client:
+            session_ids = await _start_sessions(client)
+            for session_id in session_ids:
+                await _talk(client, session_id)
+            before = {s: router.owner(s) for s in session_ids}
+
+            with pytest.raises(httpx.HTTPStatusError):
+                await router.add_node("c", failing_second_import)
+            assert len(imports) == 2
+            assert len(joining.state.repository._sessions) == 0
+            for session_id in session_ids:
+                assert router.owner(session_id) == before[session_id]
+                assert _holders(nodes, session_id) == [before[session_id]]
+                assert await _talk(client, session_id) == 2
+
+    _run(scenario)
+
+
+def test_hand_over_routes_require_the_secret(make_node):
+    """Nodes refuse to export, import or delete sessions for a wrong secret."""
+    node = make_node()
+
+    async def scenario():
+        async with _client(node) as client:
+            for action in ["export", "import", "delete"]:
+                url = f"/api/v1/internal/sessions/{action}"
+                assert (await client.post(url, json={})).status_code == 403
+                response = await client.post(
+                    url, json={}, headers={"X-Cluster-Secret": "wrong"}
+                )
+                assert response.status_code == 403
+
+    _run(scenario)
+
+
+def test_membership_routes_require_the_secret(make_node):
+    """Nodes cannot be listed, added or removed without the cluster secret."""
+    router = SessionRouter({"a": make_node(), "b": make_node()}, secret=SECRET)
+
+    async def scenario():
+        async with _client(router) as client:
+            for headers in [{}, {"X-Cluster-Secret": "wrong"}]:
+                requests = [
+                    client.get("/cluster/nodes", headers=headers),
+                    client.put(
+                        "/cluster/nodes/c",
+                        json={"url": "http://attacker.example"},
+                        headers=headers,
+                    ),
+                    client.delete("/cluster/nodes/a", headers=headers),
+                ]
+                for request in requests:
+                    assert (await request).status_code == 403
+            assert router.ring.nodes == ["a", "b"]
+
+            response = await client.delete(
+                "/cluster/nodes/b", headers={"X-Cluster-Secret": SECRET}
+            )
+            assert response.status_code == 200
+            assert router.ring.nodes == ["a"]
+
+    _run(scenario)
+
+
+def test_caller_address_is_appended_to_x_forwarded_for():
+    """Nodes see the caller's address after any proxies it came through."""
+    received = []
+
+    async def node(scope, receive, send):
+        received.append(dict(scope["headers"]).get(b"x-forwarded-for"))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    router = SessionRouter({"a": node}, secret=SECRET)
+    transport = httpx.ASGITransport(app=router, client=("203.0.113.7", 5000))
+
+    async def scenario():
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://router"
+        ) as client:
+            await client.get("/api/v1/health")
+            await client.get(
+                "/api/v1/health", headers={"X-Forwarded-For": "198.51.100.1"}
+            )
+
+    _run(scenario)
+    assert received == [b"203.0.113.7", b"198.51.100.1, 203.0.113.7"]
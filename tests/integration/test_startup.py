@@ -0,0 +1,46 @@
+"""Startup import time tests."""
+
+# ✅ Standard Library Imports
+import os
+import subprocess
+import sys
+
+# ✅ Local Application Imports
+from app.core.config import settings
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+IMPORT_APP = (
+    "import sys, app.main; "
+    "print(','.join(m for m in sys.modules if m.split('.')[0] in ('sklearn', 'scipy')))"
+)
+
+
+def _run(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_app_import_does_not_load_nlp_stack():
+    """SciPy and scikit-learn are only imported once a model is built."""
+    result = _run("-c", IMPORT_APP)
+    assert result.stdout.strip() == ""
+
+
+def test_app_import_time_within_budget():
+    """Importing app.main stays within IMPORT_TIME_BUDGET_MS."""
+    result = _run("-X", "importtime", "-c", "import app.main")
+
+    # Last line: "import time: <self us> | <cumulative us> | app.main"
+    line = [row for row in result.stderr.splitlines() if row.endswith("| app.main")][-1]
+    cumulative_ms = int(line.split("|")[1]) / 1000
+
+    assert cumulative_ms <= settings.IMPORT_TIME_BUDGET_MS, (
+        f"import app.main took {cumulative_ms:.0f} ms, "
+        f"budget is {settings.IMPORT_TIME_BUDGET_MS:.0f} ms"
+    )
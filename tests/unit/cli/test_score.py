@@ -0,0 +1,115 @@
+"""Unit tests for the bulk scoring CLI."""
+
+# ✅ Standard Library Imports
+import csv
+import io
+import json
+from functools import partial
+
+# ✅ Local Application Imports
+from app.cli.score import iter_chunks, iter_messages, score_file
+from app.domain.services.chatbot import ChatbotService
+
+
+# ---------------------- #
+# ✅ TEST INPUT STREAMING
+# ---------------------- #
+
+def test_iter_messages_jsonl_skips_invalid_lines():
+    """JSONL input yields the configured field and skips broken lines."""
+    stream = io.StringIO('{"message": "hi"}\nnot json\n\n{"text": "x"}\n"plain"\n')
+    assert list(iter_messages(stream, "jsonl")) == ["hi", "plain"]
+
+
+def test_iter_messages_csv_column():
+    """CSV input yields the requested column."""
+    stream = io.StringIO("id,text\n1,hello\n2,bye\n")
+    assert list(iter_messages(stream, "csv", field="text")) == ["hello", "bye"]
+
+
+def test_iter_chunks_is_lazy():
+    """Chunks are produced from an iterator without materializing it."""
+    chunks = iter_chunks(iter(range(7)), 3)
+    assert next(chunks) == [0, 1, 2]
+    assert list(chunks) == [[3, 4, 5], [6]]
+
+
+# ---------------------- #
+# ✅ TEST END-TO-END SCORING
+# ---------------------- #
+
+def test_score_file_writes_one_row_per_message(tmp_path, sample_chatbot_data):
+    """Every input message gets a scored output row and a summary is returned."""
+    source = tmp_path / "input.jsonl"
+    target = tmp_path / "output.csv"
+    messages = ["tell me a joke", "when are you open", "qwerty zxcv"]
+    source.write_text("\n".join(json.dumps({"message": m}) for m in messages))
+
+    summary = score_file(
+        str(source),
+        str(target),
+        chunk_size=2,
+        workers=1,
+        service_factory=partial(ChatbotService, data=sample_chatbot_data),
+    )
+
+    with open(target, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [row["message"] for row in rows] == messages
+    assert rows[0]["matched_question"] == "tell me a joke"
+    assert rows[0]["intent"] == "joke" and rows[0]["question_index"] == "2"
+    assert rows[2]["fallback"] == "True"
+    assert summary.total == 3
+    assert summary.fallbacks == 1
+
+
+def test_score_file_routes_keywords_like_the_api(tmp_path, sample_chatbot_data):
+    """Keyword intents are answered, not reported as fallbacks."""
+    source = tmp_path / "input.jsonl"
+    target = tmp_path / "output.jsonl"
+    messages = ["hello", "thanks a lot", "qwerty zxcv", "tell me a joke"]
+    source.write_text("\n".join(json.dumps({"message": m}) for m in messages))
+    chatbot = ChatbotService(data=sample_chatbot_data)
+
+    summary = score_file(
+        str(source), str(target), workers=1, service_factory=lambda: chatbot
+    )
+
+    with open(target) as f:
+        rows = [json.loads(line) for line in f]
+
+    assert [row["fallback"] for row in rows] == [False, False, True, False]
+    assert rows[1]["intent"] == "thanks" and rows[1]["confidence"] is None
+    assert rows[1]["question_index"] == -1
+    assert rows[3]["intent"] == "joke"
+    assert summary.fallbacks == 1
+    # The API answers every message with the same intent
+    assert [chatbot._respond(m)[1] for m in messages] == [
+        row["intent"] or None for row in rows
+    ]
+
+
+def test_score_file_with_workers_keeps_input_order(tmp_path, sample_chatbot_data):
+    """Chunks scored by a process pool are written back in input order."""
+    source = tmp_path / "input.jsonl"
+    target = tmp_path / "output.jsonl"
+    pool = ["tell me a joke", "when are you open", "qwerty zxcv", "weather today"]
+    messages = [f"{pool[i % len(pool)]} {i}" for i in range(40)]
+    source.write_text("\n".join(json.dumps({"message": m}) for m in messages))
+
+    summary = score_file(
+        str(source),
+        str(target),
+        chunk_size=3,
+        workers=2,
+        max_pending=2,
+        service_factory=partial(ChatbotService, data=sample_chatbot_data),
+    )
+
+    with open(target) as f:
+        rows = [json.loads(line) for line in f]
+
+    assert [row["message"] for row in rows] == messages
+    assert summary.total == len(messages)
+    assert summary.fallbacks == sum(row["fallback"] for row in rows)
@@ -0,0 +1,135 @@
+"""Unit tests for the preforking production server."""
+
+# ✅ Standard Library Imports
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.cli import serve
+from app.cli.serve import WorkerSupervisor, bind_socket, read_memory
+
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+)
+
+
+# ---------------------- #
+# ✅ TEST HELPERS
+# ---------------------- #
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_read_memory_of_current_process():
+    """Memory figures are reported in bytes and add up."""
+    usage = read_memory(os.getpid())
+
+    assert usage["rss"] > 0
+    assert usage["shared"] + usage["private"] == pytest.approx(usage["rss"], rel=0.05)
+
+
+def test_read_memory_of_missing_process():
+    """A process that does not exist has no memory figures."""
+    assert read_memory(2 ** 22 + 1) is None
+
+
+def test_bind_socket_is_inheritable():
+    """The listening socket survives into forked workers."""
+    sock = bind_socket("127.0.0.1", 0)
+    try:
+        assert sock.get_inheritable()
+        assert sock.getsockname()[1] > 0
+    finally:
+        sock.close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_workers_dying_on_startup_are_restarted_with_backoff(monkeypatch):
+    """Quick deaths double the restart delay; a worker that ran a while resets it."""
+    clock = FakeClock()
+    supervisor = WorkerSupervisor(None, None, workers=1, clock=clock)
+    pids = iter(range(100, 200))
+    monkeypatch.setattr(supervisor, "_spawn", lambda: next(pids))
+    exited = []
+    monkeypatch.setattr(
+        serve.os, "waitpid",
+        lambda pid, options: (exited.pop(), 256) if exited else (0, 0)
+    )
+
+    def die_after(seconds):
+        clock.now += seconds
+        exited.append(supervisor.pids[0])
+        supervisor._reap()
+        delay = supervisor._restarts[0] - clock.now
+        supervisor._restart_due()
+        assert supervisor.pids == [] or delay == 0
+        clock.now += delay
+        supervisor._restart_due()
+        assert len(supervisor.pids) == 1
+        return delay
+
+    supervisor._start_worker()
+    assert [die_after(1) for _ in range(8)] == [0.5, 1, 2, 4, 8, 16, 30, 30]
+    assert die_after(60) == 0
+    assert die_after(1) == 0.5
+
+
+# ---------------------- #
+# ✅ TEST END-TO-END SERVING
+# ---------------------- #
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_json(url, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                return json.loads(response.read())
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_serve_forks_workers_sharing_the_model(tmp_path, sample_chatbot_data):
+    """Workers answer requests and stop cleanly on SIGTERM."""
+    dataset = tmp_path / "data-bot.json"
+    dataset.write_text(json.dumps(sample_chatbot_data), encoding="utf-8")
+    port = _free_port()
+    env = dict(os.environ, CHATBOT_DATA_PATH=str(dataset))
+
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "app.cli.serve",
+            "--host", "127.0.0.1", "--port", str(port), "--workers", "2",
+            "--memory-report-interval", "0", "--log-level", "warning",
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+    try:
+        health = _get_json(f"http://127.0.0.1:{port}/api/v1/health")
+        assert health["status"] == "healthy"
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
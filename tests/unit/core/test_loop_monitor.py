@@ -0,0 +1,65 @@
+"""Unit tests for the event loop lag monitor."""
+
+# ✅ Standard Library Imports
+import asyncio
+import logging
+import time
+
+# ✅ Third-Party Imports
+from fastapi.testclient import TestClient
+
+# ✅ Local Application Imports
+from app.core.config import settings
+from app.core.loop_monitor import LoopLagMonitor
+from app.main import create_app
+
+
+def _block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+async def _run(monitor, blocks, seconds):
+    monitor.start()
+    await asyncio.sleep(0.05)
+    for _ in range(blocks):
+        _block_the_loop(seconds)
+        await asyncio.sleep(0.05)
+    await monitor.stop()
+
+
+def test_lag_is_recorded_in_the_histogram():
+    """Every probe wake-up adds a sample; a blocked loop adds a large one."""
+    monitor = LoopLagMonitor(interval=0.01, block_threshold=10)
+    asyncio.run(_run(monitor, blocks=1, seconds=0.2))
+
+    stats = monitor.get_stats()
+    assert stats["samples"] >= 2
+    assert stats["max_lag_seconds"] >= 0.15
+    assert sum(b["samples"] for b in stats["lag_histogram"]) == stats["samples"]
+    assert stats["blocked"] == 0 and not stats["running"]
+
+
+def test_blocking_call_is_caught_with_its_stack(caplog):
+    """The watchdog captures the blocking function and logs once per interval."""
+    monitor = LoopLagMonitor(interval=0.01, block_threshold=0.05, log_interval=60)
+    with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+        asyncio.run(_run(monitor, blocks=2, seconds=0.2))
+
+    stats = monitor.get_stats()
+    assert stats["blocked"] == 2
+    assert "_block_the_loop" in stats["last_block"]["stack"][-1]
+    warnings = [r for r in caplog.records if "Event loop blocked" in r.getMessage()]
+    assert len(warnings) == 1
+    assert "_block_the_loop" in warnings[0].getMessage()
+
+
+def test_admin_endpoint_reports_the_monitor(monkeypatch):
+    """The lifespan starts the monitor and the admin route exposes its stats."""
+    monkeypatch.setattr(settings, "ADMIN_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+    with TestClient(create_app(), headers=headers) as client:
+        time.sleep(0.3)
+        stats = client.get("/api/v1/admin/event-loop").json()
+    assert stats["running"]
+    assert stats["samples"] >= 1
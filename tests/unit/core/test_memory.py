@@ -0,0 +1,71 @@
+"""Unit tests for memory size estimates and tracemalloc snapshots."""
+
+# ✅ Standard Library Imports
+import sys
+import tracemalloc
+
+# ✅ Local Application Imports
+from app.core.memory import (
+    MemoryTracer,
+    deep_sizeof,
+    mapping_bytes,
+    sequence_bytes,
+)
+
+
+# ---------------------- #
+# ✅ TEST SIZE ESTIMATES
+# ---------------------- #
+
+def test_deep_sizeof_counts_shared_objects_once():
+    """A string held twice counts once; excluded objects are skipped."""
+    text = "x" * 1000
+    inner = [text]
+    value = {"a": inner, "b": text}
+
+    assert deep_sizeof(value) == (
+        sys.getsizeof(value) + sys.getsizeof("a") + sys.getsizeof("b")
+        + sys.getsizeof(inner) + sys.getsizeof(text)
+    )
+    assert deep_sizeof(value, exclude={id(inner)}) == (
+        deep_sizeof(value) - sys.getsizeof(inner)
+    )
+
+
+def test_sampled_estimates_of_uniform_containers_are_exact():
+    """Items of one size are extrapolated exactly from any sample."""
+    items = [f"question {i:06d}" for i in range(10_000)]
+    mapping = {item: item.upper() for item in items}
+
+    exact = sys.getsizeof(items) + sum(sys.getsizeof(item) for item in items)
+    assert sequence_bytes(items, sample=50) == exact
+    assert sequence_bytes(items[:10], sample=50) == (
+        sys.getsizeof(items[:10]) + sum(sys.getsizeof(item) for item in items[:10])
+    )
+    assert mapping_bytes(mapping, sample=50) == (
+        sys.getsizeof(mapping) + 2 * (exact - sys.getsizeof(items))
+    )
+    assert mapping_bytes({}, sample=50) == sys.getsizeof({})
+
+
+# ---------------------- #
+# ✅ TEST SNAPSHOTS
+# ---------------------- #
+
+def test_snapshots_report_allocation_growth():
+    """The second snapshot names the line that allocated since the first."""
+    tracer = MemoryTracer()
+    first = tracer.snapshot()
+    assert first["differences"] == [] and first["compared_to"] is None
+    assert tracer.tracing
+
+    kept = [bytearray(1000) for _ in range(1000)]
+    second = tracer.snapshot(top=5)
+    assert second["compared_to"] == first["taken_at"]
+    grown = second["differences"][0]
+    assert grown["location"][-1].startswith(__file__)
+    assert grown["size_diff_bytes"] >= 1000 * 1000
+
+    tracer.stop()
+    assert not tracemalloc.is_tracing()
+    del kept
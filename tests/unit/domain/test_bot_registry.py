@@ -0,0 +1,130 @@
+"""Unit tests for BotRegistry."""
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.core.exceptions import BotNotFoundException
+from app.core.memory import DEFAULT_SAMPLE
+from app.domain.services.bots import BotRegistry
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.nlp.engine import warm_up
+from app.infrastructure.repositories.memory.session import InMemorySessionRepository
+
+MODEL_BYTES = 1 << 20
+
+
+class SizedChatbot(ChatbotService):
+    """A chatbot whose model takes a known size on top of its own estimate."""
+
+    def get_memory_usage(self, sample=DEFAULT_SAMPLE):
+        usage = super().get_memory_usage(sample)
+        usage["ballast"] = MODEL_BYTES
+        return usage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def built():
+    """Names of the bots built, in order."""
+    return []
+
+
+@pytest.fixture
+def make_registry(sample_chatbot_data, built, clock):
+    def make(**options):
+        def build(name):
+            built.append(name)
+            return SizedChatbot(data=sample_chatbot_data)
+
+        return BotRegistry(
+            ["a", "b", "c"],
+            build=build,
+            build_sessions=lambda name: InMemorySessionRepository(),
+            prepare=warm_up,
+            clock=clock,
+            **options
+        )
+    return make
+
+
+# ---------------------- #
+# ✅ TEST LOADING
+# ---------------------- #
+
+def test_bots_are_loaded_once_on_first_use(make_registry, built):
+    """A bot's model is built by its first request and then reused."""
+    registry = make_registry()
+    assert built == []
+
+    first = registry.get("a")
+    assert registry.get("a") is first
+    assert built == ["a"]
+
+    status = {bot["name"]: bot for bot in registry.get_status()["bots"]}
+    assert status["a"]["loaded"] and status["a"]["requests"] == 2
+    assert status["a"]["loads"] == 1
+    assert MODEL_BYTES <= status["a"]["memory_bytes"] < 2 * MODEL_BYTES
+    assert not status["b"]["loaded"] and status["b"]["idle_seconds"] is None
+
+
+def test_unknown_bot_raises(make_registry):
+    """Only configured bots are served."""
+    registry = make_registry()
+    with pytest.raises(BotNotFoundException):
+        registry.get("z")
+    with pytest.raises(BotNotFoundException):
+        registry.sessions("z")
+
+
+# ---------------------- #
+# ✅ TEST EVICTION
+# ---------------------- #
+
+def test_least_recently_used_bot_is_evicted_over_budget(make_registry, built):
+    """Loading a bot past the budget drops the model used longest ago."""
+    registry = make_registry(memory_budget=int(2.5 * MODEL_BYTES))
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+
+    status = {bot["name"]: bot for bot in registry.get_status()["bots"]}
+    assert [name for name in "abc" if status[name]["loaded"]] == ["a", "c"]
+    assert status["b"]["evictions"] == 1
+
+    registry.get("b")
+    assert built == ["a", "b", "c", "b"]
+
+
+def test_idle_bots_are_evicted_but_keep_their_sessions(make_registry, clock, built):
+    """An idle model is dropped, while its bot's sessions stay."""
+    registry = make_registry(idle_seconds=60)
+    registry.get("a")
+    sessions = registry.sessions("a")
+    assert sessions is not registry.sessions("b")
+
+    clock.now += 30
+    registry.get("b")
+    clock.now += 45
+    registry.evict_idle()
+
+    status = {bot["name"]: bot for bot in registry.get_status()["bots"]}
+    assert not status["a"]["loaded"] and status["b"]["loaded"]
+    assert status["a"]["idle_seconds"] == 75
+    assert registry.sessions("a") is sessions
+
+    registry.get("a")
+    assert built == ["a", "b", "a"]
@@ -0,0 +1,91 @@
+"""Unit tests for ChatbotReloader."""
+
+# ✅ Standard Library Imports
+import json
+import os
+import threading
+import time
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.domain.services.chatbot import ChatbotService
+from app.domain.services.reloader import ChatbotReloader
+
+
+@pytest.fixture
+def published():
+    """Collects every service handed to the publish callback."""
+    return []
+
+
+def test_reload_publishes_new_model(sample_chatbot_data, published):
+    """A successful reload swaps in the freshly built service."""
+    reloader = ChatbotReloader(
+        build=lambda: ChatbotService(data=sample_chatbot_data),
+        publish=published.append
+    )
+
+    assert reloader.reload()
+    assert len(published) == 1
+    assert reloader.version == 1
+    assert reloader.get_status()["status"] == "idle"
+
+
+def test_failed_reload_keeps_current_model(published):
+    """A build error leaves the published model untouched."""
+    def broken_build():
+        raise ValueError("bad dataset")
+
+    reloader = ChatbotReloader(build=broken_build, publish=published.append)
+
+    assert not reloader.reload()
+    assert published == []
+    assert reloader.get_status()["status"] == "failed"
+    assert reloader.get_status()["last_error"] == "bad dataset"
+
+
+def test_background_reload_holds_the_lock_until_done(sample_chatbot_data, published):
+    """A second reload is refused as soon as the first one is accepted."""
+    release = threading.Event()
+
+    def slow_build():
+        release.wait(5)
+        return ChatbotService(data=sample_chatbot_data)
+
+    reloader = ChatbotReloader(build=slow_build, publish=published.append)
+    assert reloader.reload_in_background()
+    assert not reloader.reload_in_background()
+    assert not reloader.reload()
+
+    release.set()
+    deadline = time.time() + 5
+    while reloader.version == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(published) == 1
+
+
+def test_watch_reloads_on_file_change(tmp_path, sample_chatbot_data, published):
+    """Changing the watched dataset file triggers a reload."""
+    dataset = tmp_path / "data.json"
+    dataset.write_text(json.dumps(sample_chatbot_data))
+
+    def build():
+        return ChatbotService(data=json.loads(dataset.read_text()))
+
+    reloader = ChatbotReloader(build=build, publish=published.append)
+    reloader.start_watching(str(dataset), interval_seconds=0.01)
+    try:
+        sample_chatbot_data["dialogues"] = sample_chatbot_data["dialogues"][:1]
+        dataset.write_text(json.dumps(sample_chatbot_data))
+        os.utime(dataset, (time.time() + 10, time.time() + 10))
+
+        deadline = time.time() + 5
+        while not published and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        reloader.stop_watching()
+
+    assert published
+    assert len(published[-1].questions) == 2
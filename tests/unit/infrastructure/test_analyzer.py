@@ -0,0 +1,89 @@
+"""Equivalence tests of the cached analyzer and scikit-learn's TfidfVectorizer."""
+
+# ✅ Standard Library Imports
+import random
+
+# ✅ Third-Party Imports
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+# ✅ Local Application Imports
+from app.infrastructure.nlp.analyzer import MAX_CACHED_CHUNK, build_analyzer
+from app.infrastructure.nlp.tfidf import TfidfMatcher
+
+# Characters whose normalization changes length, case or token boundaries
+TRICKY = [
+    "e\u0301",  # e + combining acute, joined to the next letters once stripped
+    "\u00a8",   # diaeresis, decomposed to a space and a combining mark
+    "\u00bd",   # one half, decomposed around a fraction slash
+    "\ufb01",   # fi ligature
+    "\u0130",   # dotted capital I, lowercased to two characters
+    "\u03a3",   # capital sigma, lowercased by context
+    "\u00a0",   # no-break space
+    "\u2003",   # em space
+    "\u00df",   # sharp s
+    "\uff21",   # fullwidth A
+    "_", "-", "'", "?", "1",
+]
+ALPHABET = list("abcd\u00e9\u00f8\u00e5  ") + TRICKY
+
+REFERENCE = CountVectorizer(
+    strip_accents='unicode', lowercase=True, ngram_range=(1, 2)
+).build_analyzer()
+
+
+def _random_texts(n_texts, seed):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choices(ALPHABET, k=rng.randint(0, 40))) for _ in range(n_texts)
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    "Crème brûlée et ½ CAFÉ",
+    "ΟΔΟΣ ΣΟΦΟΣ¨x",
+    "İstanbul ﬁne Straße",
+    "tab\tnew\nline\x1cfile separator",
+    "x" * (MAX_CACHED_CHUNK + 5) + "é",
+])
+def test_analyzer_matches_sklearn_on_tricky_text(text):
+    """Normalizing chunk by chunk gives the features of the whole text."""
+    assert build_analyzer((1, 2))(text) == REFERENCE(text)
+
+
+def test_analyzer_matches_sklearn_on_random_text():
+    """Random mixes of tricky characters give scikit-learn's features, twice."""
+    analyze = build_analyzer((1, 2))
+    for text in _random_texts(2000, seed=0):
+        assert analyze(text) == REFERENCE(text)
+        assert analyze(text) == REFERENCE(text)  # now from the cache
+
+
+def test_vectors_equal_tfidf_vectorizer():
+    """Rows built through the feature lookup equal TfidfVectorizer's rows."""
+    questions = _random_texts(500, seed=1)
+    queries = _random_texts(500, seed=2) + questions[:50]
+    vectorizer = TfidfVectorizer(
+        min_df=1, strip_accents='unicode', lowercase=True, ngram_range=(1, 2)
+    )
+    vectorizer.fit(questions)
+    matcher = TfidfMatcher(questions)
+
+    # Both number features in sorted order, so the columns line up
+    assert matcher.vocabulary == vectorizer.vocabulary_
+    expected = vectorizer.transform(queries)
+    actual = matcher.transform(queries)
+    np.testing.assert_allclose(actual.toarray(), expected.toarray(), atol=1e-12)
+
+
+def test_single_message_row_equals_the_matrix_row():
+    """The row score() builds without a sparse matrix is the row of transform()."""
+    questions = _random_texts(300, seed=3)
+    matcher = TfidfMatcher(questions)
+    for query in _random_texts(200, seed=4) + questions[:20]:
+        expected = matcher.transform([query]).toarray().ravel()
+        features, weights = matcher._vectorize(query)
+        actual = np.zeros_like(expected)
+        actual[features] = weights
+        np.testing.assert_allclose(actual, expected, atol=1e-15)
@@ -0,0 +1,138 @@
+"""Unit tests for the dataset loader, compiler and compiled artifact."""
+
+# ✅ Standard Library Imports
+import io
+import json
+import os
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.core.exceptions import DataLoadingException, DatasetValidationError
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.data.loaders.artifact import read_artifact
+from app.infrastructure.data.loaders.chatbot_data import load_dataset
+from app.infrastructure.data.loaders.compiler import compile_dataset
+from app.infrastructure.data.loaders.stream import iter_sections
+
+
+def _snapshot(dataset):
+    """Comparable view of a compiled dataset."""
+    intents = dataset.intents
+    return (
+        dataset.language,
+        dataset.questions,
+        intents.question_intents.tolist(),
+        intents.names,
+        {
+            language: [intents.replies(i, language) for i in range(len(intents))]
+            for language in intents.languages
+        },
+        dataset.keyword_rules,
+    )
+
+
+@pytest.fixture
+def dataset_file(tmp_path, sample_chatbot_data):
+    path = tmp_path / "data-bot.json"
+    path.write_text(json.dumps(sample_chatbot_data, indent=2), encoding="utf-8")
+    return path
+
+
+# ---------------------- #
+# Streaming reader
+# ---------------------- #
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_sections_matches_json_load(sample_chatbot_data, chunk_size):
+    """Entries are yielded one by one, whatever the chunk boundaries."""
+    sample_chatbot_data["version"] = 12345
+    text = json.dumps(sample_chatbot_data, indent=1, ensure_ascii=False)
+
+    rebuilt = {}
+    for key, index, item in iter_sections(io.StringIO(text), chunk_size=chunk_size):
+        if index is None:
+            rebuilt[key] = item
+        else:
+            rebuilt.setdefault(key, []).append(item)
+
+    assert rebuilt == sample_chatbot_data
+
+
+def test_iter_sections_rejects_truncated_file():
+    """Malformed JSON is reported as an error."""
+    with pytest.raises(ValueError):
+        list(iter_sections(io.StringIO('{"dialogues": [{"id": "a"}, '), chunk_size=4))
+
+
+# ---------------------- #
+# Validation
+# ---------------------- #
+
+def test_validation_reports_precise_paths(sample_chatbot_data):
+    """Every problem is collected with the path of the offending value."""
+    sample_chatbot_data["dialogues"][1]["replies"]["en"] = "Not a list"
+    sample_chatbot_data["dialogues"][2]["samples"]["en"].append(42)
+    del sample_chatbot_data["keywords"][0]["id"]
+    sample_chatbot_data["fallbacks"] = {"replies": {}}
+
+    with pytest.raises(DatasetValidationError) as exc_info:
+        compile_dataset(sample_chatbot_data, "en")
+
+    assert exc_info.value.errors == [
+        "dialogues[1].replies.en: expected a list, got string",
+        "dialogues[2].samples.en[1]: expected a string, got number",
+        "keywords[0].id: missing",
+        "fallbacks: expected a list, got object",
+    ]
+
+
+def test_invalid_json_is_a_loading_error(tmp_path):
+    """Syntax errors surface as DataLoadingException instead of empty data."""
+    path = tmp_path / "broken.json"
+    path.write_text('{"dialogues": [', encoding="utf-8")
+
+    with pytest.raises(DataLoadingException):
+        load_dataset(str(path))
+
+
+# ---------------------- #
+# Compiled artifact
+# ---------------------- #
+
+def test_artifact_round_trip(dataset_file, sample_chatbot_data):
+    """The compiled artifact loads back to the same dataset."""
+    compiled = load_dataset(str(dataset_file))
+    artifact = dataset_file.with_suffix(".bin")
+    assert artifact.exists()
+
+    loaded = read_artifact(str(artifact))
+    assert _snapshot(loaded) == _snapshot(compiled)
+    assert _snapshot(loaded) == _snapshot(compile_dataset(sample_chatbot_data, "en"))
+
+
+def test_artifact_is_reused_until_source_changes(dataset_file, sample_chatbot_data):
+    """A stale artifact is recompiled from the source."""
+    load_dataset(str(dataset_file))
+    artifact = dataset_file.with_suffix(".bin")
+    compiled_at = artifact.stat().st_mtime_ns
+
+    assert len(load_dataset(str(dataset_file)).questions) == 5
+    assert artifact.stat().st_mtime_ns == compiled_at
+
+    sample_chatbot_data["dialogues"] = sample_chatbot_data["dialogues"][:1]
+    dataset_file.write_text(json.dumps(sample_chatbot_data), encoding="utf-8")
+    os.utime(dataset_file, ns=(compiled_at + 10**9, compiled_at + 10**9))
+
+    assert len(load_dataset(str(dataset_file)).questions) == 2
+
+
+def test_chatbot_from_compiled_dataset(dataset_file):
+    """A chatbot built from the artifact answers like one built from the JSON."""
+    load_dataset(str(dataset_file))
+    chatbot = ChatbotService(dataset=load_dataset(str(dataset_file)))
+
+    assert chatbot.process_message("When are you open?") == "We are open from 9 to 17."
+    assert chatbot.process_message("thanks a lot") == "You're welcome!"
+    assert chatbot.get_greeting("nb") == "Hallo! Jeg er en chatbot!"
@@ -0,0 +1,58 @@
+"""Unit tests for the consistent hash ring and sharded session ids."""
+
+# ✅ Standard Library Imports
+from collections import Counter
+from uuid import uuid4
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.domain.entities.session import SESSION_SHARDS, new_session_id, session_shard
+from app.infrastructure.cluster.ring import HashRing
+
+KEYS = [f"shard-{shard}" for shard in range(SESSION_SHARDS)]
+
+
+def test_keys_are_spread_evenly():
+    """Virtual nodes give every node a similar share of the keys."""
+    ring = HashRing(["a", "b", "c", "d"], vnodes=64)
+    shares = Counter(ring.owner(key) for key in KEYS)
+    assert set(shares) == {"a", "b", "c", "d"}
+    assert max(shares.values()) < 1.5 * len(KEYS) / 4
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    """About a quarter of the keys move to a fourth node, and no others move."""
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.owner(key) for key in KEYS}
+    ring.add("d")
+    moved = {key for key in KEYS if ring.owner(key) != before[key]}
+
+    assert all(ring.owner(key) == "d" for key in moved)
+    assert 0.15 < len(moved) / len(KEYS) < 0.35
+
+    ring.remove("d")
+    assert {key: ring.owner(key) for key in KEYS} == before
+
+
+def test_membership_errors():
+    """Nodes are added once and only removed when present."""
+    ring = HashRing(["a"])
+    with pytest.raises(ValueError):
+        ring.add("a")
+    with pytest.raises(ValueError):
+        ring.remove("b")
+    ring.remove("a")
+    with pytest.raises(LookupError):
+        ring.owner("key")
+
+
+def test_session_ids_carry_their_shard():
+    """New ids start with their shard; bare uuids get a stable hashed shard."""
+    assert session_shard(new_session_id(42)) == 42
+    assert 0 <= session_shard(new_session_id()) < SESSION_SHARDS
+
+    legacy = str(uuid4())
+    assert session_shard(legacy) == session_shard(legacy)
+    assert 0 <= session_shard(legacy) < SESSION_SHARDS
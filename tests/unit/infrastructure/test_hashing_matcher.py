@@ -0,0 +1,87 @@
+"""Unit tests for HashingMatcher."""
+
+# ✅ Third-Party Imports
+import numpy as np
+import pytest
+
+# ✅ Local Application Imports
+from app.core.config import settings
+from app.infrastructure.nlp.engine import build_matcher
+from app.infrastructure.nlp.hashing import HashingMatcher
+from app.infrastructure.nlp.tfidf import TfidfMatcher
+
+QUESTIONS = [
+    "what are your opening hours",
+    "when are you open",
+    "tell me a joke",
+    "do you know any jokes",
+    "how is the weather today",
+    "hvordan går det med deg",
+]
+
+NEW_QUESTIONS = ["where is the café located", "what is your address"]
+
+QUERIES = ["opening hours", "any good jokes?", "weather", "café address", "zzz"]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_scores_match_tfidf_without_collisions(query):
+    """With no colliding features, hashing scores like the vocabulary."""
+    matcher = HashingMatcher(QUESTIONS)
+    np.testing.assert_allclose(
+        matcher.score(query), TfidfMatcher(QUESTIONS).score(query), atol=1e-12
+    )
+
+
+def test_builds_from_a_generator_without_a_vocabulary():
+    """Questions are consumed once and no terms are kept."""
+    matcher = HashingMatcher(question for question in QUESTIONS)
+
+    assert matcher.n_documents == len(QUESTIONS)
+    assert matcher.vocabulary == {}
+    assert matcher.score("tell me a joke").argmax() == 2
+
+
+def test_colliding_features_still_match():
+    """A tiny feature space merges features but keeps scoring."""
+    matcher = HashingMatcher(QUESTIONS, n_features=64)
+
+    assert matcher.question_vectors.shape == (len(QUESTIONS), 64)
+    assert matcher.score("how is the weather today").argmax() == 4
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_compaction_matches_full_refit(query):
+    """Added questions, once compacted, score like a model built on all of them."""
+    matcher = HashingMatcher(QUESTIONS, compaction_ratio=10)
+    matcher.add_documents(NEW_QUESTIONS)
+    matcher.compact()
+
+    expected = HashingMatcher(QUESTIONS + NEW_QUESTIONS).score(query)
+    np.testing.assert_allclose(matcher.score(query), expected, atol=1e-12)
+
+
+def test_saved_model_scores_like_the_fitted_one(tmp_path):
+    """A saved model loads back with equal scores, for the same feature space only."""
+    matcher = HashingMatcher(QUESTIONS, n_features=1 << 16)
+    path = str(tmp_path / "model.npz")
+    matcher.save(path, fingerprint="abc")
+
+    loaded = HashingMatcher.load(path, fingerprint="abc", n_features=1 << 16)
+    for query in QUERIES:
+        np.testing.assert_allclose(loaded.score(query), matcher.score(query))
+
+    assert HashingMatcher.load(path, n_features=1 << 20) is None
+    assert TfidfMatcher.load(path) is None
+
+
+def test_build_matcher_selects_hashing(tmp_path, monkeypatch):
+    """NLP_ENGINE=hashing builds and reloads a hashing model."""
+    monkeypatch.setattr(settings, "NLP_ENGINE", "hashing")
+    path = str(tmp_path / "model.npz")
+    build_matcher(QUESTIONS, path)
+
+    monkeypatch.setattr(HashingMatcher, "__init__", None)
+    loaded = build_matcher(QUESTIONS, path)
+    assert isinstance(loaded, HashingMatcher)
+    assert loaded.n_documents == len(QUESTIONS)
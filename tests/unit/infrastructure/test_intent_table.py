@@ -0,0 +1,48 @@
+"""Unit tests for IntentTable."""
+
+# ✅ Local Application Imports
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.data.intents import IntentTable
+
+
+def test_reserved_intents():
+    """Greetings and fallbacks always exist, even without replies."""
+    table = IntentTable()
+
+    assert table.intent_id("greeting") == IntentTable.GREETING
+    assert table.intent_id("fallback") == IntentTable.FALLBACK
+    assert table.choose_reply(IntentTable.GREETING, "en") is None
+
+
+def test_replies_are_interned_and_per_language():
+    """Identical replies of different intents share one string object."""
+    table = IntentTable()
+    first = table.add_intent("a", {"en": ["".join(["Sure", "!"])], "nb": ["Ja!"]})
+    second = table.add_intent("b", {"en": ["".join(["Sure", "!"])]})
+
+    assert table.replies(first, "en")[0] is table.replies(second, "en")[0]
+    assert table.replies(second, "nb") == ()
+    assert table.replies(first, "fr") == ()
+
+
+def test_question_intents_grow():
+    """Question indices map to intents as an int32 array."""
+    table = IntentTable()
+    first = table.add_intent("a", {"en": ["A"]})
+    second = table.add_intent("b", {"en": ["B"]})
+    table.add_questions(first, 10)
+    table.add_questions(second, 20)
+
+    assert table.question_intents.dtype.name == "int32"
+    assert len(table.question_intents) == 30
+    assert table.intent_of(9) == first
+    assert table.intent_of(10) == second
+
+
+def test_chatbot_draws_replies_per_request(sample_chatbot_data):
+    """Every reply of a dialogue stays reachable after loading."""
+    sample_chatbot_data["dialogues"][1]["replies"]["en"] = ["One", "Two", "Three"]
+    chatbot = ChatbotService(data=sample_chatbot_data)
+
+    replies = {chatbot.process_message("tell me a joke") for _ in range(200)}
+    assert replies == {"One", "Two", "Three"}
@@ -0,0 +1,72 @@
+"""Unit tests for KeywordRouter and keyword pre-routing."""
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.nlp.keywords import KeywordRouter
+
+
+@pytest.fixture
+def router():
+    return KeywordRouter({
+        "greeting": ["hi", "hello", "good morning"],
+        "thanks": ["thank you", "thanks", "takk"],
+        "bye": ["bye", "ha det bra"],
+    })
+
+
+@pytest.mark.parametrize(
+    "message, expected_intent",
+    [
+        ("Hi there!", "greeting"),
+        ("HELLO", "greeting"),
+        ("well, good morning to you", "greeting"),
+        ("thank you so much", "thanks"),
+        ("Takk!", "thanks"),
+        ("ok ha det bra", "bye"),
+        # Whole tokens only: no match inside other words
+        ("which one is this?", None),
+        ("thankyou", None),
+        ("good evening", None),
+        ("ha det", None),
+        ("", None),
+    ],
+)
+def test_route(router, message, expected_intent):
+    """Phrases are matched on token boundaries."""
+    assert router.route(message) == expected_intent
+
+
+def test_partial_phrase_falls_back_to_suffix():
+    """A failed longer phrase still finds a shorter phrase ending at the same token."""
+    router = KeywordRouter({"long": ["a b c"], "short": ["b d"]})
+    assert router.route("a b d") == "short"
+
+
+def test_first_match_wins(router):
+    """The earliest phrase in the message decides the intent."""
+    assert router.route("thanks and bye") == "thanks"
+
+
+# ---------------------- #
+# ✅ TEST CHATBOT PRE-ROUTING
+# ---------------------- #
+
+def test_chatbot_greets_without_substring_misfires(sample_chatbot_data):
+    """Greetings short-circuit, but words containing a greeting do not."""
+    chatbot = ChatbotService(data=sample_chatbot_data)
+
+    assert chatbot.process_message("hi!") == "Hello! I am a chatbot!"
+    assert chatbot.process_message(
+        "which jokes do you know?"
+    ) != "Hello! I am a chatbot!"
+
+
+def test_chatbot_routes_dataset_keywords(sample_chatbot_data):
+    """Keyword rules from the dataset route to their replies in any language."""
+    chatbot = ChatbotService(data=sample_chatbot_data)
+
+    assert chatbot.process_message("ok, bye") == "Goodbye!"
+    assert chatbot.process_message("tusen takk") == "You're welcome!"
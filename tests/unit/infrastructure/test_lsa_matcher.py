@@ -0,0 +1,163 @@
+"""Unit tests for LsaMatcher."""
+
+# ✅ Standard Library Imports
+import random
+
+# ✅ Third-Party Imports
+import numpy as np
+import pytest
+
+# ✅ Local Application Imports
+from app.core.config import settings
+from app.infrastructure.nlp.engine import build_matcher
+from app.infrastructure.nlp.lsa import LsaMatcher
+from app.infrastructure.nlp.tfidf import TfidfMatcher
+
+QUESTIONS = [
+    "what are your opening hours",
+    "when are you open",
+    "tell me a joke",
+    "do you know any jokes",
+    "how is the weather today",
+    "hvordan går det med deg",
+]
+
+QUERIES = ["opening hours", "a joke please", "weather today", "går det"]
+
+TOPICS = [
+    "pizza pasta cheese tomato oven",
+    "train ticket station platform delay",
+    "invoice payment refund card bank",
+    "password login account email reset",
+    "weather rain sun forecast wind",
+    "doctor appointment clinic fever cough",
+]
+
+
+def _synthetic_corpus(n_questions, seed=0):
+    """Questions made of words from one topic plus a few shared filler words."""
+    rng = random.Random(seed)
+    fillers = "please can you help me with my the a".split()
+    questions = []
+    for i in range(n_questions):
+        words = TOPICS[i % len(TOPICS)].split()
+        questions.append(" ".join(rng.sample(words, 3) + rng.sample(fillers, 2)))
+    return questions
+
+
+# ---------------------- #
+# ✅ TEST SCORING
+# ---------------------- #
+
+def test_embeddings_are_normalized_float32_rows():
+    """Questions are stored as one contiguous float32 matrix of unit rows."""
+    matcher = LsaMatcher(QUESTIONS, rank=4)
+    embeddings = matcher._embeddings
+
+    assert embeddings.dtype == np.float32
+    assert embeddings.flags["C_CONTIGUOUS"]
+    assert embeddings.shape == (len(QUESTIONS), 4)
+    np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, rtol=1e-5)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_full_rank_matches_like_tfidf(query):
+    """Without truncation the latent space keeps TF-IDF's best match."""
+    lsa = LsaMatcher(QUESTIONS, rank=256)
+    tfidf = TfidfMatcher(QUESTIONS)
+
+    assert lsa.rank == len(QUESTIONS)
+    assert lsa.score(query).argmax() == tfidf.score(query).argmax()
+
+
+def test_truncated_rank_agrees_with_tfidf():
+    """A rank below the corpus size keeps the winning topic of nearly every query."""
+    questions = _synthetic_corpus(300)
+    queries = _synthetic_corpus(120, seed=1)
+    lsa = LsaMatcher(questions, rank=8)
+    tfidf = TfidfMatcher(questions)
+
+    lsa_best, _ = lsa.best_matches(queries)
+    tfidf_best, _ = tfidf.best_matches(queries)
+    topic = np.arange(len(questions)) % len(TOPICS)
+    agreement = np.mean(topic[lsa_best] == topic[tfidf_best])
+
+    assert lsa.rank == 8
+    assert agreement >= 0.95
+
+
+def test_best_matches_agrees_with_score():
+    """Batch matching returns the same winners as scoring one by one."""
+    matcher = LsaMatcher(QUESTIONS, rank=4)
+    indices, scores = matcher.best_matches(QUERIES)
+
+    for query, index, score in zip(QUERIES, indices, scores):
+        single = matcher.score(query)
+        assert index == single.argmax()
+        assert score == pytest.approx(single.max(), rel=1e-5)
+
+
+def test_unknown_text_scores_zero():
+    """A message without known features matches nothing."""
+    matcher = LsaMatcher(QUESTIONS, rank=4)
+    assert not matcher.score("zzz").any()
+
+
+def test_added_documents_are_folded_in():
+    """New questions are matchable through the terms the model already knows."""
+    matcher = LsaMatcher(QUESTIONS, rank=256)
+    matcher.add_documents(["is the weather nice", "any weather jokes"])
+
+    scores = matcher.score("is the weather nice")
+    assert scores.shape == (len(QUESTIONS) + 2,)
+    assert scores[len(QUESTIONS)] == pytest.approx(1.0, rel=1e-5)
+    assert matcher.score("any jokes")[len(QUESTIONS) + 1] > 0
+
+
+# ---------------------- #
+# ✅ TEST PERSISTENCE AND ENGINE SELECTION
+# ---------------------- #
+
+def test_memory_usage_counts_the_arrays():
+    """Array parts report their buffers; the vocabulary is estimated."""
+    matcher = LsaMatcher(QUESTIONS, rank=4)
+    usage = matcher.memory_usage(sample=8)
+
+    assert usage["embeddings"] >= len(QUESTIONS) * matcher.rank * 4
+    assert usage["projection"] == len(matcher.vocabulary) * matcher.rank * 4
+    assert usage["vocabulary"] > 0
+
+
+def test_saved_model_scores_like_the_fitted_one(tmp_path):
+    """A saved model, including folded-in documents, loads back with equal scores."""
+    matcher = LsaMatcher(QUESTIONS, rank=4)
+    matcher.add_documents(["is the weather nice"])
+    path = str(tmp_path / "model.npz")
+    matcher.save(path, fingerprint="abc")
+
+    loaded = LsaMatcher.load(path, fingerprint="abc", rank=4)
+    for query in QUERIES:
+        np.testing.assert_allclose(loaded.score(query), matcher.score(query))
+
+    assert LsaMatcher.load(path, fingerprint="other") is None
+    assert LsaMatcher.load(path, rank=8) is None
+    assert TfidfMatcher.load(path) is None
+
+
+def test_build_matcher_uses_configured_engine(tmp_path, monkeypatch):
+    """NLP_ENGINE selects the engine, and a model of the other engine is refitted."""
+    path = str(tmp_path / "model.npz")
+    build_matcher(QUESTIONS, path, engine="tfidf")
+
+    monkeypatch.setattr(settings, "NLP_ENGINE", "lsa")
+    monkeypatch.setattr(settings, "LSA_RANK", 4)
+    matcher = build_matcher(QUESTIONS, path)
+
+    assert isinstance(matcher, LsaMatcher)
+    assert isinstance(LsaMatcher.load(path, rank=4), LsaMatcher)
+
+
+def test_build_matcher_rejects_unknown_engine():
+    """A misspelled engine fails loudly."""
+    with pytest.raises(ValueError):
+        build_matcher(QUESTIONS, engine="word2vec")
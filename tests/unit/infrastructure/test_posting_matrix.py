@@ -0,0 +1,105 @@
+"""Unit tests for PostingMatrix and compact TF-IDF scoring matrices."""
+
+# ✅ Standard Library Imports
+import random
+
+# ✅ Third-Party Imports
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# ✅ Local Application Imports
+from app.core.memory import mapping_bytes
+from app.infrastructure.nlp.postings import PostingMatrix
+from app.infrastructure.nlp.tfidf import TfidfMatcher
+
+# Largest score difference between two questions that may swap places
+NEAR_TIE = {"float32": 1e-6, "uint16": 1e-3, "uint8": 2e-2}
+
+
+def _synthetic_corpus(n_questions, seed):
+    """Questions of 3 to 8 words from a small, skewed vocabulary."""
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(400)]
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    return [
+        " ".join(rng.choices(words, weights, k=rng.randint(3, 8)))
+        for _ in range(n_questions)
+    ]
+
+
+def test_scores_equal_the_dense_product():
+    """Summing postings gives every row's dot product with the vector."""
+    rng = np.random.default_rng(0)
+    dense = rng.random((20, 50)) * (rng.random((20, 50)) < 0.2)
+    matrix = PostingMatrix(sp.csr_matrix(dense))
+
+    features = np.array([3, 7, 49, 60], dtype=np.int32)  # 60 is outside the matrix
+    weights = np.array([0.5, 1.0, 2.0, 9.0])
+    expected = dense[:, [3, 7, 49]] @ weights[:3]
+
+    np.testing.assert_allclose(matrix.scores(features, weights), expected)
+    assert not matrix.scores(np.array([60], dtype=np.int32), np.ones(1)).any()
+
+
+def _sklearn_bytes(questions):
+    """Bytes a fitted TfidfVectorizer holds for the same questions."""
+    vectorizer = TfidfVectorizer(strip_accents='unicode', ngram_range=(1, 2))
+    matrix = vectorizer.fit_transform(questions)
+    return (
+        mapping_bytes(vectorizer.vocabulary_)
+        + matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        + vectorizer.idf_.nbytes
+    )
+
+
+def test_counts_round_trip():
+    """Counts stored with the rows come back as the same int32 matrix."""
+    rng = np.random.default_rng(0)
+    counts = sp.csr_matrix(
+        rng.integers(1, 300, (20, 50)) * (rng.random((20, 50)) < 0.2)
+    )
+    matrix = PostingMatrix(counts.astype(np.float64), counts=counts)
+
+    rebuilt = matrix.counts()
+    assert rebuilt.dtype == np.int32
+    assert (rebuilt != counts).nnz == 0
+    assert matrix.counts_nbytes == 2 * counts.nnz  # uint16 fits counts up to 300
+
+
+def test_unknown_dtype_is_rejected():
+    """Only the supported value types can be configured."""
+    with pytest.raises(ValueError):
+        PostingMatrix(sp.csr_matrix(np.eye(3)), dtype="int4")
+
+
+@pytest.mark.parametrize("dtype", ["float32", "uint16", "uint8"])
+def test_compact_dtypes_keep_the_winner_except_near_ties(dtype):
+    """Compact matrices pick the float64 winner unless the two scores nearly tie."""
+    questions = _synthetic_corpus(2000, seed=0)
+    queries = _synthetic_corpus(500, seed=1)
+    reference = TfidfMatcher(questions)
+    compact = TfidfMatcher(questions, dtype=dtype)
+
+    expected, _ = reference.best_matches(queries)
+    actual, _ = compact.best_matches(queries)
+
+    assert compact.matrix_nbytes < reference.matrix_nbytes
+    assert sum(compact.memory_usage().values()) < _sklearn_bytes(questions)
+    assert np.mean(actual == expected) >= 0.95
+    for query, winner, chosen in zip(queries, expected, actual):
+        if winner != chosen:
+            scores = reference.score(query)
+            assert scores[winner] - scores[chosen] <= NEAR_TIE[dtype]
+
+
+def test_compact_dtype_survives_additions_and_compaction():
+    """Added segments and compaction keep the configured dtype."""
+    questions = _synthetic_corpus(200, seed=0)
+    matcher = TfidfMatcher(questions, compaction_ratio=10, dtype="uint8")
+    matcher.add_documents(["brand new question"])
+    matcher.compact()
+
+    assert all(segment.dtype == np.uint8 for segment in matcher._segments)
+    assert matcher.score("brand new question").argmax() == len(questions)
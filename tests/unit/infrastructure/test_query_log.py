@@ -0,0 +1,194 @@
+"""Unit tests for the sampled query log."""
+
+# ✅ Standard Library Imports
+import gzip
+import json
+import os
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.domain.entities.match import MatchResult
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.analytics.query_log import QueryLog, message_hash
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _match(index=0, confidence=0.9, corrected=None):
+    return MatchResult(
+        question_index=index,
+        confidence=confidence,
+        is_fallback=confidence < 0.2,
+        corrected_message=corrected
+    )
+
+
+def _read(directory):
+    events = []
+    for name in sorted(os.listdir(directory)):
+        with gzip.open(os.path.join(directory, name), "rt") as f:
+            events.extend(json.loads(line) for line in f)
+    return events
+
+
+# ---------------------- #
+# ✅ TEST AGGREGATES
+# ---------------------- #
+
+def test_stats_aggregate_intents_and_fallbacks():
+    """Top intents, fallback rate and minute counts cover the recorded events."""
+    clock = FakeClock()
+    log = QueryLog(sample_rate=1.0, clock=clock)
+    log.record("default", "hours?", "opening-hours", _match(), 0.002)
+    log.record("default", "open?", "opening-hours", _match(), 0.002)
+    log.record("default", "joke", "joke", _match(2), 0.002)
+    clock.now += 60
+    log.record("default", "hmm", None, _match(confidence=0.1), 0.002)
+    log.record("other", "bye", "bye", None, 0.001)
+
+    stats = log.get_stats("default", top=1)
+    assert stats["queries"] == 4
+    assert stats["fallbacks"] == 1
+    assert stats["fallback_rate"] == 0.25
+    assert stats["mean_latency_ms"] == 2.0
+    assert stats["top_intents"] == [
+        {"intent": "opening-hours", "count": 2, "share": 0.5}
+    ]
+    assert [(m["queries"], m["fallbacks"]) for m in stats["minutes"]] == [
+        (3, 0), (1, 1)
+    ]
+    assert log.get_stats("other")["queries"] == 1
+    assert log.get_stats("unknown")["queries"] == 0
+
+
+def test_full_buffer_drops_oldest_events():
+    """A full buffer keeps the newest events and counts the dropped ones."""
+    log = QueryLog(sample_rate=1.0, buffer_size=2)
+    for intent in ["a", "b", "c"]:
+        log.record("default", intent, intent, None, 0.0)
+
+    stats = log.get_stats("default")
+    assert stats["dropped"] == 1
+    assert [entry["intent"] for entry in stats["top_intents"]] == ["b", "c"]
+
+
+def test_sampling_rate_bounds():
+    """A rate of 0 samples nothing and a rate of 1 samples everything."""
+    assert not any(QueryLog(sample_rate=0.0).sampled() for _ in range(100))
+    assert all(QueryLog(sample_rate=1.0).sampled() for _ in range(100))
+
+
+# ---------------------- #
+# ✅ TEST FILES
+# ---------------------- #
+
+def test_flush_writes_hashed_events(tmp_path):
+    """Events are written as gzip NDJSON, with a hash instead of the message."""
+    log = QueryLog(sample_rate=1.0, directory=str(tmp_path))
+    log.record("default", "Tell me a joke ", "joke", _match(2, 0.8, "tell"), 0.0015)
+    log.record("default", "zzz", None, None, 0.001)
+    assert log.flush() == 2
+    log.close()
+
+    first, second = _read(tmp_path)
+    assert first["message_hash"] == message_hash("tell me a joke")
+    assert "Tell me a joke" not in json.dumps(first)
+    assert first["intent"] == "joke"
+    assert first["question_index"] == 2
+    assert first["corrected"] is True
+    assert first["latency_ms"] == 1.5
+    assert second["fallback"] is True and second["confidence"] is None
+    assert log.get_stats("default")["written"] == 2
+
+
+def test_files_rotate_and_oldest_are_deleted(tmp_path):
+    """A file past the rotation size is closed and only the newest files remain."""
+    other_worker = tmp_path / f"queries-{os.getpid() + 1}-20200101T000000.ndjson.gz"
+    with gzip.open(other_worker, "wt") as f:
+        f.write("{}\n")
+    log = QueryLog(
+        sample_rate=1.0, directory=str(tmp_path), rotate_bytes=1, max_files=2
+    )
+    for batch in range(4):
+        log.record("default", f"message {batch}", "joke", None, 0.0)
+        log.flush()
+    log.close()
+
+    other_worker.unlink()  # files of other processes are never pruned
+    assert len(os.listdir(tmp_path)) == 2
+    assert [event["message_hash"] for event in _read(tmp_path)] == [
+        message_hash("message 2"), message_hash("message 3")
+    ]
+
+
+def test_failed_write_keeps_the_events_for_the_next(tmp_path, monkeypatch):
+    """Events of a failed write are written by the next flush, oldest dropped first."""
+    log = QueryLog(sample_rate=1.0, buffer_size=3, directory=str(tmp_path))
+    for message in ["one", "two"]:
+        log.record("default", message, "joke", None, 0.0)
+
+    def failing_rotate():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(log, "_rotate", failing_rotate)
+    with pytest.raises(OSError):
+        log.flush()
+    monkeypatch.undo()
+
+    for message in ["three", "four"]:
+        log.record("default", message, "joke", None, 0.0)
+    assert log.flush() == 3
+    log.close()
+
+    assert [event["message_hash"] for event in _read(tmp_path)] == [
+        message_hash(message) for message in ["two", "three", "four"]
+    ]
+    stats = log.get_stats("default")
+    assert stats["written"] == 3 and stats["dropped"] == 1
+    assert stats["queries"] == 4
+
+
+def test_stats_before_flush_keep_events_for_the_files(tmp_path):
+    """Reading the aggregates does not lose events that are not written yet."""
+    log = QueryLog(sample_rate=1.0, directory=str(tmp_path))
+    log.record("default", "hi", "joke", None, 0.0)
+    assert log.get_stats("default")["queries"] == 1
+    log.close()
+
+    assert len(_read(tmp_path)) == 1
+    assert log.get_stats("default")["queries"] == 1
+
+
+# ---------------------- #
+# ✅ TEST CHATBOT SERVICE
+# ---------------------- #
+
+def test_chatbot_records_sampled_messages(sample_chatbot_data):
+    """Sampled messages are recorded with the intent they were answered with."""
+    chatbot = ChatbotService(data=sample_chatbot_data)
+    chatbot.query_log = QueryLog(sample_rate=1.0)
+    chatbot.bot = "default"
+
+    chatbot.process_message("When are you open?")
+    chatbot.process_message("thanks a lot")
+    chatbot.process_message("qwertyuiop")
+    chatbot.process_message("   ")
+
+    stats = chatbot.query_log.get_stats("default")
+    assert stats["queries"] == 4
+    assert stats["fallbacks"] == 2
+    assert {entry["intent"] for entry in stats["top_intents"]} == {
+        "opening-hours", "thanks"
+    }
+
+    chatbot.query_log.sample_rate = 0.0
+    chatbot.process_message("When are you open?")
+    assert chatbot.query_log.get_stats("default")["queries"] == 4
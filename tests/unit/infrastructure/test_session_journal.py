@@ -0,0 +1,123 @@
+"""Unit tests for the session journal and snapshot persistence."""
+
+# ✅ Standard Library Imports
+import os
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.domain.services.session import SessionService
+from app.infrastructure.repositories.memory.journal import (
+    SNAPSHOT_FILE,
+    JournalLockedError,
+    SessionJournal,
+    _journal_generations,
+    _journal_path,
+)
+from app.infrastructure.repositories.memory.session import InMemorySessionRepository
+
+
+def _open(directory):
+    return InMemorySessionRepository(journal=SessionJournal(str(directory)))
+
+
+def _crash(repository):
+    """Flush the journal and drop it without a final snapshot, as a crash would."""
+    journal = repository._journal
+    journal.flush()
+    journal._file.close()
+    journal._lock_file.close()
+
+
+# ---------------------- #
+# ✅ TEST RESTORE
+# ---------------------- #
+
+def test_journal_replay_restores_every_change(tmp_path):
+    """Creates, appends, updates and deletes survive a crash."""
+    repository = _open(tmp_path)
+    service = SessionService(repository)
+    kept = service.create_session("es")
+    deleted = service.create_session("en")
+    service.add_message_to_history(kept, "hola", "¡hola!")
+    repository.update_session(kept, {"language": "fr"})
+    repository.delete_session(deleted)
+    _crash(repository)
+
+    restored = _open(tmp_path)
+    assert set(restored._sessions) == {kept}
+    session = restored._sessions[kept]
+    assert session["language"] == "fr"
+    assert [turn["user_message"] for turn in session["conversation_history"]] == [
+        "hola"
+    ]
+    assert session["last_activity"] == repository._sessions[kept]["last_activity"]
+
+
+def test_snapshot_plus_journal_tail(tmp_path):
+    """Changes after a snapshot are replayed on top of it."""
+    repository = _open(tmp_path)
+    service = SessionService(repository)
+    session_id = service.create_session("en")
+    service.add_message_to_history(session_id, "before", "snapshot")
+    repository._journal.snapshot(repository.capture_snapshot)
+    service.add_message_to_history(session_id, "after", "snapshot")
+    _crash(repository)
+
+    history = _open(tmp_path)._sessions[session_id]["conversation_history"]
+    assert [turn["user_message"] for turn in history] == ["before", "after"]
+
+
+def test_torn_last_frame_is_ignored(tmp_path):
+    """A partly written last event is dropped, the events before it are kept."""
+    repository = _open(tmp_path)
+    first = repository.create_session()
+    repository.create_session()
+    _crash(repository)
+
+    path = _journal_path(str(tmp_path), repository._journal._generation)
+    os.truncate(path, os.path.getsize(path) - 3)
+
+    assert set(_open(tmp_path)._sessions) == {first}
+
+
+# ---------------------- #
+# ✅ TEST OWNERSHIP AND SHUTDOWN
+# ---------------------- #
+
+def test_directory_has_a_single_owner(tmp_path):
+    """A second journal on a held directory is refused until the first closes."""
+    repository = _open(tmp_path)
+    with pytest.raises(JournalLockedError):
+        _open(tmp_path)
+
+    repository.close_journal()
+    _open(tmp_path).close_journal()
+
+
+def test_close_writes_a_snapshot_and_drops_covered_journals(tmp_path):
+    """After a clean shutdown only the snapshot and the current journal remain."""
+    repository = _open(tmp_path)
+    session_id = repository.create_session("de")
+    repository.close_journal()
+
+    assert os.path.exists(tmp_path / SNAPSHOT_FILE)
+    assert len(_journal_generations(str(tmp_path))) == 1
+    assert _open(tmp_path)._sessions[session_id]["language"] == "de"
+
+
+def test_background_thread_flushes_the_buffer(tmp_path):
+    """Recorded events reach the file without an explicit flush."""
+    journal = SessionJournal(str(tmp_path), flush_interval=0.01)
+    repository = InMemorySessionRepository(journal=journal)
+    repository.start_journal()
+    repository.create_session()
+
+    path = _journal_path(str(tmp_path), journal._generation)
+    for _ in range(200):
+        if os.path.getsize(path):
+            break
+        journal._stop.wait(0.01)
+    assert os.path.getsize(path) > 0
+    repository.close_journal()
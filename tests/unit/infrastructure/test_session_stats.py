@@ -0,0 +1,146 @@
+"""Unit tests for session scans and incrementally maintained statistics."""
+
+# ✅ Standard Library Imports
+from datetime import datetime, timedelta
+
+# ✅ Local Application Imports
+from app.core.memory import deep_sizeof
+from app.domain.services.session import SessionService
+from app.infrastructure.repositories.memory.session import InMemorySessionRepository
+from app.infrastructure.repositories.memory.stats import SessionStats
+
+
+def _recount(repository):
+    """Statistics rebuilt from scratch, to compare with the maintained ones."""
+    stats = SessionStats()
+    for session in repository._sessions.values():
+        stats.add(session)
+    return stats.summary()
+
+
+# ---------------------- #
+# ✅ TEST STATISTICS
+# ---------------------- #
+
+def test_stats_follow_every_change():
+    """Creates, turns, updates, reads and deletes keep the counts exact."""
+    repository = InMemorySessionRepository()
+    service = SessionService(repository)
+    ids = [service.create_session("en") for _ in range(5)]
+    service.create_session("nb")
+    for session_id in ids[:3]:
+        service.add_message_to_history(session_id, "hi", "hello")
+    repository.update_session(ids[0], {"language": "nb"})
+    repository.delete_session(ids[1])
+    repository.get_session(ids[2])
+
+    stats = repository.get_stats()
+    assert stats == _recount(repository)
+    assert stats["total_sessions"] == 5
+    assert stats["total_turns"] == 2
+    assert stats["languages"] == {"en": 3, "nb": 2}
+    assert stats["idle_histogram"][0]["sessions"] == 5
+
+
+def test_histograms_bin_by_age_and_idle_time():
+    """Old and idle sessions land in the bins of their elapsed time."""
+    repository = InMemorySessionRepository()
+    session_id = repository.create_session()
+    session = repository._sessions[session_id]
+    repository._stats.remove(session)
+    session["created_at"] = datetime.now() - timedelta(hours=2)
+    session["last_activity"] = datetime.now() - timedelta(minutes=10)
+    repository._stats.add(session)
+
+    stats = repository.get_stats()
+    age = {b["max_seconds"]: b["sessions"] for b in stats["age_histogram"]}
+    idle = {b["max_seconds"]: b["sessions"] for b in stats["idle_histogram"]}
+    assert age[6 * 3600] == 1 and sum(age.values()) == 1
+    assert idle[900] == 1 and sum(idle.values()) == 1
+
+
+def test_cleanup_uses_the_activity_histogram():
+    """Expired sessions are removed and the statistics follow."""
+    repository = InMemorySessionRepository()
+    kept = repository.create_session()
+    expired = repository.create_session()
+    session = repository._sessions[expired]
+    two_days_ago = datetime.now() - timedelta(days=2)
+    repository._stats.touch(session["last_activity"], two_days_ago)
+    session["last_activity"] = two_days_ago
+
+    assert repository.cleanup_expired_sessions(max_age_hours=24) == 1
+    assert set(repository._sessions) == {kept}
+    assert repository.get_stats() == _recount(repository)
+    assert repository.cleanup_expired_sessions(max_age_hours=24) == 0
+
+
+def test_session_memory_grows_with_histories():
+    """History bytes follow the maintained turn count."""
+    repository = InMemorySessionRepository()
+    service = SessionService(repository)
+    empty = repository.get_memory_usage(sample=10)
+    for _ in range(20):
+        session_id = service.create_session("en")
+        for turn in range(5):
+            service.add_message_to_history(session_id, f"hi {turn}", "hello" * 20)
+
+    usage = repository.get_memory_usage(sample=10)
+    assert usage["sessions"] > empty["sessions"]
+    turn = repository.get_history(session_id)[0]
+    assert usage["histories"] >= 100 * deep_sizeof(turn) * 0.9
+
+
+# ---------------------- #
+# ✅ TEST SCANS
+# ---------------------- #
+
+def test_scan_resumes_from_its_cursor_across_deletions():
+    """Cursors stay valid when sessions are deleted and the order is compacted."""
+    repository = InMemorySessionRepository()
+    ids = [repository.create_session() for _ in range(300)]
+
+    first = list(repository.scan_sessions())[:100]
+    cursor = first[-1][0]
+    for session_id in ids[:250]:
+        repository.delete_session(session_id)
+    assert len(repository._scan_ids) < 300  # compacted
+
+    rest = [session["id"] for _, session in repository.scan_sessions(cursor)]
+    assert rest == ids[250:]
+
+
+def test_list_sessions_filters_and_pages():
+    """Pages follow the cursor and apply the language and idle filters."""
+    repository = InMemorySessionRepository()
+    service = SessionService(repository)
+    english = [service.create_session("en") for _ in range(5)]
+    for _ in range(5):
+        service.create_session("nb")
+    idle = repository._sessions[english[0]]
+    idle["last_activity"] = datetime.now() - timedelta(hours=1)
+
+    listed, cursor = [], 0
+    while cursor is not None:
+        page, cursor = service.list_sessions(cursor, limit=2, language="en")
+        assert len(page) <= 2
+        listed.extend(summary["id"] for summary in page)
+    assert listed == english
+
+    page, _ = service.list_sessions(min_idle_seconds=600)
+    assert [summary["id"] for summary in page] == [english[0]]
+    page, _ = service.list_sessions(max_idle_seconds=600)
+    assert len(page) == 9
+
+
+def test_scan_budget_bounds_a_page():
+    """A page examines at most scan_budget sessions and says where to resume."""
+    repository = InMemorySessionRepository()
+    service = SessionService(repository)
+    for _ in range(10):
+        service.create_session("en")
+
+    page, cursor = service.list_sessions(language="nb", scan_budget=4)
+    assert page == [] and cursor is not None
+    page, cursor = service.list_sessions(cursor, language="en", scan_budget=100)
+    assert len(page) == 6 and cursor is None
@@ -0,0 +1,114 @@
+"""Unit tests for the symmetric delete spelling corrector."""
+
+# ✅ Standard Library Imports
+import random
+
+# ✅ Third-Party Imports
+import pytest
+
+# ✅ Local Application Imports
+from app.core.config import settings
+from app.domain.services.chatbot import ChatbotService
+from app.infrastructure.nlp.spelling import SpellingCorrector, edit_distance
+
+QUESTIONS = [
+    "what are your opening hours",
+    "when are you open",
+    "tell me a joke",
+    "where is the restaurant located",
+    "hello there",
+]
+
+
+# ---------------------- #
+# ✅ TEST CORRECTOR
+# ---------------------- #
+
+@pytest.mark.parametrize("token, expected", [
+    ("opning", "opening"),     # deletion
+    ("houres", "hours"),       # insertion
+    ("jkoe", "joke"),          # transposition
+    ("restaurnat", "restaurant"),
+    ("helo", "hello"),
+    ("hours", "hours"),        # known words are kept
+    ("xyzzy", None),           # nothing close
+    ("ab", None),              # too short to correct
+])
+def test_lookup(token, expected):
+    """Tokens within the allowed distance are corrected to a training word."""
+    assert SpellingCorrector(QUESTIONS).lookup(token) == expected
+
+
+def test_lookup_agrees_with_a_full_scan():
+    """The delete index finds the same closest word as scanning every word."""
+    rng = random.Random(0)
+    words = sorted({
+        "".join(rng.choices("abcdefgh", k=rng.randint(3, 9))) for _ in range(300)
+    })
+    corrector = SpellingCorrector([" ".join(words)])
+
+    for _ in range(300):
+        word = list(rng.choice(words))
+        for _ in range(rng.randint(1, 2)):
+            position = rng.randrange(len(word))
+            word[position:position + 1] = rng.choice([[], ["x"], ["x", word[position]]])
+        token = "".join(word)
+        if len(token) <= 2:
+            continue
+        limit = 1 if len(token) <= 4 else 2
+        distances = {w: edit_distance(token, w, limit) for w in words}
+        best = min(distances.values())
+        found = corrector.lookup(token)
+        if best > limit:
+            assert found is None
+        else:
+            assert found in words and distances[found] == best
+
+
+def test_added_words_replace_cached_corrections():
+    """A cached correction is dropped once a closer word is indexed."""
+    corrector = SpellingCorrector(QUESTIONS)
+    assert corrector.lookup("hourz") == "hours"
+
+    corrector.add_words(["hourz"])
+    assert corrector.lookup("hourz") == "hourz"
+
+
+def test_correct_rewrites_only_unknown_tokens():
+    """Known tokens are kept, and an unchanged message gives None."""
+    corrector = SpellingCorrector(QUESTIONS)
+    assert corrector.correct("Opning HOURS?") == "opening hours"
+    assert corrector.correct("opening hours") is None
+
+
+# ---------------------- #
+# ✅ TEST CHATBOT INTEGRATION
+# ---------------------- #
+
+def test_typos_no_longer_fall_back(sample_chatbot_data):
+    """A misspelled question is matched after correction."""
+    chatbot = ChatbotService(data=sample_chatbot_data)
+    match = chatbot.match("yuor opning houres")
+
+    assert not match.is_fallback
+    assert match.corrected_message == "your opening hours"
+    assert chatbot.process_message("yuor opning houres") == "We are open from 9 to 17."
+    assert chatbot.process_message("thnks") == "You're welcome!"
+
+
+def test_correction_only_runs_below_the_threshold(sample_chatbot_data):
+    """Confident matches are not corrected; batches are corrected like singles."""
+    chatbot = ChatbotService(data=sample_chatbot_data)
+    messages = ["tell me a joke", "tel me a jkoe"]
+
+    assert chatbot.match(messages[0]).corrected_message is None
+    assert chatbot.match_batch(messages) == [chatbot.match(m) for m in messages]
+
+
+def test_correction_can_be_disabled(sample_chatbot_data, monkeypatch):
+    """With SPELL_CORRECTION_ENABLED off, misspelled messages fall back."""
+    monkeypatch.setattr(settings, "SPELL_CORRECTION_ENABLED", False)
+    chatbot = ChatbotService(data=sample_chatbot_data)
+
+    assert chatbot.corrector is None
+    assert chatbot.match("opning hourz").is_fallback
@@ -0,0 +1,116 @@
+"""Unit tests for TfidfMatcher."""
+
+# ✅ Third-Party Imports
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+# ✅ Local Application Imports
+from app.infrastructure.nlp.analyzer import build_analyzer
+from app.infrastructure.nlp.engine import build_matcher, questions_fingerprint
+from app.infrastructure.nlp.tfidf import TfidfMatcher
+
+QUESTIONS = [
+    "what are your opening hours",
+    "when are you open",
+    "tell me a joke",
+    "do you know any jokes",
+    "how is the weather today",
+    "hvordan går det med deg",
+]
+
+NEW_QUESTIONS = ["where is the café located", "what is your address"]
+
+QUERIES = ["opening hours", "any good jokes?", "weather", "café address", "zzz"]
+
+
+def _reference_scores(questions, query):
+    """Scores of a freshly fitted TfidfVectorizer, as ChatbotService used to do."""
+    vectorizer = TfidfVectorizer(
+        min_df=1, strip_accents='unicode', lowercase=True, ngram_range=(1, 2)
+    )
+    matrix = vectorizer.fit_transform(questions)
+    return cosine_similarity(vectorizer.transform([query]), matrix).ravel()
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_initial_scores_match_tfidf_vectorizer(query):
+    """The initial index scores exactly like TfidfVectorizer."""
+    matcher = TfidfMatcher(QUESTIONS)
+    np.testing.assert_allclose(
+        matcher.score(query), _reference_scores(QUESTIONS, query), atol=1e-12
+    )
+
+
+def test_added_documents_are_matchable_before_compaction():
+    """New questions, including unseen terms, can be matched right away."""
+    matcher = TfidfMatcher(QUESTIONS, compaction_ratio=10)
+    matcher.add_documents(NEW_QUESTIONS)
+
+    scores = matcher.score("what is the address")
+    assert scores.shape == (len(QUESTIONS) + len(NEW_QUESTIONS),)
+    assert scores.argmax() == len(QUESTIONS) + 1
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_compaction_matches_full_refit(query):
+    """After compaction the scores equal a refit over the whole corpus."""
+    matcher = TfidfMatcher(QUESTIONS, compaction_ratio=10)
+    matcher.add_documents(NEW_QUESTIONS[:1])
+    matcher.add_documents(NEW_QUESTIONS[1:])
+    matcher.compact()
+
+    expected = _reference_scores(QUESTIONS + NEW_QUESTIONS, query)
+    np.testing.assert_allclose(matcher.score(query), expected, atol=1e-12)
+
+
+def test_best_matches_agrees_with_score():
+    """Batch matching returns the same winners as scoring one by one."""
+    matcher = TfidfMatcher(QUESTIONS)
+    indices, scores = matcher.best_matches(QUERIES)
+
+    for query, index, score in zip(QUERIES, indices, scores):
+        single = matcher.score(query)
+        assert index == single.argmax()
+        assert score == pytest.approx(single.max())
+
+
+@pytest.mark.parametrize("text", [
+    "Hvordan går det med deg?",
+    "Ça va? Crème brûlée, ｆｕｌｌｗｉｄｔｈ and ŒUVRE",
+    "a b cd  e-mail I'm 42",
+    "",
+])
+def test_analyzer_matches_sklearn(text):
+    """The pure Python analyzer produces scikit-learn's features in order."""
+    reference = CountVectorizer(
+        strip_accents='unicode', lowercase=True, ngram_range=(1, 2)
+    ).build_analyzer()
+    assert build_analyzer((1, 2))(text) == reference(text)
+
+
+def test_saved_model_scores_like_the_fitted_one(tmp_path):
+    """A saved model, including added documents, loads back with equal scores."""
+    matcher = TfidfMatcher(QUESTIONS, compaction_ratio=10)
+    matcher.add_documents(NEW_QUESTIONS)
+    matcher.compact()
+    path = str(tmp_path / "model.npz")
+    matcher.save(path, fingerprint="abc")
+
+    loaded = TfidfMatcher.load(path, fingerprint="abc")
+    for query in QUERIES:
+        np.testing.assert_allclose(loaded.score(query), matcher.score(query))
+
+    assert TfidfMatcher.load(path, fingerprint="other") is None
+
+
+def test_build_matcher_reuses_saved_model(tmp_path, monkeypatch):
+    """A model saved for the same questions is loaded instead of refitted."""
+    path = str(tmp_path / "model.npz")
+    build_matcher(QUESTIONS, path)
+
+    monkeypatch.setattr(TfidfMatcher, "__init__", None)
+    loaded = build_matcher(QUESTIONS, path)
+    assert loaded.n_documents == len(QUESTIONS)
+    assert questions_fingerprint(QUESTIONS) != questions_fingerprint(QUESTIONS[1:])